@@ -0,0 +1,87 @@
+"""
+Compare per-request ingest through POST /report with bulk ingest through
+POST /reports/bulk (NDJSON and JSON array), in process over ASGI.
+
+    python -m benchmarks.bench_bulk_ingest --reports 2000 --rtt-ms 2
+
+--rtt-ms adds a simulated network round trip to every HTTP request, which is
+what a relay host actually pays when forwarding reports one by one.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+
+from benchmarks.fixtures import make_report
+from server.app import create_app
+
+
+async def post_each(client, payloads, rtt):
+    for payload in payloads:
+        if rtt:
+            await asyncio.sleep(rtt)
+        response = await client.post(
+            "/api/v1/report", content=payload, headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+
+
+async def post_bulk(client, body, content_type, rtt):
+    if rtt:
+        await asyncio.sleep(rtt)
+    response = await client.post(
+        "/api/v1/reports/bulk", content=body, headers={"Content-Type": content_type}
+    )
+    response.raise_for_status()
+    assert response.json()["rejected"] == 0
+
+
+async def run(args):
+    logging.disable(logging.INFO)
+    reports = [
+        make_report(f"client-{i}", process_count=args.processes, seed=i)
+        for i in range(args.reports)
+    ]
+    payloads = [json.dumps(report).encode() for report in reports]
+    ndjson = b"\n".join(payloads)
+    array = b"[" + b",".join(payloads) + b"]"
+    rtt = args.rtt_ms / 1000
+
+    results = {}
+    for label, runner in (
+        ("per-request", lambda c: post_each(c, payloads, rtt)),
+        ("bulk ndjson", lambda c: post_bulk(c, ndjson, "application/x-ndjson", rtt)),
+        ("bulk array", lambda c: post_bulk(c, array, "application/json", rtt)),
+    ):
+        transport = httpx.ASGITransport(app=create_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await runner(client)
+            results[label] = time.perf_counter() - start
+
+    print(
+        f"{args.reports} reports x {args.processes} processes, "
+        f"{len(ndjson) / 1e6:.1f} MB, simulated RTT {args.rtt_ms} ms"
+    )
+    baseline = results["per-request"]
+    for label, elapsed in results.items():
+        print(
+            f"{label:>12}: {elapsed:8.3f} s  {args.reports / elapsed:9.0f} reports/s"
+            f"  {baseline / elapsed:5.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=400)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the compiled ProcessClassifier against the original substring loop.
+
+    python -m benchmarks.bench_classifier
+"""
+
+import argparse
+import time
+
+from benchmarks.fixtures import make_process_list
+from server.app.core.classifier import ProcessClassifier
+from server.app.core.constants import AI_RELATED_PROCESSES
+
+
+def legacy_filter(process_list):
+    """The pre-classifier loop from receive_report"""
+    filtered_processes = {}
+    for process in process_list:
+        process_name_lower = process["name"].lower()
+        for key in AI_RELATED_PROCESSES:
+            if key in process_name_lower:
+                process["category"] = AI_RELATED_PROCESSES[key]
+                filtered_processes[process_name_lower] = process
+                break
+    return filtered_processes
+
+
+def timed(func, process_lists, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for process_list in process_lists:
+            func(process_list)
+        best = min(best, time.perf_counter() - start)
+    return best / len(process_lists)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'processes':>10} {'legacy µs':>12} {'cold µs':>12} {'warm µs':>12} {'speedup':>8}")
+    for size in (300, 500, 1000):
+        process_lists = [make_process_list(size, seed=i) for i in range(args.reports)]
+
+        classifier = ProcessClassifier(AI_RELATED_PROCESSES)
+        for process_list in process_lists:
+            expected = legacy_filter(process_list)
+            got = classifier.filter_processes(process_list)
+            assert {k: v["category"] for k, v in expected.items()} == {
+                k: v.category for k, v in got.items()
+            }
+
+        legacy = timed(legacy_filter, process_lists, args.repeat)
+        cold = timed(
+            lambda pl: ProcessClassifier(AI_RELATED_PROCESSES).filter_processes(pl),
+            process_lists[:20],
+            args.repeat,
+        )
+        warm = timed(classifier.filter_processes, process_lists, args.repeat)
+        print(
+            f"{size:>10} {legacy * 1e6:>12.1f} {cold * 1e6:>12.1f} "
+            f"{warm * 1e6:>12.1f} {legacy / warm:>7.1f}x"
+        )
+    print(f"cache: {classifier.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
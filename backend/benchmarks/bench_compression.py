@@ -0,0 +1,88 @@
+"""
+Measure request-body compression on realistic 500-process reports: bytes on
+the wire, client compression time, and end-to-end ingest latency through
+the DecompressionMiddleware, plus transfer time at a given uplink speed.
+
+    python -m benchmarks.bench_compression --mbps 10
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import statistics
+import time
+
+import httpx
+
+from benchmarks.fixtures import make_report
+from server.app import create_app
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def encoders():
+    yield "identity", lambda body: body
+    yield "gzip", lambda body: gzip.compress(body, compresslevel=6)
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=3)
+        yield "zstd", compressor.compress
+
+
+async def run(args):
+    logging.disable(logging.INFO)
+    bodies = [
+        json.dumps(make_report(f"client-{i}", process_count=args.processes, seed=i)).encode()
+        for i in range(args.reports)
+    ]
+    raw_size = statistics.mean(len(body) for body in bodies)
+    print(
+        f"{args.reports} reports x {args.processes} processes, "
+        f"mean body {raw_size / 1024:.1f} KiB, uplink {args.mbps} Mbit/s"
+    )
+    print(
+        f"{'encoding':>9} {'KiB':>8} {'ratio':>6} {'compress ms':>12} "
+        f"{'server ms':>10} {'transfer ms':>12} {'total ms':>9}"
+    )
+
+    for name, encode in encoders():
+        start = time.perf_counter()
+        encoded = [encode(body) for body in bodies]
+        compress_ms = (time.perf_counter() - start) * 1000 / len(bodies)
+        size = statistics.mean(len(body) for body in encoded)
+
+        headers = {"Content-Type": "application/json"}
+        if name != "identity":
+            headers["Content-Encoding"] = name
+        transport = httpx.ASGITransport(app=create_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            latencies = []
+            for body in encoded:
+                start = time.perf_counter()
+                response = await client.post("/api/v1/report", content=body, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+        server_ms = statistics.median(latencies) * 1000
+        transfer_ms = size * 8 / (args.mbps * 1e6) * 1000
+
+        print(
+            f"{name:>9} {size / 1024:>8.1f} {raw_size / size:>5.1f}x {compress_ms:>12.2f} "
+            f"{server_ms:>10.2f} {transfer_ms:>12.2f} "
+            f"{compress_ms + server_ms + transfer_ms:>9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=500)
+    parser.add_argument("--mbps", type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
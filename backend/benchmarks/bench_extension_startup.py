@@ -0,0 +1,134 @@
+"""
+Time the startup extension scan on a synthetic tree of editor extensions,
+without and with the persisted manifest cache.
+
+    python -m benchmarks.bench_extension_startup --extensions 2000
+
+The tree is built under a temporary HOME: 70% VS Code extensions, 25%
+JetBrains plugins (with a realistic plugin.xml) and 5% Sublime packages,
+one in ten of them AI-related.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from client import EditorExtensionWatcher, ManifestCache
+
+logger = logging.getLogger("bench")
+
+PLUGIN_XML = """<idea-plugin>
+  <id>com.example.{name}</id>
+  <name>{name}</name>
+  <vendor url="https://example.com">Example</vendor>
+  <description><![CDATA[{description}]]></description>
+  <depends>com.intellij.modules.platform</depends>
+  <extensions defaultExtensionNs="com.intellij">
+{extensions}
+  </extensions>
+</idea-plugin>
+"""
+
+
+def description(i):
+    if i % 10 == 0:
+        return "Copilot-style code completion for your editor"
+    return "Syntax highlighting and snippets for a file format"
+
+
+def build_tree(watcher, count):
+    vscode = watcher.editor_paths["vscode"][0]
+    jetbrains = watcher.editor_paths["jetbrains"][0] / "IDEA-U" / "plugins"
+    sublime = watcher.editor_paths["sublime"][0]
+    extension_points = "\n".join(
+        f'    <localInspection implementationClass="com.example.Inspection{i}"/>'
+        for i in range(200)
+    )
+
+    for i in range(count):
+        if i % 20 == 0:
+            package_dir = sublime / f"Package{i}"
+            package_dir.mkdir(parents=True)
+            (package_dir / "package-metadata.json").write_text(
+                json.dumps({"description": description(i), "version": "1.0.0"})
+            )
+        elif i % 4 == 1:
+            meta_inf = jetbrains / f"plugin{i}" / "META-INF"
+            meta_inf.mkdir(parents=True)
+            (meta_inf / "plugin.xml").write_text(
+                PLUGIN_XML.format(
+                    name=f"plugin{i}",
+                    description=description(i),
+                    extensions=extension_points,
+                )
+            )
+        else:
+            ext_dir = vscode / f"publisher.extension{i}-1.0.{i}"
+            ext_dir.mkdir(parents=True)
+            (ext_dir / "package.json").write_text(
+                json.dumps(
+                    {
+                        "name": f"extension{i}",
+                        "displayName": f"Extension {i}",
+                        "description": description(i),
+                        "version": f"1.0.{i}",
+                        "publisher": "publisher",
+                        "keywords": ["snippets", "syntax"],
+                        "contributes": {
+                            "commands": [
+                                {"command": f"ext{i}.cmd{c}", "title": f"Command {c}"}
+                                for c in range(100)
+                            ]
+                        },
+                    }
+                )
+            )
+
+
+def startup_scan(cache_path):
+    start = time.perf_counter()
+    cache = ManifestCache(logger, cache_path)
+    watcher = EditorExtensionWatcher(logger, manifest_cache=cache)
+    watcher.scan_extensions()
+    return time.perf_counter() - start, len(watcher.extensions_cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--extensions", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        cache_path = Path(home) / ".ultron" / "extensions.json"
+        cache = ManifestCache(logger, cache_path)
+        build_tree(
+            EditorExtensionWatcher(logger, manifest_cache=cache), args.extensions
+        )
+
+        cold = []
+        for _ in range(args.rounds):
+            cache_path.unlink(missing_ok=True)
+            duration, found = startup_scan(cache_path)
+            cold.append(duration)
+        warm = [startup_scan(cache_path)[0] for _ in range(args.rounds)]
+
+        cold_ms = statistics.median(cold) * 1000
+        warm_ms = statistics.median(warm) * 1000
+        print(f"{args.extensions} extensions, {found} AI-related")
+        print(f"previous startup (two uncached scans): {2 * cold_ms:8.1f} ms")
+        print(f"first startup (no cache):              {cold_ms:8.1f} ms")
+        print(
+            f"later startup (cached manifests):      {warm_ms:8.1f} ms  "
+            f"({2 * cold_ms / warm_ms:.1f}x faster than before)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare answering "which clients run these tools" by scanning every latest
+report against the inverted tool index.
+
+    python -m benchmarks.bench_fleet_query --clients 50000
+
+Builds an in-memory store of classified reports, then for each query
+measures a full scan of latest_reports() and ReportStore.find_clients(),
+first page of 100 clients. Also reports the cost the index adds to each
+upsert.
+"""
+
+import argparse
+import heapq
+import random
+import time
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import SystemReport
+from server.app.core.ingest import prepare_report
+from server.app.db.index import ClientIndex, ClientQuery
+from server.app.db.memory import InMemoryReportStore
+
+QUERIES = (
+    ("one tool", ("cursor editor",), ()),
+    ("two tools", ("cursor editor", "github copilot"), ()),
+    ("rare tool", ("midjourney",), ()),
+    ("extension", (), ("github.copilot",)),
+)
+
+
+def build_store(clients: int, templates: int) -> InMemoryReportStore:
+    prepared = []
+    for seed in range(templates):
+        report = SystemReport.model_validate(
+            make_report(process_count=400, ai_share=0.01, seed=seed)
+        )
+        prepare_report(report)
+        prepared.append(report)
+    rng = random.Random(0)
+    store = InMemoryReportStore()
+    for i in range(clients):
+        template = rng.choice(prepared)
+        store.upsert(template.model_copy(update={"client_id": f"client-{i:07d}"}))
+    return store
+
+
+def scan(store: InMemoryReportStore, tools, extensions, limit: int):
+    """The query without an index: check every client's latest report"""
+    matches = []
+    for report in store.latest_reports():
+        names = set()
+        for process in report.process_list:
+            names.add(process.name.lower())
+            if process.category:
+                names.add(process.category.lower())
+        if tools and not names.intersection(tools):
+            continue
+        if extensions and not any(
+            f"{extension.publisher}.{extension.name}".lower() in extensions
+            for extension in report.editor_extensions.values()
+        ):
+            continue
+        matches.append(report)
+    return heapq.nsmallest(limit, matches, key=lambda report: report.client_id)
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50000)
+    parser.add_argument("--templates", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    store = build_store(args.clients, args.templates)
+    print(f"{args.clients} clients")
+    print(f"{'query':>10} {'matches':>8} {'scan ms':>9} {'index ms':>9} {'speedup':>8}")
+    for name, tools, extensions in QUERIES:
+        query = ClientQuery(tools=tools, extensions=extensions, limit=100)
+        matches = len(store.client_index.candidates(query, {}, store._latest))
+        old, expected = timed(lambda: scan(store, tools, extensions, 100), args.repeat)
+        new, got = timed(lambda: store.find_clients(query), args.repeat)
+        assert [r.client_id for r in got] == [r.client_id for r in expected]
+        print(
+            f"{name:>10} {matches:>8} {old * 1e3:>9.2f} {new * 1e3:>9.3f} "
+            f"{old / new:>7.0f}x"
+        )
+
+    index = ClientIndex()
+    reports = list(store.latest_reports())
+    cost, _ = timed(lambda: [index.update(report) for report in reports], 1)
+    print(f"index update per upsert: {cost / len(reports) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Load-test the ingest server in process: a synthetic fleet of clients posts
+reports while readers query client history and fleet analytics, all
+against the app built by create_app() through an in-process ASGI transport.
+
+    python -m benchmarks.bench_load --clients 5000 --duration 20 \\
+        --output load.json --baseline previous-load.json
+
+Two phases are measured:
+  populate  every client sends its first report (writers only)
+  mixed     writers keep sending reports for random clients while readers
+            fetch /reports/{client_id} and /analytics
+
+For each phase and endpoint, prints p50/p95/p99 latency and throughput, and
+writes them with the run configuration to --output as JSON. With
+--baseline, each figure is compared against a previous results file.
+
+Clients draw their report from a pool of templates with realistic process
+list sizes (100 to 900 processes) and AI shares (1% to 8%), so memory stays
+bounded for large fleets while payloads still vary.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.fixtures import make_report
+from server.app import create_app
+
+REPORT = "/api/v1/report"
+CLIENT_REPORTS = "/api/v1/reports/{client_id}"
+ANALYTICS = "/api/v1/analytics"
+
+# Process list sizes seen on fleet hosts, and how common each is
+PROCESS_COUNTS = (100, 250, 400, 600, 900)
+PROCESS_COUNT_WEIGHTS = (2, 4, 5, 3, 1)
+CLIENT_ID_PLACEHOLDER = "__client_id__"
+
+
+def make_templates(count: int, seed: int) -> List[bytes]:
+    """Encoded reports with a placeholder client_id"""
+    rng = random.Random(seed)
+    templates = []
+    for i in range(count):
+        report = make_report(
+            CLIENT_ID_PLACEHOLDER,
+            process_count=rng.choices(PROCESS_COUNTS, PROCESS_COUNT_WEIGHTS)[0],
+            organization_id=f"org-{i % 10:03d}",
+            ai_share=rng.uniform(0.01, 0.08),
+            seed=seed + i,
+        )
+        templates.append(json.dumps(report).encode())
+    return templates
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float):
+    summary = {}
+    for endpoint, samples in sorted(latencies.items()):
+        ordered = sorted(samples)
+        summary[endpoint] = {
+            "requests": len(ordered),
+            "errors": errors.get(endpoint, 0),
+            "throughput_rps": round(len(ordered) / elapsed, 1),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+    return {"elapsed_s": round(elapsed, 3), "endpoints": summary}
+
+
+class LoadRun:
+    def __init__(self, client: httpx.AsyncClient, templates: List[bytes], clients: int):
+        self.client = client
+        self.templates = templates
+        self.client_ids = [f"load-client-{i:06d}" for i in range(clients)]
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def reset(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def timed(self, endpoint: str, method: str, url: str, **kwargs):
+        start = time.perf_counter()
+        # Requests over the ASGI transport never suspend, so yield once to let
+        # other in-flight requests run first; that wait counts as latency, as
+        # it would for concurrent connections to one server worker
+        await asyncio.sleep(0)
+        response = await self.client.request(method, url, **kwargs)
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+
+    async def send_report(self, index: int):
+        client_id = self.client_ids[index]
+        template = self.templates[index % len(self.templates)]
+        body = template.replace(CLIENT_ID_PLACEHOLDER.encode(), client_id.encode(), 1)
+        await self.timed(
+            REPORT,
+            "POST",
+            REPORT,
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def populate(self, writers: int):
+        """Every client sends one report, spread over the writers"""
+        pending = iter(range(len(self.client_ids)))
+
+        async def writer():
+            for index in pending:
+                await self.send_report(index)
+
+        await asyncio.gather(*(writer() for _ in range(writers)))
+
+    async def mixed(self, writers: int, readers: int, duration: float, seed: int):
+        deadline = time.perf_counter() + duration
+
+        async def writer(rng):
+            while time.perf_counter() < deadline:
+                await self.send_report(rng.randrange(len(self.client_ids)))
+
+        async def reader(rng):
+            while time.perf_counter() < deadline:
+                if rng.random() < 0.5:
+                    client_id = rng.choice(self.client_ids)
+                    url = CLIENT_REPORTS.replace("{client_id}", client_id)
+                    await self.timed(CLIENT_REPORTS, "GET", url)
+                else:
+                    await self.timed(ANALYTICS, "GET", ANALYTICS)
+
+        await asyncio.gather(
+            *(writer(random.Random(seed + i)) for i in range(writers)),
+            *(reader(random.Random(seed + writers + i)) for i in range(readers)),
+        )
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_phase(name: str, phase: Dict, baseline: Dict):
+    print(f"\n{name} ({phase['elapsed_s']:.1f} s)")
+    print(
+        f"  {'endpoint':32} {'requests':>8} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}"
+    )
+    for endpoint, stats in phase["endpoints"].items():
+        print(
+            f"  {endpoint:32} {stats['requests']:8d} {stats['throughput_rps']:8.1f} "
+            f"{stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} "
+            f"{stats['errors']:6d}"
+        )
+        previous = baseline.get(endpoint)
+        if previous:
+            changes = "  ".join(
+                f"{key} {(stats[key] / previous[key] - 1) * 100:+.1f}%"
+                for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+                if previous.get(key)
+            )
+            print(f"  {'vs baseline':32} {changes}")
+
+
+async def run(args):
+    logging.disable(logging.INFO)
+    templates = make_templates(args.templates, args.seed)
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    results = {
+        "benchmark": "load",
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            key: getattr(args, key)
+            for key in ("clients", "writers", "readers", "duration", "templates", "seed")
+        },
+        "phases": {},
+    }
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        load = LoadRun(client, templates, args.clients)
+
+        start = time.perf_counter()
+        await load.populate(args.writers)
+        elapsed = time.perf_counter() - start
+        results["phases"]["populate"] = summarize(load.latencies, load.errors, elapsed)
+
+        load.reset()
+        start = time.perf_counter()
+        await load.mixed(args.writers, args.readers, args.duration, args.seed)
+        elapsed = time.perf_counter() - start
+        results["phases"]["mixed"] = summarize(load.latencies, load.errors, elapsed)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["phases"]
+    print(
+        f"{args.clients} clients, {args.writers} writers, {args.readers} readers, "
+        f"revision {results['revision']}"
+    )
+    for name, phase in results["phases"].items():
+        print_phase(name, phase, baseline.get(name, {}).get("endpoints", {}))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    failed = sum(
+        stats["errors"]
+        for phase in results["phases"].values()
+        for stats in phase["endpoints"].values()
+    )
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of mixed load")
+    parser.add_argument("--templates", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="results file of a previous run to compare")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
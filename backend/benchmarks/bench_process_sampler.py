@@ -0,0 +1,86 @@
+"""
+Time a process scan with the stateful ProcessSampler against the original
+psutil.process_iter loop, and check that CPU usage is actually measured.
+
+    python -m benchmarks.bench_process_sampler --spawn 1000
+
+--spawn starts idle child processes first so the host has 1000+ processes.
+"""
+
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+import time
+
+import psutil
+
+from client import ProcessSampler
+
+LEGACY_ATTRS = ["pid", "name", "cpu_percent", "memory_percent", "status", "create_time", "cmdline"]
+
+
+def legacy_scan():
+    """The pre-sampler loop from collect_process_info"""
+    infos = []
+    for proc in psutil.process_iter(LEGACY_ATTRS):
+        try:
+            infos.append(proc.info)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+    return infos
+
+
+def timed(func, rounds):
+    durations = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spawn", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    children = [
+        subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+        for _ in range(args.spawn)
+    ]
+    busy = subprocess.Popen(
+        [sys.executable, "-c", "import time\nwhile True: time.perf_counter()"]
+    )
+    try:
+        time.sleep(1)
+        print(f"{len(psutil.pids())} processes")
+
+        sampler = ProcessSampler(logging.getLogger("bench"))
+        cold, _ = timed(sampler.sample, 1)
+        warm, samples = timed(sampler.sample, args.rounds)
+        legacy, infos = timed(legacy_scan, args.rounds)
+
+        busy_cpu = next(s["cpu_percent"] for s in samples if s["pid"] == busy.pid)
+        legacy_cpu = sum(info["cpu_percent"] or 0.0 for info in infos)
+        sampler_cpu = sum(s["cpu_percent"] for s in samples)
+        print(f"legacy process_iter: {legacy * 1000:8.1f} ms/scan, total cpu {legacy_cpu:6.1f}%")
+        print(f"sampler first scan:  {cold * 1000:8.1f} ms/scan")
+        print(
+            f"sampler warm scan:   {warm * 1000:8.1f} ms/scan, total cpu {sampler_cpu:6.1f}%  "
+            f"({legacy / warm:.1f}x faster)"
+        )
+        print(f"busy child measured at {busy_cpu:.0f}% cpu")
+    finally:
+        busy.kill()
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
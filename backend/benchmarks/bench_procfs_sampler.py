@@ -0,0 +1,77 @@
+"""
+Time a process scan with the /proc reader (ProcfsSampler) against the
+psutil-based ProcessSampler, cold and warm. Linux only.
+
+    python -m benchmarks.bench_procfs_sampler --spawn 1000
+
+--spawn starts idle child processes first so the host has 1000+ processes.
+"""
+
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+import time
+
+import psutil
+
+from client import ProcessSampler, ProcfsSampler
+
+
+def timed(func, rounds):
+    durations = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spawn", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if not ProcfsSampler.available():
+        sys.exit("ProcfsSampler needs a Linux /proc")
+
+    children = [
+        subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+        for _ in range(args.spawn)
+    ]
+    try:
+        time.sleep(1)
+        print(f"{len(psutil.pids())} processes")
+
+        logger = logging.getLogger("bench")
+        results = {}
+        for label, sampler in (
+            ("psutil", ProcessSampler(logger)),
+            ("procfs", ProcfsSampler(logger)),
+        ):
+            cold, _ = timed(sampler.sample, 1)
+            warm, _ = timed(sampler.sample, args.rounds)
+            results[label] = (cold, warm)
+            print(
+                f"{label}: first scan {cold * 1000:8.1f} ms, "
+                f"warm scan {warm * 1000:8.1f} ms"
+            )
+
+        psutil_cold, psutil_warm = results["psutil"]
+        procfs_cold, procfs_warm = results["procfs"]
+        print(
+            f"procfs speedup: {psutil_cold / procfs_cold:.1f}x first scan, "
+            f"{psutil_warm / procfs_warm:.1f}x warm"
+        )
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Compare report validation and serialization before and after typed process
+records and orjson.
+
+    python -m benchmarks.bench_serialization --reports 50
+
+For each process list size, measures per report:
+  decode     request body to Python objects (json vs orjson)
+  validate   decoded body to SystemReport
+  classify   validate, then keep AI-related processes (as dicts vs validated
+             into ProcessRecords)
+  ingest     request body to a classified report: decode + classify
+  history    encoding a client's 10 stored reports for GET /reports/{client_id}
+             (jsonable_encoder + json vs pydantic's dump_json)
+  client     agent-side report serialization (json + encoder class vs orjson)
+and the memory held by a stored, classified report.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, create_model
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import SystemReport
+from server.app.core.classifier import process_classifier
+from server.app.core.ingest import prepare_report
+
+# SystemReport as it was, with untyped processes and extensions
+LegacySystemReport = create_model(
+    "LegacySystemReport",
+    __base__=SystemReport,
+    process_list=(List[Dict], ...),
+    editor_extensions=(Dict, ...),
+)
+
+HISTORY_SIZE = 10
+
+
+class DateTimeEncoder(json.JSONEncoder):
+    """The agent's former encoder"""
+
+    def default(self, obj):
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def legacy_prepare(report):
+    """The classifier loop over dicts, as prepare_report ran before"""
+    kept = []
+    for process in report.process_list:
+        category = process_classifier.classify(process["name"])
+        if category is not None:
+            process["category"] = category
+            kept.append(process)
+    report.process_list = kept
+
+
+def client_report(size: int, seed: int) -> Dict:
+    """A report as the agent builds it, with datetime objects"""
+    report = make_report(process_count=size, seed=seed)
+    now = datetime.now()
+    report["timestamp"] = now
+    report["last_boot_time"] = now - timedelta(days=1)
+    for process in report["process_list"]:
+        process["create_time"] = datetime.fromisoformat(process["create_time"])
+    return report
+
+
+def timed(func, items, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items)
+
+
+def stored_bytes(model, prepare, bodies) -> float:
+    tracemalloc.start()
+    reports = []
+    for body in bodies:
+        report = model.model_validate(orjson.loads(body))
+        prepare(report)
+        reports.append(report)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    history_adapter = TypeAdapter(List[SystemReport])
+    print(
+        f"{'processes':>10} {'stage':>10} {'before µs':>12} {'after µs':>12} {'speedup':>8}"
+    )
+    for size in (300, 500, 1000):
+        reports = [client_report(size, seed) for seed in range(args.reports)]
+        bodies = [orjson.dumps(report) for report in reports]
+        decoded = [orjson.loads(body) for body in bodies]
+        legacy_history = [
+            [LegacySystemReport.model_validate(item)] * HISTORY_SIZE for item in decoded
+        ]
+        typed_history = [
+            [SystemReport.model_validate(item)] * HISTORY_SIZE for item in decoded
+        ]
+        for history in legacy_history:
+            legacy_prepare(history[0])
+        for history in typed_history:
+            prepare_report(history[0])
+
+        stages = (
+            ("decode", bodies, json.loads, bodies, orjson.loads),
+            (
+                "validate",
+                decoded,
+                LegacySystemReport.model_validate,
+                decoded,
+                SystemReport.model_validate,
+            ),
+            (
+                "classify",
+                decoded,
+                lambda item: legacy_prepare(LegacySystemReport.model_validate(item)),
+                decoded,
+                lambda item: prepare_report(SystemReport.model_validate(item)),
+            ),
+            (
+                "ingest",
+                bodies,
+                lambda body: legacy_prepare(LegacySystemReport.model_validate(json.loads(body))),
+                bodies,
+                lambda body: prepare_report(SystemReport.model_validate(orjson.loads(body))),
+            ),
+            (
+                "history",
+                legacy_history,
+                lambda history: json.dumps(jsonable_encoder(history)).encode(),
+                typed_history,
+                history_adapter.dump_json,
+            ),
+            (
+                "client",
+                reports,
+                lambda report: json.dumps(report, cls=DateTimeEncoder).encode(),
+                reports,
+                orjson.dumps,
+            ),
+        )
+        for stage, before_items, before, after_items, after in stages:
+            old = timed(before, before_items, args.repeat)
+            new = timed(after, after_items, args.repeat)
+            print(
+                f"{size:>10} {stage:>10} {old * 1e6:>12.1f} {new * 1e6:>12.1f} "
+                f"{old / new:>7.1f}x"
+            )
+
+        old = stored_bytes(LegacySystemReport, legacy_prepare, bodies)
+        new = stored_bytes(SystemReport, prepare_report, bodies)
+        print(
+            f"{size:>10} {'stored KB':>10} {old / 1024:>12.1f} {new / 1024:>12.1f} "
+            f"{old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
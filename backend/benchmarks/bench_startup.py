@@ -0,0 +1,122 @@
+"""
+Measure agent cold start: the time to import client.py and the time until
+the first report has been delivered, each in a fresh interpreter, against
+a stub server on localhost.
+
+    python -m benchmarks.bench_startup --rounds 10 --extensions 2000
+
+Exits with status 1 when a median goes over its budget, so it can guard
+against startup regressions in CI. Each run uses an empty temporary HOME
+and working directory, so no spool, cache or log from earlier runs is
+reused. --extensions installs that many synthetic editor extensions (see
+bench_extension_startup) in each HOME first.
+"""
+
+import argparse
+import compileall
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.bench_extension_startup import build_tree
+from client import EditorExtensionWatcher, ManifestCache
+
+BACKEND = Path(__file__).resolve().parent.parent
+logger = logging.getLogger("bench")
+
+IMPORT_BUDGET_MS = 80
+FIRST_REPORT_BUDGET_MS = 400
+
+AGENT = """
+import json, sys, time
+start = time.perf_counter()
+import client
+imported = time.perf_counter()
+agent = client.UltronEyeClient(server_url=sys.argv[1])
+agent.send_report()
+reported = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_report_ms": (reported - start) * 1000,
+}))
+"""
+
+
+class StubServer(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"status": "success", "sequence": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_agent(server_url, extensions):
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=str(BACKEND))
+        if extensions:
+            os.environ["HOME"] = home
+            cache = ManifestCache(logger, Path(home) / "unused.json")
+            build_tree(EditorExtensionWatcher(logger, manifest_cache=cache), extensions)
+        output = subprocess.run(
+            [sys.executable, "-c", AGENT, server_url],
+            cwd=home,
+            env=env,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--extensions", type=int, default=0)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument(
+        "--first-report-budget-ms", type=float, default=FIRST_REPORT_BUDGET_MS
+    )
+    args = parser.parse_args()
+
+    # The agent ships with bytecode; measure that, not source compilation
+    compileall.compile_file(str(BACKEND / "client.py"), quiet=1)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        runs = [run_agent(server_url, args.extensions) for _ in range(args.rounds)]
+    finally:
+        server.shutdown()
+
+    over_budget = False
+    for key, budget in (
+        ("import_ms", args.import_budget_ms),
+        ("first_report_ms", args.first_report_budget_ms),
+    ):
+        median = statistics.median(run[key] for run in runs)
+        worst = max(run[key] for run in runs)
+        status = "ok" if median <= budget else "OVER BUDGET"
+        over_budget = over_budget or median > budget
+        print(
+            f"{key:16} median {median:7.1f} ms, max {worst:7.1f} ms "
+            f"(budget {budget:.0f} ms) {status}"
+        )
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
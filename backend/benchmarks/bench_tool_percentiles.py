@@ -0,0 +1,106 @@
+"""
+Measure fleet-wide per-tool resource percentiles.
+
+    python -m benchmarks.bench_tool_percentiles --clients 50000
+
+Feeds the latest report of every client to an AnalyticsAggregator, then
+compares computing p50/p90/p99 of each tool's per-client memory, CPU and
+instance count from its NumPy columns against collecting and sorting the
+same values from the stored reports in Python. Also reports what keeping
+the columns adds to each report's analytics update.
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import SystemReport
+from server.app.core.analytics import AnalyticsAggregator
+from server.app.core.distributions import PERCENTILES, percentiles, report_rows
+from server.app.core.ingest import prepare_report
+
+
+def make_reports(clients: int, templates: int) -> List[SystemReport]:
+    prepared = []
+    for seed in range(templates):
+        report = SystemReport.model_validate(
+            make_report(process_count=400, ai_share=0.03, seed=seed)
+        )
+        prepare_report(report)
+        prepared.append(report)
+    rng = random.Random(0)
+    return [
+        rng.choice(prepared).model_copy(update={"client_id": f"client-{i:07d}"})
+        for i in range(clients)
+    ]
+
+
+def python_percentiles(reports: List[SystemReport]) -> Dict[str, Dict]:
+    """The same figures without columns: a pass over every report, then sorts"""
+    values: Dict[str, List[List[float]]] = {}
+    for report in reports:
+        for tool, row in report_rows(report).items():
+            columns = values.setdefault(tool, [[], [], []])
+            for column, value in zip(columns, row):
+                column.append(value)
+    result = {}
+    for tool, columns in values.items():
+        result[tool] = []
+        for column in columns:
+            column.sort()
+            result[tool].append(
+                [column[min(len(column) - 1, len(column) * p // 100)] for p in PERCENTILES]
+            )
+    return result
+
+
+def timed(function, repeat: int) -> float:
+    """Best of repeat runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50_000)
+    parser.add_argument("--templates", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    reports = make_reports(args.clients, args.templates)
+    aggregator = AnalyticsAggregator()
+    start = time.perf_counter()
+    for report in reports:
+        aggregator.replace(None, report)
+    replace_us = (time.perf_counter() - start) / len(reports) * 1e6
+
+    # The same updates without the columns
+    plain = AnalyticsAggregator()
+    plain.distributions.update = lambda report: None
+    start = time.perf_counter()
+    for report in reports:
+        plain.replace(None, report)
+    plain_us = (time.perf_counter() - start) / len(reports) * 1e6
+
+    tools = aggregator.distributions.by_tool
+    rows = sum(len(columns) for columns in tools.values())
+    print(f"{args.clients} clients, {len(tools)} tools, {rows} tool rows")
+    print(f"analytics update per report: {plain_us:.1f} µs, {replace_us:.1f} µs with columns")
+
+    columns = aggregator.distributions.columns
+    vectorized = timed(lambda: percentiles(columns()), args.repeat)
+    snapshot = timed(aggregator.snapshot, args.repeat)
+    python = timed(lambda: python_percentiles(reports), args.repeat)
+    print(f"{'percentiles, NumPy columns':32} {vectorized:9.2f} ms")
+    print(f"{'full /analytics snapshot':32} {snapshot:9.2f} ms")
+    print(f"{'percentiles, Python over reports':32} {python:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
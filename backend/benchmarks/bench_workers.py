@@ -0,0 +1,171 @@
+"""
+Measure how report ingest scales with server worker processes.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 --senders 8 --duration 10
+
+For each worker count, starts `python -m server.main --workers N` on a free
+port (N = 1 is the plain single-process server; above that, workers share
+one store process), then senders in separate processes post reports over
+keep-alive connections for --duration seconds after a short warmup.
+
+Prints ingest throughput, its speedup over the first worker count, and
+p50/p99 latency. Afterwards checks that repeated /analytics requests,
+answered by whichever worker accepts them, all agree on the fleet.
+
+Senders compete with the server for CPU; the scaling they show is bounded
+by os.cpu_count(), which is printed with the results.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.bench_load import CLIENT_ID_PLACEHOLDER, make_templates, percentile
+
+REPORT = "/api/v1/report"
+ANALYTICS = "/api/v1/analytics"
+HEALTH = "/api/v1/health"
+WARMUP = 2.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DEBUG": "false", "STORAGE_BACKEND": "memory"}
+    env.pop("STORE_ADDRESS", None)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "server.main", "--workers", str(workers),
+         "--port", str(port), "--no-reload"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )  # fmt: skip
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", HEALTH)
+            if conn.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"Server with {workers} workers did not start")
+
+
+Job = Tuple[int, int, List[bytes], int, float, float]
+
+
+def send(args: Job) -> Tuple[List[float], int]:
+    """One sender: post reports from start until end, timing those after warmup"""
+    port, sender, templates, clients, start, end = args
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    latencies, errors = [], 0
+    i = sender
+    while time.time() < end:
+        client_id = f"workers-{sender:02d}-{i % clients:05d}".encode()
+        body = templates[i % len(templates)].replace(
+            CLIENT_ID_PLACEHOLDER.encode(), client_id, 1
+        )
+        i += 1
+        began = time.perf_counter()
+        conn.request("POST", REPORT, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - began
+        if time.time() < start:
+            continue
+        if response.status == 200:
+            latencies.append(elapsed)
+        else:
+            errors += 1
+    conn.close()
+    return latencies, errors
+
+
+def analytics_views(port: int, requests: int) -> set:
+    """Distinct (clients, processes) totals seen across repeated requests"""
+    views = set()
+    for _ in range(requests):
+        # A new connection each time, so different workers answer
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", ANALYTICS)
+        analytics = json.loads(conn.getresponse().read())
+        views.add((analytics["total_clients"], analytics["total_processes"]))
+        conn.close()
+    return views
+
+
+def run(workers: int, templates: List[bytes], args) -> Dict:
+    port = free_port()
+    server = start_server(workers, port)
+    try:
+        start = time.time() + WARMUP
+        end = start + args.duration
+        jobs = [
+            (port, sender, templates, args.clients, start, end)
+            for sender in range(args.senders)
+        ]
+        with multiprocessing.Pool(args.senders) as pool:
+            results = pool.map(send, jobs)
+        views = analytics_views(port, 4 * workers)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for sender, _ in results for latency in sender)
+    return {
+        "workers": workers,
+        "reports": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "reports_per_s": len(latencies) / args.duration,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "consistent": len(views) == 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--senders", type=int, default=8)
+    parser.add_argument("--clients", type=int, default=500, help="Clients per sender")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--templates", type=int, default=20)
+    args = parser.parse_args()
+
+    templates = make_templates(args.templates, seed=0)
+    print(
+        f"{os.cpu_count()} CPUs, {args.senders} senders, "
+        f"{args.duration:.0f} s per run"
+    )
+    print(
+        f"{'workers':>8} {'reports/s':>10} {'speedup':>8} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>7} {'consistent':>11}"
+    )
+    baseline = None
+    for workers in args.workers:
+        result = run(workers, templates, args)
+        baseline = baseline or result["reports_per_s"]
+        print(
+            f"{workers:>8} {result['reports_per_s']:>10.1f} "
+            f"{result['reports_per_s'] / baseline:>7.2f}x {result['p50_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['errors']:>7} "
+            f"{str(result['consistent']):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
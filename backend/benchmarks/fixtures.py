@@ -0,0 +1,130 @@
+"""
+Synthetic fleet data shared by the benchmarks.
+
+Process names are drawn from a realistic mix of system daemons, desktop apps
+and a small share of AI tools, so classification and ingest paths see the
+same hit rate they do in production (well under 5% AI-related).
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+SYSTEM_PROCESSES = [
+    "systemd", "kthreadd", "rcu_sched", "ksoftirqd/0", "kworker/0:1H",
+    "migration/0", "watchdog/0", "systemd-journald", "systemd-udevd",
+    "systemd-resolved", "systemd-timesyncd", "systemd-logind", "dbus-daemon",
+    "NetworkManager", "wpa_supplicant", "polkitd", "udisksd", "upowerd",
+    "accounts-daemon", "rsyslogd", "cron", "atd", "sshd", "bash", "zsh",
+    "fish", "tmux: server", "login", "agetty", "containerd", "dockerd",
+    "containerd-shim", "snapd", "cupsd", "avahi-daemon", "pulseaudio",
+    "pipewire", "pipewire-pulse", "wireplumber", "Xorg", "Xwayland",
+    "gnome-shell", "gnome-session-binary", "gsd-power", "gsd-media-keys",
+    "nautilus", "tracker-miner-fs", "evolution-source-registry",
+    "launchd", "kernel_task", "WindowServer", "mds_stores", "mdworker_shared",
+    "coreaudiod", "bluetoothd", "cfprefsd", "trustd", "distnoted", "Finder",
+    "Dock", "SystemUIServer", "loginwindow", "Spotlight", "svchost.exe",
+    "explorer.exe", "csrss.exe", "lsass.exe", "winlogon.exe", "dwm.exe",
+    "RuntimeBroker.exe", "SearchIndexer.exe", "MsMpEng.exe", "spoolsv.exe",
+]
+
+APP_PROCESSES = [
+    "chrome", "Google Chrome Helper", "Google Chrome Helper (Renderer)",
+    "firefox", "Web Content", "Slack", "Slack Helper", "zoom.us", "Spotify",
+    "Discord", "Telegram", "Signal", "thunderbird", "postgres", "redis-server",
+    "mysqld", "node", "python3", "java", "gradle", "npm", "yarn", "go", "rustc",
+    "cargo", "gopls", "rust-analyzer", "pyright", "tsserver", "eslint_d",
+    "Terminal", "iTerm2", "alacritty", "kitty", "vim", "nvim", "emacs",
+    "docker-proxy", "kubectl", "minikube", "1password", "Dropbox", "OneDrive",
+]
+
+AI_PROCESSES = [
+    "ChatGPT", "ChatGPT Helper", "Claude", "claude-helper", "copilot-agent",
+    "copilot-language-server", "Code", "Code Helper", "Code Helper (Renderer)",
+    "code-insiders", "Cursor", "Cursor Helper", "fleet", "pycharm",
+    "pycharm64.exe", "intellij-idea", "idea64.exe", "ollama-llama-server",
+    "llama-server", "stable-diffusion-webui", "midjourney-bot",
+]
+
+
+def process_names(count: int, ai_share: float = 0.03, seed: int = 0) -> List[str]:
+    """Return count process names with roughly ai_share of them AI-related"""
+    rng = random.Random(seed)
+    base = SYSTEM_PROCESSES + APP_PROCESSES
+    names = []
+    for i in range(count):
+        if rng.random() < ai_share:
+            names.append(rng.choice(AI_PROCESSES))
+        elif rng.random() < 0.6:
+            names.append(rng.choice(base))
+        else:
+            # Long tail of per-host names (workers, helpers, versioned binaries)
+            names.append(f"{rng.choice(base)}-{rng.randrange(40)}")
+    return names
+
+
+def make_process_list(count: int, ai_share: float = 0.03, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    return [
+        {
+            "pid": 100 + i,
+            "name": name,
+            "cpu_percent": round(rng.random() * 8, 2),
+            "memory_percent": round(rng.random() * 3, 2),
+            "status": "running" if rng.random() < 0.2 else "sleeping",
+            "create_time": (now - timedelta(seconds=rng.randrange(86400))).isoformat(),
+            "instance_count": rng.randint(1, 6),
+        }
+        for i, name in enumerate(process_names(count, ai_share, seed))
+    ]
+
+
+def make_report(
+    client_id: Optional[str] = None,
+    process_count: int = 400,
+    organization_id: str = "001",
+    ai_share: float = 0.03,
+    seed: int = 0,
+) -> Dict:
+    """Build a SystemReport payload as sent by the client"""
+    now = datetime.utcnow()
+    return {
+        "client_id": client_id or str(uuid.uuid4()),
+        "report_id": f"report-{uuid.uuid4()}",
+        "timestamp": now.isoformat(),
+        "version": "1.0.0",
+        "user_info": {
+            "username": f"host-{seed}",
+            "email": "dev@example.com",
+            "department": "IT",
+            "role": "Software Engineer",
+            "location": "Bangalore, India",
+        },
+        "organization_id": organization_id,
+        "system_info": {
+            "platform": "linux",
+            "platform_release": "6.8.0",
+            "machine": "x86_64",
+            "processor": "x86_64",
+            "cpu_cores": 16,
+            "memory_total": 34359738368,
+            "memory_available": 17179869184,
+        },
+        "process_list": make_process_list(process_count, ai_share, seed),
+        "tags": ["local"],
+        "environment": "local",
+        "uptime": 86400.0,
+        "last_boot_time": (now - timedelta(days=1)).isoformat(),
+        "editor_extensions": {
+            "github.copilot-1.250.0": {
+                "editor": "vscode",
+                "name": "copilot",
+                "displayName": "GitHub Copilot",
+                "description": "Your AI pair programmer",
+                "version": "1.250.0",
+                "publisher": "GitHub",
+            }
+        },
+    }
@@ -1,40 +1,228 @@
 import os
+import re
+import gzip
 import time
 import json
+import random
 import platform
-import psutil
+import sys
+import threading
 import uuid
 import logging
-import requests
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from typing import Dict, List, Optional
 from pathlib import Path
+from xml.etree import ElementTree
+
+
+def _lazy_import(name):
+    """
+    Import a module on first attribute access. The agent starts at login on
+    every machine, and most of these are not needed before the first report
+    or at all (psutil on Linux, zstandard unless the server offers it).
+    Returns None when the module is not installed.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+psutil = _lazy_import("psutil")
+requests = _lazy_import("requests")
+orjson = _lazy_import("orjson")
+zstandard = _lazy_import("zstandard")  # zstd compression is optional
 
 SERVER_URL = os.getenv("SERVER_URL", "http://localhost:8000")
+# Read /proc directly on Linux instead of going through psutil; set to 0 to disable
+USE_PROCFS = os.getenv("ULTRON_PROCFS", "1") != "0"
+PROCFS_PATH = "/proc"
+EXTENSION_DEBOUNCE = 2.0  # quiet seconds before changed extensions are rescanned
+EXTENSION_DEBOUNCE_MAX = 30.0  # seconds; rescan during a burst that never settles
 REPORT_INTERVAL = 30  # seconds
+REPORT_JITTER = 0.1  # +/- fraction of the interval applied to every tick
+IDLE_BACKOFF_MAX = 4  # max interval multiplier after unchanged reports or failures
 ORGANIZATION_ID = "001"
 VERSION = "1.0.0"
+ULTRON_DIR = Path.home() / ".ultron"
+COMPRESSION_THRESHOLD = 1024  # bytes; smaller bodies are sent uncompressed
+REQUEST_TIMEOUT = (5, 30)  # connect, read timeouts in seconds
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_MAX = 30.0  # seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SPOOL_MAX_REPORTS = 1000  # oldest spooled reports are dropped beyond this
+SPOOL_DRAIN_BATCH = 100  # reports per bulk request when draining the spool
+FULL_REPORT_EVERY = 20  # send a full report after this many deltas
+DELTA_TOLERANCE = 0.5  # cpu/memory percent change that counts as a change
+# Report fields that are compared as a whole when building a delta
+DELTA_FIELDS = (
+    "version",
+    "user_info",
+    "organization_id",
+    "system_info",
+    "tags",
+    "environment",
+    "last_boot_time",
+)
+# system_info keys that change on every tick; they are still sent but do not
+# count as a change when backing off idle hosts
+VOLATILE_SYSTEM_INFO = ("memory_available",)
 
+# Extensions whose name, description or keywords contain one of these are AI-related
+AI_KEYWORDS = (
+    "ai",
+    "artificial intelligence",
+    "machine learning",
+    "copilot",
+    "gpt",
+    "completion",
+    "claude",
+    "llama",
+    "code generation",
+    "tabnine",
+    "kite",
+    "codewhisperer",
+    "intellicode",
+)
+AI_KEYWORD_MATCHER = re.compile("|".join(re.escape(keyword) for keyword in AI_KEYWORDS))
+MANIFEST_WORKERS = 8  # threads reading extension manifests during a full scan
+# plugin.xml elements kept as metadata; parsing stops once the required ones are read
+PLUGIN_XML_FIELDS = ("id", "name", "version", "vendor", "description")
+PLUGIN_XML_REQUIRED = {"name", "description", "vendor"}
+PLUGIN_XML_CHUNK = 2048  # bytes
 
-class DateTimeEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
 
+class ManifestCache:
+    """
+    Parsed extension manifests, persisted between runs.
 
-class EditorExtensionWatcher(FileSystemEventHandler):
-    def __init__(self, client_logger):
+    Each manifest path maps to the (mtime, size, inode) it had when parsed
+    and the resulting extension entry, or None when it was not AI-related.
+    A manifest whose stat still matches is not read again, so a startup
+    scan only stats files. Manifests not seen by a full scan are dropped,
+    and the whole cache is discarded when AI_KEYWORDS or VERSION change.
+    """
+
+    # Bump when parsing changes what an entry holds or which are AI-related
+    VERSION = 2
+
+    def __init__(self, client_logger, path=ULTRON_DIR / "extensions.json"):
+        self.logger = client_logger
+        self.path = path
+        # manifest path -> {"signature": [...], "entry": ...}
+        self._records: Dict[str, Dict] = {}
+        self._seen = set()
+        self._dirty = False
+        self._loaded = False
+
+    @staticmethod
+    def signature(stat) -> List[int]:
+        return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable extension cache: {e}")
+            return
+        if data.get("version") == self.VERSION and data.get("keywords") == list(
+            AI_KEYWORDS
+        ):
+            self._records = data["manifests"]
+
+    def lookup(self, manifest: str, signature: List[int]) -> Optional[Dict]:
+        """The cached record for an unchanged manifest, None otherwise"""
+        self._seen.add(manifest)
+        record = self._records.get(manifest)
+        if record is not None and record["signature"] == signature:
+            return record
+        return None
+
+    def store(self, manifest: str, signature: List[int], entry: Optional[Dict]):
+        self._seen.add(manifest)
+        self._records[manifest] = {"signature": signature, "entry": entry}
+        self._dirty = True
+
+    def forget(self, manifest: str):
+        if self._records.pop(manifest, None) is not None:
+            self._dirty = True
+
+    def begin_scan(self):
+        if not self._loaded:
+            # Read with the first full scan rather than at startup
+            self._load()
+            self._loaded = True
+        self._seen = set()
+
+    def end_scan(self):
+        """Drop manifests the full scan did not come across, then save"""
+        stale = self._records.keys() - self._seen
+        for manifest in stale:
+            del self._records[manifest]
+        self._dirty = self._dirty or bool(stale)
+        self.save()
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {
+            "version": self.VERSION,
+            "keywords": list(AI_KEYWORDS),
+            "manifests": self._records,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.warning(f"Could not cache extension manifests: {e}")
+
+
+class EditorExtensionWatcher:
+    """
+    Editor extensions found on this machine, kept current from file system
+    events. Acts as the watchdog event handler, so watchdog itself is only
+    imported once monitoring starts.
+    """
+
+    # Manifest of an extension, relative to its directory
+    MANIFESTS = {
+        "vscode": "package.json",
+        "jetbrains": "META-INF/plugin.xml",
+        "sublime": "package-metadata.json",
+    }
+
+    def __init__(self, client_logger, debounce=EXTENSION_DEBOUNCE, manifest_cache=None):
         self.extensions_cache = {}
         self.logger = client_logger
         self.logger.info("Initializing EditorExtensionWatcher")
+        if manifest_cache is None:
+            manifest_cache = ManifestCache(client_logger)
+        self.manifest_cache = manifest_cache
+        # Extension directories changed since the last rescan -> editor
+        self.debounce = debounce
+        self._pending: Dict[Path, str] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+        self._first_event = 0.0
+        self._last_event = 0.0
 
         # Define paths for different editors based on OS
         self.editor_paths = self._get_editor_paths()
-        # Immediately scan for extensions
-        self.scan_extensions()
 
     def _get_editor_paths(self):
         """Get editor extension paths based on OS"""
@@ -42,7 +230,7 @@ class EditorExtensionWatcher(FileSystemEventHandler):
         system = platform.system().lower()
         paths = {}
 
-        self.logger.info(f"Detecting editor paths for system: {system}")
+        self.logger.debug(f"Detecting editor paths for system: {system}")
 
         if system == "darwin":  # macOS
             paths = {
@@ -100,28 +288,34 @@ class EditorExtensionWatcher(FileSystemEventHandler):
                 ],
             }
 
-        # Log found paths and check existence
-        for editor, path_list in paths.items():
-            for path in path_list:
-                self.logger.info(
-                    f"Found {editor} path: {path} (exists: {path.exists()})"
-                )
-                if path.exists():
-                    self.logger.info(f"✓ Valid {editor} installation found at: {path}")
-
         return paths
 
     def scan_extensions(self):
         """Initial scan of all extensions"""
         self.logger.info("Starting initial extension scan")
+        candidates = []
         for editor, path_list in self.editor_paths.items():
             for path in path_list:
                 if path.exists():
                     self.logger.info(f"Scanning {editor} extensions at {path}")
-                    self._scan_editor_extensions(editor, path)
+                    candidates.extend(
+                        (editor, ext_dir)
+                        for ext_dir in self._extension_dirs(editor, path)
+                    )
                 else:
                     self.logger.debug(f"Path for {editor} does not exist: {path}")
 
+        # Reading manifests is I/O-bound, so a few threads overlap the reads.
+        # Each thread gets one contiguous slice to keep per-task overhead low.
+        self.manifest_cache.begin_scan()
+        workers = max(1, min(MANIFEST_WORKERS, len(candidates)))
+        slices = [candidates[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for chunk, entries in zip(slices, pool.map(self._read_extensions, slices)):
+                for (editor, ext_dir), entry in zip(chunk, entries):
+                    self._update_entry(editor, ext_dir, entry)
+        self.manifest_cache.end_scan()
+
         self.logger.info(
             f"Scan complete. Found {len(self.extensions_cache)} AI-related extensions"
         )
@@ -130,124 +324,165 @@ class EditorExtensionWatcher(FileSystemEventHandler):
                 f"Extensions found: {json.dumps(self.extensions_cache, indent=2)}"
             )
 
-    def _scan_editor_extensions(self, editor, path):
-        """Scan extensions for a specific editor"""
-        if editor == "vscode":
-            self._scan_vscode_extensions(path)
-        elif editor == "jetbrains":
-            self._scan_jetbrains_extensions(path)
-        elif editor == "sublime":
-            self._scan_sublime_extensions(path)
-
-    def _scan_vscode_extensions(self, path):
-        """Scan VS Code extensions"""
-        self.logger.info(f"Scanning VS Code extensions in {path}")
+    def _read_extensions(self, candidates) -> List[Optional[Dict]]:
+        return [self._read_extension(editor, ext_dir) for editor, ext_dir in candidates]
+
+    def _extension_dirs(self, editor, path) -> List[Path]:
+        """Candidate extension directories under one editor path"""
+        if editor == "jetbrains":
+            # <product>/plugins/<plugin>
+            return [
+                plugin_dir
+                for product_dir in self._subdirectories(path)
+                for plugin_dir in self._subdirectories(product_dir / "plugins")
+            ]
+        return self._subdirectories(path)
+
+    def _subdirectories(self, path) -> List[Path]:
         try:
-            for ext_dir in path.glob("*"):
-                if ext_dir.is_dir():
-                    package_json = ext_dir / "package.json"
-                    if package_json.exists():
-                        try:
-                            data = json.loads(package_json.read_text())
-                            if self._is_ai_related(data):
-                                self.logger.info(
-                                    f"Found AI-related VS Code extension: {data.get('name')}"
-                                )
-                                self.extensions_cache[ext_dir.name] = {
-                                    "editor": "vscode",
-                                    "name": data.get("name"),
-                                    "displayName": data.get("displayName"),
-                                    "description": data.get("description"),
-                                    "version": data.get("version"),
-                                    "publisher": data.get("publisher"),
-                                }
-                        except Exception as e:
-                            self.logger.error(
-                                f"Error reading VS Code extension {ext_dir}: {e}"
-                            )
-        except Exception as e:
-            self.logger.error(f"Error scanning VS Code extensions: {e}")
+            with os.scandir(path) as entries:
+                return [path / entry.name for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            self.logger.error(f"Error listing extensions in {path}: {e}")
+            return []
+
+    def _store_extension(self, editor, ext_dir):
+        """
+        Re-parse one extension directory and update its cache entry. The
+        entry is replaced in one step, so a report built meanwhile never
+        sees it missing.
+        """
+        self._update_entry(editor, ext_dir, self._read_extension(editor, ext_dir))
 
-    def _scan_jetbrains_extensions(self, path):
-        """Scan JetBrains plugins"""
-        self.logger.info(f"Scanning JetBrains plugins in {path}")
+    def _update_entry(self, editor, ext_dir, entry: Optional[Dict]):
+        if entry is not None:
+            self.extensions_cache[ext_dir.name] = entry
+        elif self.extensions_cache.get(ext_dir.name, {}).get("editor") == editor:
+            # Uninstalled, or no longer AI-related
+            self.extensions_cache.pop(ext_dir.name, None)
+
+    def _read_extension(self, editor, ext_dir) -> Optional[Dict]:
+        """
+        Cache entry for an AI-related extension, None otherwise. The manifest
+        is only parsed when its stat differs from the persisted one.
+        """
+        manifest = ext_dir / self.MANIFESTS[editor]
+        key = str(manifest)
         try:
-            for product_dir in path.glob("*"):
-                plugins_path = product_dir / "plugins"
-                if plugins_path.exists():
-                    for plugin_dir in plugins_path.glob("*"):
-                        plugin_xml = plugin_dir / "META-INF/plugin.xml"
-                        if plugin_xml.exists():
-                            try:
-                                content = plugin_xml.read_text().lower()
-                                if self._is_ai_related({"description": content}):
-                                    self.logger.info(
-                                        f"Found AI-related JetBrains plugin: {plugin_dir.name}"
-                                    )
-                                    self.extensions_cache[plugin_dir.name] = {
-                                        "editor": "jetbrains",
-                                        "name": plugin_dir.name,
-                                        "path": str(plugin_xml),
-                                        "product": product_dir.name,
-                                    }
-                            except Exception as e:
-                                self.logger.error(
-                                    f"Error reading JetBrains plugin {plugin_dir}: {e}"
-                                )
-        except Exception as e:
-            self.logger.error(f"Error scanning JetBrains plugins: {e}")
+            signature = ManifestCache.signature(manifest.stat())
+        except OSError:
+            self.manifest_cache.forget(key)
+            return None
+        record = self.manifest_cache.lookup(key, signature)
+        if record is not None:
+            return record["entry"]
 
-    def _scan_sublime_extensions(self, path):
-        """Scan Sublime Text packages"""
-        self.logger.info(f"Scanning Sublime Text packages in {path}")
         try:
-            for package_dir in path.glob("*"):
-                metadata = package_dir / "package-metadata.json"
-                if metadata.exists():
-                    try:
-                        data = json.loads(metadata.read_text())
-                        if self._is_ai_related(data):
-                            self.logger.info(
-                                f"Found AI-related Sublime package: {package_dir.name}"
-                            )
-                            self.extensions_cache[package_dir.name] = {
-                                "editor": "sublime",
-                                "name": package_dir.name,
-                                "description": data.get("description"),
-                                "version": data.get("version"),
-                            }
-                    except Exception as e:
-                        self.logger.error(
-                            f"Error reading Sublime package {package_dir}: {e}"
-                        )
+            if editor == "vscode":
+                entry = self._parse_vscode_extension(ext_dir, manifest)
+            elif editor == "jetbrains":
+                entry = self._parse_jetbrains_plugin(ext_dir, manifest)
+            else:
+                entry = self._parse_sublime_package(ext_dir, manifest)
         except Exception as e:
-            self.logger.error(f"Error scanning Sublime packages: {e}")
+            self.logger.error(f"Error reading {editor} extension {ext_dir}: {e}")
+            return None
+        self.manifest_cache.store(key, signature, entry)
+        return entry
 
-    def _is_ai_related(self, data):
-        """Check if extension is AI-related"""
-        ai_keywords = {
-            "ai",
-            "artificial intelligence",
-            "machine learning",
-            "copilot",
-            "gpt",
-            "completion",
-            "claude",
-            "llama",
-            "code generation",
-            "tabnine",
-            "kite",
-            "codewhisperer",
-            "intellicode",
+    def _parse_vscode_extension(self, ext_dir, package_json) -> Optional[Dict]:
+        data = json.loads(package_json.read_text())
+        if not self._is_ai_related(data):
+            return None
+        self.logger.info(f"Found AI-related VS Code extension: {data.get('name')}")
+        return {
+            "editor": "vscode",
+            "name": data.get("name"),
+            "displayName": data.get("displayName"),
+            "description": data.get("description"),
+            "version": data.get("version"),
+            "publisher": data.get("publisher"),
+        }
+
+    def _parse_jetbrains_plugin(self, plugin_dir, plugin_xml) -> Optional[Dict]:
+        fields = self._read_plugin_xml(plugin_xml)
+        name = fields.get("name") or plugin_dir.name
+        vendor = fields.get("vendor")
+        data = {
+            "name": name,
+            "description": fields.get("description"),
+            "keywords": [vendor] if vendor else [],
         }
+        if not self._is_ai_related(data):
+            return None
+        self.logger.info(f"Found AI-related JetBrains plugin: {name}")
+        return {
+            "editor": "jetbrains",
+            "name": name,
+            "id": fields.get("id"),
+            "description": fields.get("description"),
+            "version": fields.get("version"),
+            "vendor": vendor,
+            "path": str(plugin_xml),
+            # <product>/plugins/<plugin>
+            "product": plugin_dir.parent.parent.name,
+        }
+
+    @staticmethod
+    def _read_plugin_xml(plugin_xml) -> Dict[str, str]:
+        """
+        Top-level fields of a plugin.xml. The file is parsed as a stream and
+        reading stops once name, description and vendor have been seen, so
+        long extension declarations further down are never read.
+        """
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        fields = {}
+        depth = 0
+        with open(plugin_xml, "rb") as f:
+            while not PLUGIN_XML_REQUIRED.issubset(fields):
+                chunk = f.read(PLUGIN_XML_CHUNK)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                for event, element in parser.read_events():
+                    if event == "start":
+                        depth += 1
+                        continue
+                    depth -= 1
+                    if depth != 1:
+                        continue
+                    if element.tag in PLUGIN_XML_FIELDS:
+                        text = "".join(element.itertext()).strip()
+                        fields.setdefault(element.tag, text)
+                    # Drop finished top-level elements to keep memory flat
+                    element.clear()
+        return fields
 
-        description = str(data.get("description", "")).lower()
-        keywords = {str(k).lower() for k in data.get("keywords", [])}
-        name = str(data.get("name", "")).lower()
+    def _parse_sublime_package(self, package_dir, metadata) -> Optional[Dict]:
+        data = json.loads(metadata.read_text())
+        if not self._is_ai_related(data):
+            return None
+        self.logger.info(f"Found AI-related Sublime package: {package_dir.name}")
+        return {
+            "editor": "sublime",
+            "name": package_dir.name,
+            "description": data.get("description"),
+            "version": data.get("version"),
+        }
 
-        matches = any(
-            keyword in description or keyword in keywords or keyword in name
-            for keyword in ai_keywords
+    def _is_ai_related(self, data):
+        """Check if extension is AI-related"""
+        search = AI_KEYWORD_MATCHER.search
+        matches = bool(
+            search(str(data.get("description") or "").lower())
+            or search(str(data.get("name") or "").lower())
+            # Keywords only count when they are an AI keyword themselves
+            or any(
+                AI_KEYWORD_MATCHER.fullmatch(str(keyword).lower())
+                for keyword in data.get("keywords") or []
+            )
         )
 
         if matches:
@@ -257,29 +492,675 @@ class EditorExtensionWatcher(FileSystemEventHandler):
 
         return matches
 
+    def dispatch(self, event):
+        """Route a watchdog event to its on_<event type> handler"""
+        handler = getattr(self, f"on_{event.event_type}", None)
+        if handler is not None:
+            handler(event)
+
     def on_created(self, event):
         """Handle new extension installation"""
-        if not event.is_directory:
-            self._handle_extension_change(event.src_path, "installed")
+        self._handle_extension_change(event.src_path, "installed")
 
     def on_deleted(self, event):
         """Handle extension removal"""
-        if not event.is_directory:
-            self._handle_extension_change(event.src_path, "removed")
+        self._handle_extension_change(event.src_path, "removed")
 
     def on_modified(self, event):
         """Handle extension updates"""
         if not event.is_directory:
             self._handle_extension_change(event.src_path, "updated")
 
+    def on_moved(self, event):
+        """Handle extensions unpacked elsewhere and renamed into place"""
+        self._handle_extension_change(event.src_path, "removed")
+        self._handle_extension_change(event.dest_path, "installed")
+
+    def _extension_dir(self, path):
+        """The (editor, extension directory) a changed path belongs to, if any"""
+        for editor, path_list in self.editor_paths.items():
+            for base_path in path_list:
+                try:
+                    parts = path.relative_to(base_path).parts
+                except ValueError:
+                    continue
+                if editor == "jetbrains":
+                    # <product>/plugins/<plugin>/...
+                    if len(parts) >= 3 and parts[1] == "plugins":
+                        return editor, base_path / parts[0] / "plugins" / parts[2]
+                elif parts:
+                    return editor, base_path / parts[0]
+                return None
+        return None
+
     def _handle_extension_change(self, path, action):
-        """Process extension changes"""
-        path = Path(path)
-        for editor, base_path in self.editor_paths.items():
-            if str(base_path) in str(path):
-                self.logger.info(f"Extension {action} in {editor}: {path}")
-                self._scan_editor_extensions(editor, base_path)
-                break
+        """
+        Queue the extension directory a change belongs to. Bursts of events
+        are coalesced: each queued directory is re-parsed once, after no
+        event has arrived for the debounce window.
+        """
+        target = self._extension_dir(Path(path))
+        if target is None:
+            return
+        editor, ext_dir = target
+        self.logger.debug(f"Extension {action} in {editor}: {path}")
+
+        with self._pending_lock:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_event = now
+            self._pending[ext_dir] = editor
+            self._last_event = now
+            if self._flush_timer is None:
+                self._start_flush_timer(self.debounce)
+
+    def _start_flush_timer(self, delay):
+        self._flush_timer = threading.Timer(delay, self.flush_pending)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush_pending(self, force=False):
+        """Re-parse the extension directories queued by recent events"""
+        with self._pending_lock:
+            now = time.monotonic()
+            quiet = now - self._last_event
+            waited = now - self._first_event
+            settling = quiet < self.debounce and waited < EXTENSION_DEBOUNCE_MAX
+            if settling and not force:
+                # Still in a burst; wait for it to settle
+                self._start_flush_timer(self.debounce - quiet)
+                return
+            pending, self._pending = self._pending, {}
+            self._flush_timer = None
+
+        for ext_dir, editor in pending.items():
+            self._store_extension(editor, ext_dir)
+        if pending:
+            self.logger.info(f"Rescanned {len(pending)} changed extensions")
+            self.manifest_cache.save()
+
+    def stop(self):
+        """Cancel a pending rescan"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+
+class ProcessSampler:
+    """
+    Stateful per-process sampler.
+
+    Keeps one psutil.Process handle per PID across scans, so CPU usage is
+    the real delta of CPU time since the previous scan and a known process
+    costs a single oneshot() read. Only PIDs not seen before are opened.
+    A process seen for the first time reports its lifetime average. Handles
+    of exited processes are evicted every scan.
+    """
+
+    def __init__(self, client_logger):
+        self.logger = client_logger
+        # pid -> (handle, name, cpu seconds, sampled at)
+        self._handles: Dict[int, tuple] = {}
+        self.last_scan_seconds = 0.0
+
+    def memory(self):
+        """Total and available system memory, in bytes"""
+        memory = psutil.virtual_memory()
+        return memory.total, memory.available
+
+    def boot_time(self) -> float:
+        return psutil.boot_time()
+
+    @staticmethod
+    def _read(handle):
+        with handle.oneshot():
+            return (
+                handle.cpu_times(),
+                handle.name(),
+                handle.status(),
+                handle.memory_info().rss,
+            )
+
+    def sample(self) -> List[Dict]:
+        """One scan of all processes, as per-process info dicts"""
+        start = time.perf_counter()
+        now = time.time()
+        total_memory = psutil.virtual_memory().total
+        handles = {}
+        samples = []
+
+        for pid in psutil.pids():
+            cached = self._handles.get(pid)
+            try:
+                if cached is not None:
+                    handle, previous_name, previous_cpu, previous_at = cached
+                    times, name, status, rss = self._read(handle)
+                    # A reused PID shows up as another program, or as CPU
+                    # time going backwards; open it again in that case
+                    if name != previous_name or times.user + times.system < previous_cpu:
+                        cached = None
+                if cached is None:
+                    handle = psutil.Process(pid)
+                    times, name, status, rss = self._read(handle)
+                # Read once when the handle is opened, then cached by psutil
+                create_time = handle.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+                self.logger.debug(f"Could not get process info: {e}")
+                continue
+
+            cpu_seconds = times.user + times.system
+            if cached is None:
+                elapsed = now - create_time
+                cpu_delta = cpu_seconds
+            else:
+                elapsed = now - previous_at
+                cpu_delta = cpu_seconds - previous_cpu
+            cpu_percent = cpu_delta / elapsed * 100 if elapsed > 0 else 0.0
+
+            handles[pid] = (handle, name, cpu_seconds, now)
+            samples.append(
+                {
+                    "pid": pid,
+                    "name": name,
+                    "cpu_percent": cpu_percent,
+                    "memory_percent": rss / total_memory * 100,
+                    "status": status,
+                    "create_time": create_time,
+                }
+            )
+
+        # Anything not seen in this scan has exited
+        self._handles = handles
+        self.last_scan_seconds = time.perf_counter() - start
+        self.logger.debug(
+            f"Scanned {len(samples)} processes in {self.last_scan_seconds * 1000:.1f} ms"
+        )
+        return samples
+
+
+class ProcfsSampler:
+    """
+    Linux-only process sampler that reads /proc/<pid>/stat directly.
+
+    Produces the same per-process dicts as ProcessSampler without going
+    through psutil: one open and one read per process into a reused buffer,
+    parsing only state, utime/stime, starttime and rss. The process name
+    follows psutil's rule of replacing a truncated 15-character comm with
+    the cmdline basename; that extra read happens once per process. A PID
+    whose starttime changed has been reused and is treated as new.
+    """
+
+    # psutil's status names for /proc/<pid>/stat state letters
+    STATES = {
+        "R": "running",
+        "S": "sleeping",
+        "D": "disk-sleep",
+        "T": "stopped",
+        "t": "tracing-stop",
+        "Z": "zombie",
+        "X": "dead",
+        "x": "dead",
+        "K": "wake-kill",
+        "W": "waking",
+        "I": "idle",
+        "P": "parked",
+    }
+    # The kernel truncates comm to this many characters
+    COMM_LENGTH = 15
+
+    def __init__(self, client_logger, procfs_path=PROCFS_PATH):
+        self.logger = client_logger
+        self.procfs_path = procfs_path
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._boot_time = self._read_boot_time()
+        self._total_memory = self._read_total_memory()
+        self._buffer = bytearray(4096)
+        # pid -> (starttime ticks, comm, name, cpu seconds, sampled at)
+        self._known: Dict[int, tuple] = {}
+        self.last_scan_seconds = 0.0
+
+    @staticmethod
+    def available(procfs_path=PROCFS_PATH) -> bool:
+        return sys.platform.startswith("linux") and os.path.exists(
+            os.path.join(procfs_path, "self", "stat")
+        )
+
+    def _read_boot_time(self) -> float:
+        with open(os.path.join(self.procfs_path, "stat"), "rb") as f:
+            for line in f:
+                if line.startswith(b"btime"):
+                    return float(line.split()[1])
+        raise RuntimeError(f"No btime in {self.procfs_path}/stat")
+
+    def _read_total_memory(self) -> int:
+        with open(os.path.join(self.procfs_path, "meminfo"), "rb") as f:
+            for line in f:
+                if line.startswith(b"MemTotal:"):
+                    return int(line.split()[1]) * 1024
+        raise RuntimeError(f"No MemTotal in {self.procfs_path}/meminfo")
+
+    def memory(self):
+        """Total and available system memory, in bytes, as psutil reports them"""
+        available = None
+        with open(os.path.join(self.procfs_path, "meminfo"), "rb") as f:
+            for line in f:
+                if line.startswith(b"MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+                    break
+        if available is None:
+            # Kernels before 3.14
+            available = psutil.virtual_memory().available
+        return self._total_memory, available
+
+    def boot_time(self) -> float:
+        return self._boot_time
+
+    def _read_name(self, path: str, comm: str) -> str:
+        """The cmdline basename when comm is its truncated prefix, like psutil"""
+        try:
+            with open(os.path.join(path, "cmdline"), "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            return comm
+        if not cmdline:
+            return comm
+        sep = b"\0" if cmdline.endswith(b"\0") else b" "
+        executable = cmdline.split(sep, 1)[0].decode("utf-8", "surrogateescape")
+        extended = os.path.basename(executable)
+        return extended if extended.startswith(comm) else comm
+
+    def sample(self) -> List[Dict]:
+        """One scan of all processes, as per-process info dicts"""
+        start = time.perf_counter()
+        now = time.time()
+        buffer = self._buffer
+        known = {}
+        samples = []
+
+        with os.scandir(self.procfs_path) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                try:
+                    fd = os.open(entry.path + "/stat", os.O_RDONLY)
+                    try:
+                        size = os.readv(fd, (buffer,))
+                    finally:
+                        os.close(fd)
+                except OSError as e:
+                    self.logger.debug(f"Could not get process info: {e}")
+                    continue
+                if not size:
+                    continue
+
+                # comm may contain spaces and parentheses; it ends at the last ")"
+                close = buffer.rfind(b")", 0, size)
+                comm = buffer[buffer.find(b"(", 0, size) + 1 : close].decode(
+                    "utf-8", "surrogateescape"
+                )
+                fields = buffer[close + 2 : size].split()
+                starttime = int(fields[19])
+                cpu_seconds = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+                rss = int(fields[21]) * self._page_size
+                create_time = self._boot_time + starttime / self._clock_ticks
+
+                cached = self._known.get(pid)
+                if cached is not None and (cached[0] != starttime or cached[1] != comm):
+                    cached = None
+                if cached is not None:
+                    name = cached[2]
+                    elapsed = now - cached[4]
+                    cpu_delta = cpu_seconds - cached[3]
+                else:
+                    name = comm
+                    if len(comm) >= self.COMM_LENGTH:
+                        name = self._read_name(entry.path, comm)
+                    elapsed = now - create_time
+                    cpu_delta = cpu_seconds
+                cpu_percent = cpu_delta / elapsed * 100 if elapsed > 0 else 0.0
+
+                known[pid] = (starttime, comm, name, cpu_seconds, now)
+                samples.append(
+                    {
+                        "pid": pid,
+                        "name": name,
+                        "cpu_percent": cpu_percent,
+                        "memory_percent": rss / self._total_memory * 100,
+                        "status": self.STATES.get(chr(fields[0][0]), "unknown"),
+                        "create_time": create_time,
+                    }
+                )
+
+        # Anything not seen in this scan has exited
+        self._known = known
+        self.last_scan_seconds = time.perf_counter() - start
+        self.logger.debug(
+            f"Scanned {len(samples)} processes in {self.last_scan_seconds * 1000:.1f} ms"
+        )
+        return samples
+
+
+class ReportSpool:
+    """
+    Bounded on-disk queue of reports that could not be delivered.
+
+    Each report is one JSON file named by its enqueue time, so listing the
+    directory yields the oldest reports first. When full, the oldest reports
+    are dropped. Reports the server refuses are moved to a bounded
+    rejected/ directory instead of being retried.
+    """
+
+    def __init__(self, client_logger, path=ULTRON_DIR / "spool", max_reports=SPOOL_MAX_REPORTS):
+        self.logger = client_logger
+        self.path = path
+        self.max_reports = max_reports
+
+    def _files(self) -> List[Path]:
+        try:
+            return sorted(self.path.glob("*.json"))
+        except OSError:
+            return []
+
+    def __len__(self) -> int:
+        return len(self._files())
+
+    def put(self, body: bytes):
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            name = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.json"
+            tmp = self.path / f".{name}.tmp"
+            tmp.write_bytes(body)
+            tmp.replace(self.path / name)
+        except OSError as e:
+            self.logger.error(f"Could not spool report: {e}")
+            return
+
+        files = self._files()
+        if len(files) > self.max_reports:
+            dropped = files[: len(files) - self.max_reports]
+            self.logger.warning(f"Spool full, dropping {len(dropped)} oldest reports")
+            self.remove(dropped)
+
+    def oldest(self, limit: int) -> List[Path]:
+        return self._files()[:limit]
+
+    def quarantine(self, files: List[Path]):
+        """Set reports aside so they no longer block the spool"""
+        rejected = self.path / "rejected"
+        try:
+            rejected.mkdir(exist_ok=True)
+            for file in files:
+                file.replace(rejected / file.name)
+        except OSError as e:
+            self.logger.error(f"Could not quarantine spooled reports, dropping them: {e}")
+            self.remove(files)
+            return
+
+        kept = sorted(rejected.glob("*.json"))
+        self.remove(kept[: max(len(kept) - self.max_reports, 0)])
+
+    def remove(self, files: List[Path]):
+        for file in files:
+            try:
+                file.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ReportTransport:
+    """
+    HTTP transport to the server.
+
+    Reuses one keep-alive session, applies explicit timeouts, retries
+    transient failures with jittered exponential backoff, and compresses
+    bodies with the best encoding the server advertises. Reports that
+    still cannot be delivered are spooled to disk and drained in bulk,
+    oldest first, once the server is reachable again.
+    """
+
+    def __init__(self, server_url, client_logger, spool=None):
+        self.server_url = server_url
+        self.logger = client_logger
+        self._session = None
+        self.spool = spool if spool is not None else ReportSpool(client_logger)
+        # Request body encoding, negotiated from the server's Accept-Encoding
+        self.request_encoding = None
+
+    @property
+    def session(self):
+        """Keep-alive session, created on first use so requests loads lazily"""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def _negotiate_encoding(self, accept_encoding):
+        """Pick the best request encoding the server advertises"""
+        if accept_encoding is None:
+            return
+        offered = {value.strip().lower() for value in accept_encoding.split(",")}
+        if zstandard is not None and "zstd" in offered:
+            self.request_encoding = "zstd"
+        elif "gzip" in offered:
+            self.request_encoding = "gzip"
+        else:
+            self.request_encoding = None
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(body)
+        return gzip.compress(body, compresslevel=6)
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff, honoring Retry-After"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX)
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+    def request(self, method: str, path: str, **kwargs):
+        """Send a request, retrying connection errors and transient statuses"""
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        url = f"{self.server_url}{path}"
+        for attempt in range(MAX_RETRIES + 1):
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                self._negotiate_encoding(response.headers.get("Accept-Encoding"))
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                error = requests.exceptions.HTTPError(
+                    f"{response.status_code} from {url}", response=response
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                error = e
+            if attempt == MAX_RETRIES:
+                if response is not None:
+                    return response
+                raise error
+            delay = self._backoff(attempt, response)
+            self.logger.warning(f"{method} {path} failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def post(self, path: str, body: bytes, content_type="application/json"):
+        """POST a body, compressed when the server supports it"""
+        headers = {"Content-Type": content_type}
+        encoding = self.request_encoding
+        if encoding is not None and len(body) >= COMPRESSION_THRESHOLD:
+            headers["Content-Encoding"] = encoding
+            data = self._compress(body, encoding)
+        else:
+            encoding = None
+            data = body
+
+        response = self.request("POST", path, headers=headers, data=data)
+        if encoding is not None and response.status_code == 415:
+            # The server stopped accepting this encoding; resend as-is
+            self.logger.warning(f"Server rejected {encoding} request body")
+            headers.pop("Content-Encoding")
+            response = self.request("POST", path, headers=headers, data=body)
+        return response
+
+    def post_json(self, path: str, payload: Dict):
+        # orjson writes datetimes as ISO 8601 itself
+        return self.post(path, orjson.dumps(payload))
+
+    def spool_report(self, report: Dict):
+        self.spool.put(orjson.dumps(report))
+
+    def drain_spool(self) -> int:
+        """
+        Deliver spooled reports through the bulk endpoint, oldest first.
+        Returns the number delivered. A batch the server refuses with a 4xx,
+        e.g. a 404 from a server without the bulk endpoint, is quarantined;
+        other failures raise and leave the batch spooled.
+        """
+        delivered = 0
+        while True:
+            files = self.spool.oldest(SPOOL_DRAIN_BATCH)
+            if not files:
+                return delivered
+            bodies = []
+            for file in files:
+                try:
+                    bodies.append(file.read_bytes())
+                except OSError as e:
+                    self.logger.error(f"Dropping unreadable spooled report {file}: {e}")
+            response = self.post(
+                "/api/v1/reports/bulk", b"\n".join(bodies), "application/x-ndjson"
+            )
+            if 400 <= response.status_code < 500:
+                self.logger.error(
+                    f"Server refused {len(files)} spooled reports "
+                    f"({response.status_code}), moving them to quarantine"
+                )
+                self.spool.quarantine(files)
+                continue
+            response.raise_for_status()
+            rejected = response.json().get("rejected", 0)
+            if rejected:
+                self.logger.warning(f"Server rejected {rejected} spooled reports")
+            self.spool.remove(files)
+            delivered += len(bodies)
+            self.logger.info(f"Delivered {len(bodies)} spooled reports")
+
+
+class ProcessPatternCache:
+    """
+    Server-published AI process patterns, cached on disk.
+
+    Lets the client drop processes the server would discard anyway before
+    serializing a report. The pattern set is only re-downloaded when the
+    server reports a different classifier version (ETag).
+    """
+
+    def __init__(self, transport, client_logger, path=ULTRON_DIR / "classifier.json"):
+        self.transport = transport
+        self.logger = client_logger
+        self.path = path
+        self.etag = None
+        self._search = None
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+            self._compile(data["version"], data["patterns"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable classifier cache: {e}")
+
+    def _compile(self, etag, patterns):
+        if patterns:
+            alternation = "|".join(re.escape(key) for key in patterns)
+            self._search = re.compile(alternation).search
+        else:
+            self._search = None
+        self.etag = etag
+
+    @property
+    def available(self) -> bool:
+        return self.etag is not None
+
+    def refresh(self, server_version=None):
+        """Fetch the pattern set unless the cached one is current"""
+        if server_version is not None and server_version == self.etag:
+            return
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        try:
+            response = self.transport.request(
+                "GET", "/api/v1/classifier", headers=headers
+            )
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Could not refresh classifier patterns: {e}")
+            return
+        if response.status_code == 304:
+            return
+        if response.status_code != 200:
+            # Older servers do not publish patterns; keep sending everything
+            self.logger.debug(f"Classifier not available: {response.status_code}")
+            return
+
+        data = response.json()
+        self._compile(data["version"], data["patterns"])
+        self.logger.info(f"Updated classifier patterns to version {self.etag}")
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            self.path.write_text(json.dumps(data))
+        except OSError as e:
+            self.logger.warning(f"Could not cache classifier patterns: {e}")
+
+    def filter(self, process_list: List[Dict]) -> List[Dict]:
+        """Keep only processes matching a published pattern"""
+        if not self.available:
+            return process_list
+        search = self._search
+        if search is None:
+            return []
+        return [proc for proc in process_list if search(proc["name"].lower())]
+
+
+class ReportScheduler:
+    """
+    Decide when the next report is sent.
+
+    The first report waits a random offset within one interval, and every
+    tick is jittered, so clients restarted together do not stay
+    phase-aligned. The server can stretch the interval through the
+    next_report_in hint, and consecutive unchanged reports or failures back
+    off exponentially up to IDLE_BACKOFF_MAX times the interval.
+    """
+
+    def __init__(self, interval=REPORT_INTERVAL, jitter=REPORT_JITTER):
+        self.interval = interval
+        self.jitter = jitter
+        self.server_interval = None
+        self.streak = 0
+
+    def initial_delay(self) -> float:
+        return random.uniform(0, self.interval)
+
+    def next_delay(self, server_hint=None, changed=True, failed=False) -> float:
+        if server_hint is not None:
+            self.server_interval = max(float(server_hint), 1.0)
+        if changed and not failed:
+            self.streak = 0
+        else:
+            self.streak += 1
+
+        base = self.server_interval or self.interval
+        multiplier = min(2**self.streak, IDLE_BACKOFF_MAX)
+        return base * multiplier * random.uniform(1 - self.jitter, 1 + self.jitter)
 
 
 class UltronEyeClient:
@@ -294,14 +1175,28 @@ class UltronEyeClient:
         print(f"Client ID: {self.client_id}")
         self.setup_logging()
         self.extension_watcher = EditorExtensionWatcher(self.logger)
-        self.observer = Observer()
-        self.start_extension_monitoring()
+        if USE_PROCFS and ProcfsSampler.available():
+            self.process_sampler = ProcfsSampler(self.logger)
+        else:
+            self.process_sampler = ProcessSampler(self.logger)
+        self.transport = ReportTransport(self.server_url, self.logger)
+        self.pattern_cache = ProcessPatternCache(self.transport, self.logger)
+        # Started by start_monitoring once the first report is out
+        self.observer = None
+        # Last report state the server acknowledged, used to build deltas
+        self.acked_sequence = None
+        self.acked_processes = {}
+        self.acked_extensions = {}
+        self.acked_fields = {}
+        self.deltas_since_full = 0
+        self.last_report_changed = True
 
     def establish_connection(self):
         """
         Establish a connection with the server.
         """
-        response = requests.get(f"{self.server_url}/api/v1/connect")
+        response = self.transport.request("GET", "/api/v1/connect")
+        self.pattern_cache.refresh()
         if response.status_code == 200:
             self.logger.info("Successfully connected to the server")
         else:
@@ -329,65 +1224,44 @@ class UltronEyeClient:
 
     def collect_system_info(self) -> Dict:
         """Collect comprehensive system information"""
-        cpu_cores = psutil.cpu_count(logical=True)
+        memory_total, memory_available = self.process_sampler.memory()
 
         return {
             "platform": platform.system().lower(),
             "platform_release": platform.release(),
             "machine": platform.machine(),
             "processor": platform.processor(),
-            "cpu_cores": cpu_cores,
-            "memory_total": psutil.virtual_memory().total,
-            "memory_available": psutil.virtual_memory().available,
+            "cpu_cores": os.cpu_count(),
+            "memory_total": memory_total,
+            "memory_available": memory_available,
         }
 
     def collect_process_info(self) -> List[Dict]:
         """Collect detailed information about running processes"""
         processes = {}  # Use dict to track unique processes by name
 
-        for proc in psutil.process_iter(
-            [
-                "pid",
-                "name",
-                "cpu_percent",
-                "memory_percent",
-                "status",
-                "create_time",
-                "cmdline",
-            ]
-        ):
-            try:
-                proc_info = proc.info
-                name = proc_info["name"]
-
-                # If we already have this process name, update the metrics
-                if name in processes:
-                    processes[name]["cpu_percent"] += proc_info["cpu_percent"] or 0.0
-                    processes[name]["memory_percent"] += (
-                        proc_info["memory_percent"] or 0.0
-                    )
-                    processes[name]["instance_count"] += 1
-                    # Keep the earliest create time
-                    if proc_info["create_time"] < processes[name]["create_time"]:
-                        processes[name]["create_time"] = proc_info["create_time"]
-                else:
-                    # First instance of this process
-                    processes[name] = {
-                        "pid": proc_info["pid"],  # Keep first PID seen
-                        "name": name,
-                        "cpu_percent": proc_info["cpu_percent"] or 0.0,
-                        "memory_percent": proc_info["memory_percent"] or 0.0,
-                        "status": proc_info["status"],
-                        "create_time": proc_info["create_time"],
-                        "instance_count": 1,
-                    }
+        for proc_info in self.process_sampler.sample():
+            name = proc_info["name"]
 
-            except (
-                psutil.NoSuchProcess,
-                psutil.AccessDenied,
-                psutil.ZombieProcess,
-            ) as e:
-                self.logger.debug(f"Could not get process info: {e}")
+            # If we already have this process name, update the metrics
+            if name in processes:
+                processes[name]["cpu_percent"] += proc_info["cpu_percent"]
+                processes[name]["memory_percent"] += proc_info["memory_percent"]
+                processes[name]["instance_count"] += 1
+                # Keep the earliest create time
+                if proc_info["create_time"] < processes[name]["create_time"]:
+                    processes[name]["create_time"] = proc_info["create_time"]
+            else:
+                # First instance of this process
+                processes[name] = {
+                    "pid": proc_info["pid"],  # Keep first PID seen
+                    "name": name,
+                    "cpu_percent": proc_info["cpu_percent"],
+                    "memory_percent": proc_info["memory_percent"],
+                    "status": proc_info["status"],
+                    "create_time": proc_info["create_time"],
+                    "instance_count": 1,
+                }
 
         # Convert the dictionary to a list and format the data
         process_list = []
@@ -407,17 +1281,21 @@ class UltronEyeClient:
         return process_list
 
     def start_extension_monitoring(self):
-        """Start monitoring editor extensions"""
+        """Scan editor extensions and start watching them for changes"""
+        from watchdog.observers import Observer
+
+        self.observer = Observer()
         try:
             # Initial scan
             self.extension_watcher.scan_extensions()
 
             # Start watching for changes
-            for path in self.extension_watcher.editor_paths.values():
-                if path.exists():
-                    self.observer.schedule(
-                        self.extension_watcher, str(path), recursive=True
-                    )
+            for path_list in self.extension_watcher.editor_paths.values():
+                for path in path_list:
+                    if path.exists():
+                        self.observer.schedule(
+                            self.extension_watcher, str(path), recursive=True
+                        )
 
             self.observer.start()
             self.logger.info("Started monitoring editor extensions")
@@ -426,7 +1304,7 @@ class UltronEyeClient:
 
     def generate_report(self) -> Dict:
         """Generate a complete system report"""
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
+        boot_time = datetime.fromtimestamp(self.process_sampler.boot_time())
         uptime = (datetime.now() - boot_time).total_seconds()
 
         return {
@@ -437,64 +1315,197 @@ class UltronEyeClient:
             "user_info": self.user_info,
             "organization_id": self.organization_id,
             "system_info": self.collect_system_info(),
-            "process_list": self.collect_process_info(),
-            "editor_extensions": self.extension_watcher.extensions_cache,
+            "process_list": self.pattern_cache.filter(self.collect_process_info()),
+            # Copied, as rescans update the cache from the watcher thread
+            "editor_extensions": dict(self.extension_watcher.extensions_cache),
             "tags": ["local"],
             "environment": "local",
             "uptime": uptime,
             "last_boot_time": boot_time,
         }
 
+    def _process_changed(self, old: Dict, new: Dict) -> bool:
+        """Whether a process differs enough from the acknowledged one to resend"""
+        return (
+            old["status"] != new["status"]
+            or old["instance_count"] != new["instance_count"]
+            or old["pid"] != new["pid"]
+            or abs(old["cpu_percent"] - new["cpu_percent"]) >= DELTA_TOLERANCE
+            or abs(old["memory_percent"] - new["memory_percent"]) >= DELTA_TOLERANCE
+        )
+
+    def generate_delta(self, report: Dict) -> Dict:
+        """
+        Build a delta of report against the last acknowledged state, or
+        return None when a full report is due.
+        """
+        if self.acked_sequence is None or self.deltas_since_full >= FULL_REPORT_EVERY:
+            return None
+
+        processes = {proc["name"]: proc for proc in report["process_list"]}
+        extensions = report["editor_extensions"]
+        delta = {
+            "client_id": self.client_id,
+            "base_sequence": self.acked_sequence,
+            "report_id": report["report_id"],
+            "timestamp": report["timestamp"],
+            "uptime": report["uptime"],
+            "processes_changed": [
+                proc
+                for name, proc in processes.items()
+                if name not in self.acked_processes
+                or self._process_changed(self.acked_processes[name], proc)
+            ],
+            "processes_removed": [
+                name for name in self.acked_processes if name not in processes
+            ],
+            "extensions_changed": {
+                key: value
+                for key, value in extensions.items()
+                if self.acked_extensions.get(key) != value
+            },
+            "extensions_removed": [
+                key for key in self.acked_extensions if key not in extensions
+            ],
+        }
+        for field in DELTA_FIELDS:
+            if self.acked_fields.get(field) != report[field]:
+                delta[field] = report[field]
+        return delta
+
+    @staticmethod
+    def _stable_system_info(system_info: Dict) -> Dict:
+        return {
+            key: value
+            for key, value in (system_info or {}).items()
+            if key not in VOLATILE_SYSTEM_INFO
+        }
+
+    def _delta_has_changes(self, delta: Dict) -> bool:
+        """Whether a delta (before it is acknowledged) carries a real change"""
+        if "system_info" in delta and self._stable_system_info(
+            delta["system_info"]
+        ) != self._stable_system_info(self.acked_fields.get("system_info")):
+            return True
+        return bool(
+            delta["processes_changed"]
+            or delta["processes_removed"]
+            or delta["extensions_changed"]
+            or delta["extensions_removed"]
+            or any(field in delta for field in DELTA_FIELDS if field != "system_info")
+        )
+
+    def _acknowledge(self, report: Dict, delta: Dict, sequence):
+        """Record what the server now holds for this client"""
+        if sequence is None:
+            # Server without delta support
+            self.acked_sequence = None
+            return
+
+        if delta is None:
+            self.acked_processes = {proc["name"]: proc for proc in report["process_list"]}
+            self.deltas_since_full = 0
+        else:
+            # Unsent small changes stay measured against the acknowledged
+            # values, so slow drift is eventually reported
+            for name in delta["processes_removed"]:
+                self.acked_processes.pop(name, None)
+            for proc in delta["processes_changed"]:
+                self.acked_processes[proc["name"]] = proc
+            self.deltas_since_full += 1
+
+        self.acked_extensions = dict(report["editor_extensions"])
+        self.acked_fields = {field: report[field] for field in DELTA_FIELDS}
+        self.acked_sequence = sequence
+
     def send_report(self) -> Dict:
-        """Send the system report to the server"""
+        """
+        Send the system report to the server, as a delta against the last
+        acknowledged report when possible. Reports that cannot be delivered
+        are spooled and sent, oldest first, before the next report; failing
+        to drain the spool never holds back the current report.
+        """
+        report = None
         try:
             report = self.generate_report()
             self.logger.info(f"Generated report for client: {self.client_id}")
             self.logger.debug(f"Report data: {report}")
 
-            # Convert report to JSON with datetime handling
-            json_data = json.dumps(report, cls=DateTimeEncoder)
+            # Older spooled reports should reach the server before this one
+            try:
+                self.transport.drain_spool()
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"Could not drain spooled reports: {e}")
 
-            response = requests.post(
-                f"{self.server_url}/api/v1/report",
-                headers={"Content-Type": "application/json"},
-                data=json_data,
-            )
+            delta = self.generate_delta(report)
+            if delta is not None:
+                response = self.transport.post_json("/api/v1/report/delta", delta)
+                if response.status_code == 409:
+                    self.logger.info("Server requested a full resync")
+                    delta = None
+            if delta is None:
+                response = self.transport.post_json("/api/v1/report", report)
 
             response.raise_for_status()
 
             self.logger.info(
-                f"Successfully sent report. Status code: {response.status_code}"
+                f"Successfully sent {'delta' if delta else 'full'} report. "
+                f"Status code: {response.status_code}"
             )
             self.logger.debug(f"Server response: {response.json()}")
 
-            return response.json()
+            result = response.json()
+            self.last_report_changed = delta is None or self._delta_has_changes(delta)
+            self._acknowledge(report, delta, result.get("sequence"))
+            if "classifier_version" in result:
+                self.pattern_cache.refresh(result["classifier_version"])
+            return result
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to send report: {str(e)}")
+            status = getattr(e.response, "status_code", None)
+            if report is not None and (status is None or status >= 500):
+                self.transport.spool_report(report)
+                self.logger.info(f"Spooled report ({len(self.transport.spool)} pending)")
             raise
         except Exception as e:
             self.logger.error(f"Unexpected error: {str(e)}")
             raise
 
-    def start_monitoring(self, interval=30):
+    def start_monitoring(self, interval=REPORT_INTERVAL):
         """
-        Start continuous monitoring with specified interval (default 5 minutes)
+        Start continuous monitoring with specified interval (default 30 seconds),
+        spread and paced by a ReportScheduler
         """
-        self.logger.info(f"Starting monitoring with interval of {interval} seconds")
+        scheduler = ReportScheduler(interval)
+        delay = scheduler.initial_delay()
+        self.logger.info(
+            f"Starting monitoring with interval of {interval} seconds, "
+            f"first report in {delay:.1f} seconds"
+        )
         while True:
             try:
-                self.send_report()
-                time.sleep(interval)
+                time.sleep(delay)
+                result = self.send_report()
+                delay = scheduler.next_delay(
+                    result.get("next_report_in"), changed=self.last_report_changed
+                )
             except KeyboardInterrupt:
                 self.logger.info("Monitoring stopped by user")
                 break
             except Exception as e:
                 self.logger.error(f"Unexpected error: {str(e)}")
-                time.sleep(60)  # Wait a minute before retrying
+                delay = scheduler.next_delay(failed=True)
+            if self.observer is None:
+                # Deferred so the extension scan never delays the first report;
+                # extensions are included from the next report on
+                self.start_extension_monitoring()
+            self.logger.debug(f"Next report in {delay:.1f} seconds")
 
     def __del__(self):
         """Cleanup when the client is destroyed"""
-        if hasattr(self, "observer"):
+        if hasattr(self, "extension_watcher"):
+            self.extension_watcher.stop()
+        if getattr(self, "observer", None) is not None and self.observer.is_alive():
             self.observer.stop()
             self.observer.join()
 
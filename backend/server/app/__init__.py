@@ -1,10 +1,81 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from server.app.api.v1.endpoints import router as api_v1_router
+from server.app.core.analytics import analytics_aggregator
+from server.app.core.cache import response_cache
+from server.app.core.compression import DecompressionMiddleware
+from server.app.core.config import settings
+from server.app.core.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from server.app.db.base import StorageError
+from server.app.db.store import report_store
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_timeseries(interval: int):
+    """Apply time-series retention on a schedule"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            report_store.prune()
+        except Exception as e:
+            logger.error(f"Time-series pruning failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Persistent stores may already hold reports from a previous run
+    analytics_aggregator.load_totals(report_store.category_totals())
+    analytics_aggregator.load_distributions(report_store.latest_reports())
+    pruner = asyncio.create_task(prune_timeseries(settings.TIMESERIES_PRUNE_INTERVAL))
+    yield
+    pruner.cancel()
+    try:
+        report_store.flush()
+    except StorageError as e:
+        logger.error(f"Shutting down with unwritten reports: {e}")
+
+
+def register_gauges():
+    metrics.gauge("ultron_store_clients", "Clients with a stored report", report_store.__len__)
+    metrics.gauge(
+        "ultron_store_reports_in_memory",
+        "Reports held in memory, history included",
+        report_store.reports_in_memory,
+    )
+    metrics.gauge(
+        "ultron_store_processes",
+        "AI processes in the latest report of every client",
+        lambda: analytics_aggregator.total_processes,
+    )
+    metrics.gauge(
+        "ultron_response_cache_entries", "Cached responses", response_cache.__len__
+    )
+    metrics.gauge(
+        "ultron_response_cache_bytes",
+        "Size of the cached response bodies",
+        lambda: response_cache.size,
+    )
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Ultron Eye Server")
+    app = FastAPI(title="Ultron Eye Server", lifespan=lifespan)
+    register_gauges()
 
+    # Inside decompression: request bodies are decoded as the endpoint reads
+    # them, so that time is still counted, and routing sees this scope
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(
+        DecompressionMiddleware, max_size=settings.MAX_DECOMPRESSED_BODY_SIZE
+    )
     app.include_router(api_v1_router, prefix="/api/v1")
 
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics():
+        """Prometheus scrape endpoint"""
+        return Response(metrics.render(), media_type=CONTENT_TYPE)
+
     return app
@@ -1,15 +1,52 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter, ValidationError
+from datetime import datetime, timezone
+from typing import Callable, List, Literal, Optional, Tuple
+import base64
 import logging
-from server.app.api.v1.models import SystemReport
-from server.app.db.memory import client_reports
-from server.app.core.constants import AI_RELATED_PROCESSES
+import orjson
+from server.app.api.v1.models import DeltaReport, SystemReport
+from server.app.db.index import ClientQuery, report_extensions
+from server.app.db.store import report_store
+from server.app.db.timeseries import to_epoch
+from server.app.core.analytics import analytics_aggregator
+from server.app.core.cache import etag_matches, response_cache
+from server.app.core.cadence import cadence_controller
+from server.app.core.classifier import process_classifier
+from server.app.core.config import settings
+from server.app.core.heavy_hitters import unclassified_processes
+from server.app.core.ingest import (
+    ResyncRequired,
+    apply_delta,
+    prepare_report,
+    store_reports,
+)
+from server.app.core.serialization import ORJSONResponse, ORJSONRoute
+from server.app.core.streaming import StreamFormatError, iter_json_items
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Request bodies are decoded and responses encoded with orjson; hot
+# endpoints return their response directly to skip jsonable_encoder
+router = APIRouter(route_class=ORJSONRoute, default_response_class=ORJSONResponse)
+
+_report_list = TypeAdapter(List[SystemReport])
+
+Resolution = Literal["raw", "5m", "1h"]
+# Raw samples are only kept per client
+FleetResolution = Literal["5m", "1h"]
+
+# Fields returned for each client found by /clients unless others are asked for
+DEFAULT_CLIENT_FIELDS = ("client_id", "organization_id", "timestamp", "tools")
+# Fields computed from the report rather than stored on it
+DERIVED_CLIENT_FIELDS = {
+    "tools": lambda report: sorted(
+        {process.category for process in report.process_list if process.category}
+    ),
+    "extensions": lambda report: sorted(report_extensions(report)),
+}
 
 
 @router.post("/report")
@@ -17,91 +54,354 @@ async def receive_report(report: SystemReport):
     """
     Receive and store system reports from clients, filtering for AI-related processes
     """
-    logger.info(f"Received report from client: {report.client_id}")
+    logger.debug(f"Received report from client: {report.client_id}")
 
     try:
         # Filter the processes to only include AI-related ones
-        filtered_processes = {}  # Use dict to maintain unique processes by name
-        for process in report.process_list:
-            process_name_lower = process["name"].lower()
-            for key in AI_RELATED_PROCESSES:
-                if key in process_name_lower:
-                    process["category"] = AI_RELATED_PROCESSES[key]
-                    # Use process name as key to ensure uniqueness
-                    filtered_processes[process_name_lower] = process
-                    break
-
-        # Convert filtered processes back to list
-        report.process_list = list(filtered_processes.values())
-
-        # Update or add the report in client_reports
-        # Find and replace existing report for this client_id
-        for i, existing_report in enumerate(client_reports):
-            if existing_report.client_id == report.client_id:
-                client_reports[i] = report
-                break
-        else:
-            # If no existing report found, append new one
-            client_reports.append(report)
-
-        logger.info(f"Successfully stored report for client: {report.client_id}")
-        logger.debug(f"Current reports count: {len(client_reports)}")
-
-        return {
-            "status": "success",
-            "message": f"Report received from {report.client_id}",
-            "ai_processes_detected": len(filtered_processes),
-        }
+        ai_processes_detected = prepare_report(report)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=_errors(e))
+
+    try:
+        # Update or add the report, keyed by client_id, and swap its
+        # contribution to the running analytics
+        store_reports([report])
+
+        logger.debug(f"Successfully stored report for client: {report.client_id}")
+
+        return ORJSONResponse(
+            {
+                "status": "success",
+                "message": f"Report received from {report.client_id}",
+                "ai_processes_detected": ai_processes_detected,
+                "sequence": report.sequence,
+                "classifier_version": process_classifier.etag,
+                "next_report_in": cadence_controller.next_report_in(),
+            }
+        )
     except Exception as e:
         logger.error(f"Error processing report: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/reports/{client_id}")
-async def get_client_reports(client_id: str):
+@router.post("/report/delta")
+async def receive_delta_report(delta: DeltaReport):
     """
-    Retrieve reports for a specific client
+    Receive only the changes since the last acknowledged report. Responds
+    with 409 when the client must resync by sending a full report.
     """
-    logger.info(f"Fetching reports for client: {client_id}")
-    logger.debug(f"Total reports in memory: {len(client_reports)}")
+    logger.debug(f"Received delta from client: {delta.client_id}")
 
-    client_data = [r for r in client_reports if r.client_id == client_id]
-    if not client_data:
-        logger.warning(f"No reports found for client: {client_id}")
-        raise HTTPException(status_code=404, detail="No reports found for client")
+    try:
+        report = apply_delta(delta)
+    except ResyncRequired as e:
+        logger.info(f"Resync required for client {delta.client_id}: {e}")
+        raise HTTPException(status_code=409, detail={"resync": True, "reason": str(e)})
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=_errors(e))
 
-    logger.info(f"Found {len(client_data)} reports for client: {client_id}")
-    return client_data
+    try:
+        store_reports([report])
+        return ORJSONResponse(
+            {
+                "status": "success",
+                "message": f"Delta received from {delta.client_id}",
+                "ai_processes_detected": len(report.process_list),
+                "sequence": report.sequence,
+                "classifier_version": process_classifier.etag,
+                "next_report_in": cadence_controller.next_report_in(),
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error processing delta report: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/analytics")
-async def get_analytics():
+@router.post("/reports/bulk")
+async def receive_reports_bulk(request: Request):
     """
-    Get analytics about AI tool usage across the organization
-    TODO: This is just v1 implementation. Implement this in a proper way.
+    Receive many reports at once, as a JSON array or newline-delimited JSON.
+    The body is decoded as a stream; each item is validated and classified as
+    it arrives and stored in batches. Returns a status for every item.
     """
+    results = []
+    batch = []
+    accepted = 0
+
     try:
-        analytics = {
-            "total_clients": len({r.client_id for r in client_reports}),
-            "most_used_ai_tools": {},
-            "total_processes": 0,
-            "usage_by_category": {},
-            "average_memory_by_tool": {},
-            "average_cpu_by_tool": {},
+        index = 0
+        async for item, error in iter_json_items(request.stream()):
+            if error is None:
+                try:
+                    report = SystemReport.model_validate(item)
+                    ai_processes_detected = prepare_report(report)
+                except ValidationError as e:
+                    error = _errors(e)
+            if error is not None:
+                results.append({"index": index, "status": "error", "detail": error})
+                index += 1
+                continue
+
+            results.append(
+                {
+                    "index": index,
+                    "client_id": report.client_id,
+                    "status": "success",
+                    "ai_processes_detected": ai_processes_detected,
+                }
+            )
+            batch.append((report, results[-1]))
+            index += 1
+            if len(batch) >= settings.BULK_BATCH_SIZE:
+                accepted += _store_bulk_batch(batch)
+                batch = []
+    except StreamFormatError as e:
+        results.append({"index": index, "status": "error", "detail": str(e)})
+
+    if batch:
+        accepted += _store_bulk_batch(batch)
+
+    logger.info(f"Stored {accepted} of {len(results)} bulk reports")
+    return ORJSONResponse(
+        {
+            "status": "success" if accepted == len(results) else "partial",
+            "accepted": accepted,
+            "rejected": len(results) - accepted,
+            "classifier_version": process_classifier.etag,
+            "next_report_in": cadence_controller.next_report_in(),
+            "results": results,
         }
+    )
+
+
+def _errors(e: ValidationError):
+    """Validation errors in a JSON-safe form"""
+    return e.errors(include_url=False, include_context=False, include_input=False)
 
-        # Calculate metrics
-        for report in client_reports:
-            for process in report.process_list:
-                category = process.get("category", "Unknown")
-                analytics["usage_by_category"][category] = (
-                    analytics["usage_by_category"].get(category, 0) + 1
-                )
-                analytics["total_processes"] += 1
 
-        return analytics
+def _store_bulk_batch(batch) -> int:
+    """Store a batch of (report, result) pairs and record assigned sequences"""
+    try:
+        store_reports([report for report, _ in batch])
     except Exception as e:
+        logger.error(f"Error storing bulk reports: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    for report, result in batch:
+        result["sequence"] = report.sequence
+    return len(batch)
+
+
+def _cached(request: Request, key: Tuple, build: Callable[[], bytes]) -> Response:
+    """
+    JSON response from the response cache, or 304 when the client already
+    has it. The first item of key names the endpoint.
+    """
+    entry = response_cache.get_or_build(key, report_store.generation, build)
+    # Clients may keep the body but must revalidate it before reuse
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def _time_series(
+    client_id: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    resolution: Optional[str],
+):
+    """Query the time series, defaulting to the last hour at the finest resolution"""
+    end_epoch = to_epoch(end) if end else datetime.now(timezone.utc).timestamp()
+    start_epoch = to_epoch(start) if start else end_epoch - 3600
+    if start_epoch > end_epoch:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if resolution is None:
+        resolution = report_store.timeseries.pick_resolution(start_epoch)
+        if resolution == "raw" and client_id is None:
+            resolution = "5m"
+    return {
+        "resolution": resolution,
+        "points": report_store.timeseries.query(
+            client_id, start_epoch, end_epoch, resolution
+        ),
+    }
+
+
+@router.get("/reports/{client_id}")
+async def get_client_reports(
+    request: Request,
+    client_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[Resolution] = None,
+):
+    """
+    Retrieve reports for a specific client. With start, end or resolution,
+    return the client's per-tool CPU and memory time series instead.
+    Reports support conditional GETs through ETag / If-None-Match.
+    """
+    logger.debug(f"Fetching reports for client: {client_id}")
+
+    if start or end or resolution:
+        if client_id not in report_store:
+            raise HTTPException(status_code=404, detail="No reports found for client")
+        return ORJSONResponse(
+            {"client_id": client_id, **_time_series(client_id, start, end, resolution)}
+        )
+
+    def build() -> bytes:
+        client_data = report_store.history(client_id)
+        if not client_data:
+            logger.warning(f"No reports found for client: {client_id}")
+            raise HTTPException(status_code=404, detail="No reports found for client")
+        logger.debug(f"Found {len(client_data)} reports for client: {client_id}")
+        return _report_list.dump_json(client_data)
+
+    return _cached(request, ("get_client_reports", client_id), build)
+
+
+@router.get("/analytics")
+async def get_analytics(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[FleetResolution] = None,
+):
+    """
+    Get analytics about AI tool usage across the organization. With start,
+    end or resolution, also return fleet-wide per-tool trends. Without
+    them, supports conditional GETs through ETag / If-None-Match.
+    """
+
+    def snapshot():
+        try:
+            return {
+                "total_clients": len(report_store),
+                **analytics_aggregator.snapshot(),
+            }
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    if start or end or resolution:
+        # Trends move with the clock, so they are not cached
+        analytics = snapshot()
+        analytics["trends"] = _time_series(None, start, end, resolution)
+        return ORJSONResponse(analytics)
+    return _cached(request, ("get_analytics",), lambda: orjson.dumps(snapshot()))
+
+
+@router.get("/clients")
+async def search_clients(
+    request: Request,
+    tool: List[str] = Query([]),
+    extension: List[str] = Query([]),
+    organization_id: Optional[str] = None,
+    seen_within: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = None,
+):
+    """
+    Find clients by the AI tools and editor extensions in their latest
+    report. tool is a category or process name and extension an extension id
+    such as github.copilot, both case-insensitive; repeat either to match any
+    of several. seen_within keeps clients that reported in the last so many
+    seconds. Results are ordered by client_id, limit at a time: pass
+    next_cursor back as cursor for the next page. fields is a comma-separated
+    list of report fields, tools or extensions to return for each client.
+    Without seen_within, supports conditional GETs through ETag /
+    If-None-Match.
+    """
+    requested = (
+        DEFAULT_CLIENT_FIELDS
+        if fields is None
+        else tuple(name.strip() for name in fields.split(",") if name.strip())
+    )
+    known = SystemReport.model_fields.keys() | DERIVED_CLIENT_FIELDS.keys()
+    unknown = set(requested) - known
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    include = {name for name in requested if name in SystemReport.model_fields}
+    derived = [name for name in requested if name in DERIVED_CLIENT_FIELDS]
+
+    seen_since = None
+    if seen_within is not None:
+        seen_since = datetime.now(timezone.utc).timestamp() - seen_within
+    # One extra result tells whether there is a next page
+    query = ClientQuery(
+        tools=tuple(tool),
+        extensions=tuple(extension),
+        organization_id=organization_id,
+        seen_since=seen_since,
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=limit + 1,
+    )
+
+    def page():
+        reports = report_store.find_clients(query)
+        next_cursor = None
+        if len(reports) > limit:
+            reports = reports[:limit]
+            next_cursor = _encode_cursor(reports[-1].client_id)
+
+        clients = []
+        for report in reports:
+            client = report.model_dump(include=include) if include else {}
+            for name in derived:
+                client[name] = DERIVED_CLIENT_FIELDS[name](report)
+            clients.append(client)
+        return {"clients": clients, "next_cursor": next_cursor}
+
+    if seen_since is not None:
+        # Clients age out of the window without any ingest
+        return ORJSONResponse(page())
+    key = ("search_clients", query, requested)
+    return _cached(request, key, lambda: orjson.dumps(page()))
+
+
+def _encode_cursor(client_id: str) -> str:
+    return base64.urlsafe_b64encode(client_id.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode()
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/classifier")
+async def get_classifier(request: Request, response: Response):
+    """
+    Publish the AI process patterns so clients can pre-filter locally.
+    Supports conditional GETs through ETag / If-None-Match.
+    """
+    published = process_classifier.published()
+    etag = published["version"]
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return published
+
+
+@router.get("/classifier/candidates")
+async def get_classifier_candidates(limit: int = Query(50, ge=1, le=1000)):
+    """
+    The process names most often reported without matching any AI pattern,
+    as candidates to add to the classifier. count may overestimate how many
+    reports had a name, by at most count - min_count. Names the classifier
+    has matched since are left out.
+    """
+    summary = unclassified_processes.snapshot()
+    summary["candidates"] = [
+        candidate
+        for candidate in summary["candidates"]
+        if process_classifier.classify(candidate["name"]) is None
+    ][:limit]
+    return ORJSONResponse(summary)
 
 
 @router.get("/health")
@@ -1,6 +1,9 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, model_validator
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Annotated, List, Dict, Optional, Union
+import time
+from server.app.core.metrics import metrics
 
 
 class UserInfo(BaseModel):
@@ -11,7 +14,63 @@ class UserInfo(BaseModel):
     location: Optional[str] = None
 
 
-class SystemReport(BaseModel):
+@dataclass(slots=True)
+class ProcessRecord:
+    """
+    An AI-related process in a stored report, its instances aggregated by
+    the client. Slots keep a record at under a quarter of the size of the
+    equivalent dict. Unknown fields are dropped on validation.
+    """
+
+    name: str
+    pid: Optional[int] = None
+    cpu_percent: Optional[float] = None
+    memory_percent: Optional[float] = None
+    status: Optional[str] = None
+    create_time: Optional[datetime] = None
+    instance_count: int = 1
+    # Assigned by the server when the process is classified
+    category: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ExtensionRecord:
+    """An AI-related editor extension; which fields are set depends on the editor"""
+
+    editor: Optional[str] = None
+    name: Optional[str] = None
+    displayName: Optional[str] = None
+    description: Optional[str] = None
+    version: Optional[str] = None
+    publisher: Optional[str] = None
+    id: Optional[str] = None
+    vendor: Optional[str] = None
+    path: Optional[str] = None
+    product: Optional[str] = None
+
+
+process_records = TypeAdapter(List[ProcessRecord])
+
+# A process as sent by the client, a plain dict, until classification turns
+# it into a ProcessRecord. Only a few percent of processes are AI-related,
+# so just those are validated field by field, after classification.
+ProcessEntry = Annotated[Union[Dict, ProcessRecord], Field(union_mode="left_to_right")]
+
+
+class TimedModel(BaseModel):
+    """Records how long validation takes, for the request being handled"""
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def time_validation(cls, data, handler):
+        start = time.perf_counter()
+        try:
+            return handler(data)
+        finally:
+            metrics.validation_seconds.observe(time.perf_counter() - start)
+
+
+class SystemReport(TimedModel):
     client_id: str
     report_id: str
     timestamp: datetime
@@ -19,9 +78,35 @@ class SystemReport(BaseModel):
     user_info: UserInfo
     organization_id: Optional[str] = None
     system_info: Dict
-    process_list: List[Dict]
+    process_list: List[ProcessEntry]
     tags: List[str]
     environment: str
     uptime: float
     last_boot_time: datetime
-    editor_extensions: Dict
+    editor_extensions: Dict[str, ExtensionRecord]
+    # Assigned by the server when the report is stored
+    sequence: Optional[int] = None
+
+
+class DeltaReport(TimedModel):
+    """
+    Changes since the report the server acknowledged with base_sequence.
+    Processes are matched by name; fields left as None are unchanged.
+    """
+
+    client_id: str
+    base_sequence: int
+    report_id: str
+    timestamp: datetime
+    uptime: float
+    processes_changed: List[Dict] = []
+    processes_removed: List[str] = []
+    extensions_changed: Dict[str, ExtensionRecord] = {}
+    extensions_removed: List[str] = []
+    version: Optional[str] = None
+    user_info: Optional[UserInfo] = None
+    organization_id: Optional[str] = None
+    system_info: Optional[Dict] = None
+    tags: Optional[List[str]] = None
+    environment: Optional[str] = None
+    last_boot_time: Optional[datetime] = None
@@ -0,0 +1,117 @@
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, Iterable, Optional
+
+from server.app.api.v1.models import SystemReport
+from server.app.core.config import Settings, settings
+from server.app.core.distributions import ToolDistributions, percentiles
+from server.app.db.base import CategoryTotals
+
+
+class AnalyticsAggregator:
+    """
+    Running fleet-wide aggregates, updated on ingest.
+
+    Each stored report contributes per-category process counts, per-tool CPU
+    and memory sums and one distinct-client count per tool. When a client's
+    report is replaced, the old contribution is subtracted first, so reading
+    the analytics costs O(number of categories). Per-tool resource
+    percentiles come from ToolDistributions, vectorized over each tool's
+    clients.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.distributions = ToolDistributions()
+        self.reset()
+
+    def reset(self):
+        self.total_processes = 0
+        self.usage_by_category: Counter = Counter()
+        self.clients_by_tool: Counter = Counter()
+        self.cpu_sum_by_tool: Dict[str, float] = defaultdict(float)
+        self.memory_sum_by_tool: Dict[str, float] = defaultdict(float)
+
+    def replace(self, previous: Optional[SystemReport], report: SystemReport):
+        """Swap a client's previous contribution for its new report"""
+        with self._lock:
+            if previous is not None:
+                self._apply(previous, -1)
+            self._apply(report, 1)
+            self.distributions.update(report)
+
+    def load_totals(self, totals: Iterable[CategoryTotals]):
+        """Seed the aggregates from totals computed by the store"""
+        with self._lock:
+            self.reset()
+            for total in totals:
+                self.usage_by_category[total.category] = total.processes
+                self.cpu_sum_by_tool[total.category] = total.cpu_sum
+                self.memory_sum_by_tool[total.category] = total.memory_sum
+                self.clients_by_tool[total.category] = total.clients
+                self.total_processes += total.processes
+
+    def load_distributions(self, reports: Iterable[SystemReport]):
+        """Seed the per-tool distributions from the latest report of every client"""
+        with self._lock:
+            self.distributions = ToolDistributions()
+            for report in reports:
+                self.distributions.update(report)
+
+    def _apply(self, report: SystemReport, sign: int):
+        tools = set()
+        for process in report.process_list:
+            category = process.category or "Unknown"
+            self.usage_by_category[category] += sign
+            self.cpu_sum_by_tool[category] += sign * (process.cpu_percent or 0.0)
+            self.memory_sum_by_tool[category] += sign * (process.memory_percent or 0.0)
+            tools.add(category)
+        self.total_processes += sign * len(report.process_list)
+        for category in tools:
+            self.clients_by_tool[category] += sign
+
+        if sign < 0:
+            # Drop emptied tools so float drift never outlives the last sample
+            for category in tools:
+                if self.usage_by_category[category] <= 0:
+                    del self.usage_by_category[category]
+                    del self.cpu_sum_by_tool[category]
+                    del self.memory_sum_by_tool[category]
+                if self.clients_by_tool[category] <= 0:
+                    del self.clients_by_tool[category]
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = dict(self.usage_by_category)
+            columns = self.distributions.columns()
+            snapshot = {
+                "most_used_ai_tools": dict(self.clients_by_tool.most_common()),
+                "total_processes": self.total_processes,
+                "usage_by_category": counts,
+                "average_memory_by_tool": {
+                    tool: round(self.memory_sum_by_tool[tool] / count, 2)
+                    for tool, count in counts.items()
+                },
+                "average_cpu_by_tool": {
+                    tool: round(self.cpu_sum_by_tool[tool] / count, 2)
+                    for tool, count in counts.items()
+                },
+            }
+        # Outside the lock, so ingest does not wait for the percentiles
+        snapshot["resource_percentiles_by_tool"] = percentiles(columns)
+        return snapshot
+
+
+def create_analytics_aggregator(config: Settings = settings):
+    """
+    Aggregate in this process, or use the analytics kept by the store
+    process at STORE_ADDRESS when one is set
+    """
+    if config.STORE_ADDRESS:
+        from server.app.db.shared import SharedAnalytics
+
+        return SharedAnalytics(config.STORE_ADDRESS)
+    return AnalyticsAggregator()
+
+
+analytics_aggregator = create_analytics_aggregator()
@@ -0,0 +1,111 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from server.app.core.config import settings
+from server.app.core.metrics import metrics
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    # Strong validator: a hash of the body
+    etag: str
+    # Store generation the body was built at
+    generation: int
+    created: float
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists etag (weak comparison) or is *"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    Encoded response bodies of read endpoints, keyed by endpoint and
+    parameters.
+
+    An entry is fresh while the store generation it was built at is
+    current. Once the store has changed it may still be served while it is
+    less than max_staleness seconds old, so heavy ingest rebuilds a hot response at
+    most that often instead of after every write. Entries are evicted least
+    recently used first to stay within max_entries and max_bytes.
+    Lookups are counted per endpoint as hits, stale hits or misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.RESPONSE_CACHE_MAX_BYTES,
+        max_staleness: float = settings.RESPONSE_CACHE_MAX_STALENESS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_staleness = max_staleness
+        self._entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self.size = 0
+        self._lock = Lock()
+
+    def get_or_build(
+        self, key: Tuple, generation: int, build: Callable[[], bytes]
+    ) -> CachedResponse:
+        """
+        The cached response for key (its first item names the endpoint), or
+        a new one from build(). Exceptions from build() are not cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.generation == generation:
+                    result = "hit"
+                elif now - entry.created < self.max_staleness:
+                    result = "stale"
+                else:
+                    entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            metrics.cache_lookups.inc(key[0], result)
+            return entry
+
+        metrics.cache_lookups.inc(key[0], "miss")
+        body = build()
+        entry = CachedResponse(body, _etag(body), generation, now)
+        if len(body) <= self.max_bytes:
+            self._add(key, entry)
+        return entry
+
+    def _add(self, key: Tuple, entry: CachedResponse):
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self.size -= len(replaced.body)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,61 @@
+import time
+from threading import Lock
+
+from server.app.core.config import settings
+
+
+class CadenceController:
+    """
+    Suggest how long clients should wait before their next report.
+
+    Tracks the ingest rate over a short sliding window of one-second slots.
+    Below target_rate every client gets the base interval; above it the
+    interval stretches in proportion to the overload, up to max_interval,
+    so a saturated server spreads the fleet out instead of queueing. Each
+    server worker only sees its own share of the ingest, so by default the
+    target is split evenly between them.
+    """
+
+    def __init__(
+        self,
+        base_interval: float = settings.REPORT_INTERVAL,
+        max_interval: float = settings.MAX_REPORT_INTERVAL,
+        target_rate: float = settings.TARGET_INGEST_RATE / settings.WORKERS,
+        window: int = 10,
+    ):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.target_rate = target_rate
+        self.window = window
+        self._slots = [0] * window
+        self._slot_times = [0] * window
+        self._lock = Lock()
+
+    def record(self, reports: int = 1):
+        now = int(time.monotonic())
+        index = now % self.window
+        with self._lock:
+            if self._slot_times[index] != now:
+                self._slot_times[index] = now
+                self._slots[index] = 0
+            self._slots[index] += reports
+
+    def ingest_rate(self) -> float:
+        """Reports per second over the window"""
+        now = int(time.monotonic())
+        with self._lock:
+            total = sum(
+                count
+                for count, slot_time in zip(self._slots, self._slot_times)
+                if now - slot_time < self.window
+            )
+        return total / self.window
+
+    def next_report_in(self) -> float:
+        rate = self.ingest_rate()
+        if rate <= self.target_rate:
+            return self.base_interval
+        return min(self.max_interval, self.base_interval * rate / self.target_rate)
+
+
+cadence_controller = CadenceController()
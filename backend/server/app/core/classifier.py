@@ -0,0 +1,129 @@
+import hashlib
+import json
+import re
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Iterable, Mapping, Optional
+
+from pydantic import ValidationError
+
+from server.app.api.v1.models import ProcessRecord, process_records
+from server.app.core.constants import AI_RELATED_PROCESSES
+
+
+class ProcessClassifier:
+    """
+    Map process names to AI tool categories.
+
+    The pattern table is compiled once into a single alternation regex. The
+    first pattern in table order that occurs in a name wins, exactly like the
+    original substring loop. Results are memoized in a bounded LRU because
+    process names repeat almost exactly across the fleet.
+    """
+
+    def __init__(
+        self,
+        patterns: Mapping[str, str] = AI_RELATED_PROCESSES,
+        cache_size: int = 16384,
+    ):
+        self.patterns = patterns
+        self.cache_size = cache_size
+        self.version = 0
+        self._lock = Lock()
+        self._compile()
+
+    def _compile(self):
+        snapshot = tuple(self.patterns.items())
+        # A lookahead group reports a match at every start position, so
+        # overlapping patterns are all seen; at a single position the
+        # alternation already prefers the earliest pattern in the table.
+        alternation = "|".join(re.escape(key) for key, _ in snapshot)
+        search = re.compile(alternation).search if snapshot else None
+        regex = re.compile(f"(?=({alternation}))")
+        rank = {key: i for i, (key, _) in enumerate(snapshot)}
+        categories = dict(snapshot)
+
+        def match(name: str) -> Optional[str]:
+            name = name.lower()
+            # Most names match nothing, so reject them with one search
+            if search is None or search(name) is None:
+                return None
+            best = None
+            for found in regex.finditer(name):
+                key = found.group(1)
+                if best is None or rank[key] < rank[best]:
+                    best = key
+                    if rank[key] == 0:
+                        break
+            return categories[best] if best is not None else None
+
+        self._snapshot = snapshot
+        self._match = lru_cache(maxsize=self.cache_size)(match)
+        self.version += 1
+        # Strong validator for the published pattern set
+        digest = hashlib.sha256(json.dumps(snapshot).encode()).hexdigest()
+        self.etag = f'"{digest[:32]}"'
+
+    def set_patterns(self, patterns: Mapping[str, str]):
+        """Replace the pattern table and recompile"""
+        with self._lock:
+            self.patterns = patterns
+            self._compile()
+
+    def refresh(self) -> bool:
+        """Recompile if the pattern table was changed in place"""
+        if tuple(self.patterns.items()) == self._snapshot:
+            return False
+        with self._lock:
+            if tuple(self.patterns.items()) != self._snapshot:
+                self._compile()
+        return True
+
+    def classify(self, name: str) -> Optional[str]:
+        """Category of a process name, or None if it is not AI-related"""
+        return self._match(name)
+
+    def filter_processes(self, process_list: Iterable[Dict]) -> Dict[str, ProcessRecord]:
+        """
+        Keep only AI-related processes, tagging each with its category, and
+        validate them into ProcessRecords. Returns a dict keyed by
+        lower-cased process name. Raises pydantic's ValidationError when a
+        kept process has invalid fields, located by its index in process_list.
+        """
+        self.refresh()
+        match = self._match
+        kept = []
+        positions = []
+        for position, process in enumerate(process_list):
+            category = match(process["name"])
+            if category is not None:
+                process["category"] = category
+                kept.append(process)
+                positions.append(position)
+        try:
+            records = process_records.validate_python(kept)
+        except ValidationError as e:
+            raise ValidationError.from_exception_data(
+                e.title,
+                [
+                    {
+                        "type": error["type"],
+                        "loc": (positions[error["loc"][0]], *error["loc"][1:]),
+                        "input": error["input"],
+                        **({"ctx": error["ctx"]} if "ctx" in error else {}),
+                    }
+                    for error in e.errors()
+                ],
+            )
+        return {record.name.lower(): record for record in records}
+
+    def published(self) -> Dict:
+        """The pattern table as published to clients for local pre-filtering"""
+        self.refresh()
+        return {"version": self.etag, "patterns": dict(self._snapshot)}
+
+    def cache_info(self):
+        return self._match.cache_info()
+
+
+process_classifier = ProcessClassifier()
@@ -0,0 +1,144 @@
+import zlib
+from typing import Callable, Dict
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+# zstd decompressobj has no output limit, so input is fed in slices this
+# small to bound how far a compression bomb can overshoot the cap
+ZSTD_INPUT_SLICE = 256
+
+
+class _ZlibDecoder:
+    def __init__(self, wbits: int):
+        self._decompressor = zlib.decompressobj(wbits)
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        # Ask for one byte more than allowed so an overflow is detectable
+        return self._decompressor.decompress(data, limit + 1)
+
+    @property
+    def finished(self) -> bool:
+        return self._decompressor.eof
+
+
+class _ZstdDecoder:
+    def __init__(self):
+        self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes, limit: int) -> bytes:
+        output = []
+        produced = 0
+        for start in range(0, len(data), ZSTD_INPUT_SLICE):
+            piece = self._decompressor.decompress(data[start : start + ZSTD_INPUT_SLICE])
+            output.append(piece)
+            produced += len(piece)
+            if produced > limit:
+                break
+        return b"".join(output)
+
+    @property
+    def finished(self) -> bool:
+        return self._decompressor.eof
+
+
+DECODERS: Dict[str, Callable[[], object]] = {
+    "gzip": lambda: _ZlibDecoder(31),
+    "deflate": lambda: _ZlibDecoder(15),
+}
+if zstandard is not None:
+    DECODERS["zstd"] = _ZstdDecoder
+
+ACCEPT_ENCODING = ", ".join(DECODERS)
+
+
+class DecompressionMiddleware:
+    """
+    Decode request bodies sent with a Content-Encoding, as a stream.
+
+    Each body chunk is decompressed as the endpoint reads it, so bulk and
+    streaming endpoints keep their memory profile. The decompressed size is
+    capped at max_size (413 when exceeded). Every response advertises the
+    supported request encodings in Accept-Encoding, which is how clients
+    negotiate compression.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+        self.accept_encoding = ACCEPT_ENCODING.encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_accept_encoding(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"accept-encoding", self.accept_encoding),
+                ]
+            await send(message)
+
+        encoding = None
+        headers = []
+        for name, value in scope["headers"]:
+            if name == b"content-encoding":
+                encoding = value.decode("latin-1").strip().lower()
+            elif name != b"content-length":
+                headers.append((name, value))
+
+        if encoding in (None, "identity"):
+            await self.app(scope, receive, send_with_accept_encoding)
+            return
+
+        if encoding not in DECODERS:
+            await send_with_accept_encoding(
+                {
+                    "type": "http.response.start",
+                    "status": 415,
+                    "headers": [(b"content-type", b"text/plain")],
+                }
+            )
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": f"Unsupported Content-Encoding: {encoding}".encode(),
+                }
+            )
+            return
+
+        decoder = DECODERS[encoding]()
+        remaining = self.max_size
+
+        async def decompressing_receive() -> Message:
+            nonlocal remaining
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+            try:
+                body = decoder.decompress(message.get("body", b""), remaining)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Invalid {encoding} request body: {e}"
+                )
+            if len(body) > remaining:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Decompressed request body exceeds {self.max_size} bytes",
+                )
+            if not message.get("more_body", False) and not decoder.finished:
+                raise HTTPException(
+                    status_code=400, detail=f"Truncated {encoding} request body"
+                )
+            remaining -= len(body)
+            return {**message, "body": body}
+
+        scope = {**scope, "headers": headers}
+        await self.app(scope, decompressing_receive, send_with_accept_encoding)
@@ -1,15 +1,49 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Ultron Eye Server"
+    HOST: str = "127.0.0.1"
     PORT: int = 8000
     SERVER_URL: str = f"http://localhost:{PORT}"
     CLIENT_ID: str = "1234567890"
     VERSION: str = "1.0.0"
     ORGANIZATION_ID: str = "001"
     DEBUG: bool = True
+    REPORT_HISTORY_SIZE: int = 10
+    # Report cadence suggested to clients, in seconds
+    REPORT_INTERVAL: int = 30
+    MAX_REPORT_INTERVAL: int = 600
+    # Reports per second above which clients are asked to slow down
+    TARGET_INGEST_RATE: float = 500.0
+    # Server processes; with more than one, the report store runs in its own
+    # process and workers reach it on the Unix socket at STORE_ADDRESS
+    WORKERS: int = 1
+    STORE_ADDRESS: Optional[str] = None
+    # "memory" or "sqlite"
+    STORAGE_BACKEND: str = "memory"
+    SQLITE_PATH: str = "ultron_eye.db"
+    SQLITE_BATCH_INTERVAL_MS: int = 50
+    SQLITE_BATCH_ROWS: int = 500
+    # Time-series retention, in seconds
+    TIMESERIES_RAW_RETENTION: int = 3600
+    TIMESERIES_5M_RETENTION: int = 2 * 24 * 3600
+    TIMESERIES_1H_RETENTION: int = 90 * 24 * 3600
+    TIMESERIES_PRUNE_INTERVAL: int = 300
+    BULK_BATCH_SIZE: int = 500
+    # Encoded responses of read endpoints, reused until the store changes
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Seconds a cached response may still be served after the store changed.
+    # 0 always reflects the latest ingest; a few seconds saves dashboards
+    # that poll during heavy ingest a rebuild per write.
+    RESPONSE_CACHE_MAX_STALENESS: float = 0.0
+    # Process names the classifier did not match, most frequent kept
+    UNCLASSIFIED_PROCESS_CAPACITY: int = 1000
+    MAX_DECOMPRESSED_BODY_SIZE: int = 64 * 1024 * 1024
 
     class Config:
         case_sensitive = True
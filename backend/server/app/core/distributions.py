@@ -0,0 +1,118 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from server.app.api.v1.models import SystemReport
+
+PERCENTILES = (50, 90, 99)
+# What one client's processes of a tool add up to, one column each
+COLUMNS = ("memory_percent", "cpu_percent", "instance_count")
+
+
+def report_rows(report: SystemReport) -> Dict[str, Tuple[float, float, int]]:
+    """Per-tool memory and CPU totals and process counts of a classified report"""
+    rows: Dict[str, List] = {}
+    for process in report.process_list:
+        category = process.category or "Unknown"
+        row = rows.get(category)
+        if row is None:
+            row = rows[category] = [0.0, 0.0, 0]
+        row[0] += process.memory_percent or 0.0
+        row[1] += process.cpu_percent or 0.0
+        row[2] += 1
+    return {category: tuple(row) for category, row in rows.items()}
+
+
+class ToolColumns:
+    """
+    One row of COLUMNS per client running a tool. Values are stored column
+    by column in a NumPy array that doubles when full, so each column is
+    contiguous. A removed row is filled with the last one, so the rows in
+    use stay contiguous too.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.values = np.empty((len(COLUMNS), capacity))
+        self.clients: List[str] = []
+        self.rows: Dict[str, int] = {}
+
+    def set(self, client_id: str, row: Tuple[float, float, int]):
+        index = self.rows.get(client_id)
+        if index is None:
+            index = len(self.clients)
+            if index == self.values.shape[1]:
+                grown = np.empty((len(COLUMNS), 2 * index))
+                grown[:, :index] = self.values
+                self.values = grown
+            self.rows[client_id] = index
+            self.clients.append(client_id)
+        self.values[:, index] = row
+
+    def remove(self, client_id: str):
+        index = self.rows.pop(client_id)
+        last = self.clients.pop()
+        if last != client_id:
+            self.values[:, index] = self.values[:, len(self.clients)]
+            self.clients[index] = last
+            self.rows[last] = index
+
+    def view(self) -> np.ndarray:
+        """The rows in use, by column; a view, so copy it before unlocking"""
+        return self.values[:, : len(self.clients)]
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+
+class ToolDistributions:
+    """
+    Per-tool resource usage of every client's latest report, kept as
+    columns so fleet-wide percentiles are a few vectorized calls per tool.
+
+    Each client's tools are remembered, so a new report replaces its rows
+    without the previous report. The owning aggregator calls update() under
+    its lock.
+    """
+
+    def __init__(self):
+        self.by_tool: Dict[str, ToolColumns] = {}
+        self._tools: Dict[str, Tuple[str, ...]] = {}
+
+    def update(self, report: SystemReport):
+        client_id = report.client_id
+        rows = report_rows(report)
+        for tool in self._tools.get(client_id, ()):
+            if tool not in rows:
+                columns = self.by_tool[tool]
+                columns.remove(client_id)
+                if not columns:
+                    del self.by_tool[tool]
+        for tool, row in rows.items():
+            columns = self.by_tool.get(tool)
+            if columns is None:
+                columns = self.by_tool[tool] = ToolColumns()
+            columns.set(client_id, row)
+        self._tools[client_id] = tuple(rows)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """A copy of every tool's columns, to compute percentiles from"""
+        return {tool: columns.view().copy() for tool, columns in self.by_tool.items()}
+
+
+def percentiles(columns: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+    """
+    p50, p90 and p99 of each column across the clients running each tool,
+    from ToolDistributions.columns()
+    """
+    result = {}
+    for tool, values in sorted(columns.items()):
+        # Rows are COLUMNS, columns are PERCENTILES
+        table = np.percentile(values, PERCENTILES, axis=1).round(2).T.tolist()
+        result[tool] = {
+            "clients": values.shape[1],
+            **{
+                column: {f"p{p}": value for p, value in zip(PERCENTILES, row)}
+                for column, row in zip(COLUMNS, table)
+            },
+        }
+    return result
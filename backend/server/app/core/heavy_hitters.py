@@ -0,0 +1,147 @@
+from collections import Counter
+from threading import Lock
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from server.app.core.config import Settings, settings
+
+# Longer names are truncated, so the summary's size does not depend on input
+MAX_NAME_LENGTH = 256
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary of the most frequent items in a stream, in memory
+    fixed by capacity.
+
+    Up to capacity items are counted exactly. An item arriving when the
+    summary is full takes over a least counted slot, inheriting its count
+    as an error bound: each count overestimates the item's frequency by at
+    most its error, and any item seen more than total / capacity times is
+    guaranteed to be kept. Items are grouped by count, as in the paper's
+    Stream-Summary, so finding a least counted one is O(1) while that group
+    lasts.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # count -> the items with that count, as dict keys
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        # No greater than any count; the least one whenever it has a bucket
+        self._minimum = 0
+
+    def add(self, item: str, count: int = 1):
+        self.total += count
+        current = self.counts.get(item)
+        if current is None:
+            if len(self.counts) < self.capacity:
+                current = 0
+            else:
+                current = self._least_count()
+                # Any item with the least count may go; popitem() is O(1)
+                evicted, _ = self._buckets[current].popitem()
+                del self.counts[evicted], self.errors[evicted]
+                self._discard_empty(current)
+            self.errors[item] = current
+            self._minimum = min(self._minimum, current + count)
+        else:
+            del self._buckets[current][item]
+            self._discard_empty(current)
+        self.counts[item] = current + count
+        self._buckets.setdefault(current + count, {})[item] = None
+
+    def _least_count(self) -> int:
+        if self._minimum not in self._buckets:
+            self._minimum = min(self._buckets)
+        return self._minimum
+
+    def _discard_empty(self, count: int):
+        if not self._buckets[count]:
+            del self._buckets[count]
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """(item, count, error) of the most counted items, highest first"""
+        ranked = sorted(self.counts.items(), key=lambda entry: (-entry[1], entry[0]))
+        return [(item, count, self.errors[item]) for item, count in ranked[:limit]]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+
+class UnclassifiedProcesses:
+    """
+    Process names the classifier did not recognize, across the fleet, so
+    that new AI tools can be spotted and promoted into its patterns.
+
+    Each report counts each of its unclassified names once, lower-cased.
+    Names are tallied in a Counter for batch_size reports, which costs
+    little per report since common names repeat, then added to a
+    SpaceSaving summary by weight; reading the summary adds any pending
+    names first. Memory is bounded by the capacity plus one batch. Deltas
+    carry only changed processes, so only full reports are counted.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.UNCLASSIFIED_PROCESS_CAPACITY,
+        batch_size: int = 256,
+    ):
+        self.summary = SpaceSaving(capacity)
+        self.batch_size = batch_size
+        self._pending: Counter = Counter()
+        self._pending_reports = 0
+        self._lock = Lock()
+
+    def add(self, names: Set[str]):
+        """Count the unclassified names of one report"""
+        with self._lock:
+            self._pending.update(names)
+            self._pending_reports += 1
+            if self._pending_reports >= self.batch_size:
+                self._flush()
+
+    def add_counts(self, counts: Mapping[str, int], reports: int):
+        """Count names already tallied over several reports"""
+        with self._lock:
+            self._pending.update(counts)
+            self._pending_reports += reports
+            if self._pending_reports >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        add = self.summary.add
+        for name, count in self._pending.items():
+            add(name[:MAX_NAME_LENGTH], count)
+        self._pending = Counter()
+        self._pending_reports = 0
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict:
+        with self._lock:
+            self._flush()
+            top = self.summary.top(limit)
+            observed = self.summary.total
+        return {
+            "capacity": self.summary.capacity,
+            "names_observed": observed,
+            "candidates": [
+                {"name": name, "count": count, "min_count": count - error}
+                for name, count, error in top
+            ],
+        }
+
+
+def create_unclassified_processes(config: Settings = settings):
+    """
+    Count in this process, or in the store process at STORE_ADDRESS when one
+    is set, so every worker's reports land in one summary
+    """
+    if config.STORE_ADDRESS:
+        from server.app.db.shared import SharedUnclassifiedProcesses
+
+        return SharedUnclassifiedProcesses(config.STORE_ADDRESS)
+    return UnclassifiedProcesses()
+
+
+unclassified_processes = create_unclassified_processes()
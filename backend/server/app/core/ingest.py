@@ -0,0 +1,92 @@
+import time
+from typing import List
+
+from server.app.api.v1.models import DeltaReport, SystemReport
+from server.app.core.analytics import analytics_aggregator
+from server.app.core.cadence import cadence_controller
+from server.app.core.classifier import process_classifier
+from server.app.core.heavy_hitters import unclassified_processes
+from server.app.core.metrics import metrics
+from server.app.db.store import report_store
+
+
+def prepare_report(report: SystemReport) -> int:
+    """
+    Filter a report's processes down to AI-related ones, in place, and count
+    the names of the others. Returns the number of AI processes detected.
+    """
+    start = time.perf_counter()
+    filtered_processes = process_classifier.filter_processes(report.process_list)
+    metrics.classification_seconds.observe(time.perf_counter() - start)
+    names = {process["name"].lower() for process in report.process_list}
+    unclassified_processes.add(names - filtered_processes.keys())
+    report.process_list = list(filtered_processes.values())
+    return len(filtered_processes)
+
+
+def store_reports(reports: List[SystemReport]):
+    """
+    Store prepared reports in one pass and update the running analytics.
+    The store also records them in its time series.
+    """
+    cadence_controller.record(len(reports))
+    start = time.perf_counter()
+    previous_reports = report_store.upsert_many(reports)
+    metrics.upsert_seconds.observe(time.perf_counter() - start)
+    for previous, report in zip(previous_reports, reports):
+        analytics_aggregator.replace(previous, report)
+
+
+class ResyncRequired(Exception):
+    """The client's delta does not apply to the stored report"""
+
+
+# Top-level fields a delta may replace as a whole
+_DELTA_FIELDS = (
+    "version",
+    "user_info",
+    "organization_id",
+    "system_info",
+    "tags",
+    "environment",
+    "last_boot_time",
+)
+
+
+def apply_delta(delta: DeltaReport) -> SystemReport:
+    """
+    Rebuild a full report from the stored snapshot and a delta. Only changed
+    processes are classified. Raises ResyncRequired when there is no snapshot
+    or the sequence numbers do not match.
+    """
+    previous = report_store.get(delta.client_id)
+    if previous is None or previous.sequence != delta.base_sequence:
+        raise ResyncRequired(
+            f"Expected base sequence {previous.sequence if previous else None}, "
+            f"got {delta.base_sequence}"
+        )
+
+    processes = {process.name.lower(): process for process in previous.process_list}
+    for name in delta.processes_removed:
+        processes.pop(name.lower(), None)
+    start = time.perf_counter()
+    processes.update(process_classifier.filter_processes(delta.processes_changed))
+    metrics.classification_seconds.observe(time.perf_counter() - start)
+
+    extensions = dict(previous.editor_extensions)
+    for key in delta.extensions_removed:
+        extensions.pop(key, None)
+    extensions.update(delta.extensions_changed)
+
+    update = {
+        "report_id": delta.report_id,
+        "timestamp": delta.timestamp,
+        "uptime": delta.uptime,
+        "process_list": list(processes.values()),
+        "editor_extensions": extensions,
+    }
+    for field in _DELTA_FIELDS:
+        value = getattr(delta, field)
+        if value is not None:
+            update[field] = value
+    return previous.model_copy(update=update)
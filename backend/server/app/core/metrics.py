@@ -0,0 +1,226 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from 50 µs to 10 s
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+# Label for requests that matched no route, so probes for random paths
+# cannot grow the number of series
+UNMATCHED = "unmatched"
+
+_request_scope: ContextVar[Optional[Scope]] = ContextVar(
+    "metrics_request_scope", default=None
+)
+
+
+def current_endpoint() -> Optional[str]:
+    """
+    Name of the route handling the current request (its endpoint function,
+    unless named otherwise), or None outside a request. Names, unlike paths,
+    do not depend on the prefix a router was included under.
+    """
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return route.name if route is not None else UNMATCHED
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Latency histogram with one series per endpoint.
+
+    observe() is a bisect and two increments under a lock; buckets are only
+    made cumulative when rendered.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        # endpoint -> per-bucket counts, the +Inf count, then the sum
+        self._series: Dict[str, List[float]] = {}
+        self._lock = Lock()
+
+    def observe(self, seconds: float, endpoint: Optional[str] = None):
+        """Record a duration, by default for the request being handled"""
+        if endpoint is None:
+            endpoint = current_endpoint()
+            if endpoint is None:
+                return
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(endpoint)
+            if series is None:
+                series = self._series[endpoint] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = {endpoint: list(series) for endpoint, series in self._series.items()}
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for endpoint, series in sorted(snapshot.items()):
+            label = f'endpoint="{_escape(endpoint)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a fixed tuple of label names"""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], int] = {}
+        self._lock = Lock()
+
+    def inc(self, *values: str):
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = dict(self._values)
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for values, count in sorted(snapshot.items()):
+            labels = ",".join(
+                f'{name}="{_escape(value)}"' for name, value in zip(self.labels, values)
+            )
+            lines.append(f"{self.name}{{{labels}}} {count}")
+        return lines
+
+
+class Gauge:
+    """A value read when metrics are scraped, so it costs nothing on ingest"""
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {self.read()}",
+        ]
+
+
+class Metrics:
+    """Server metrics, rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.request_seconds = Histogram(
+            "ultron_request_duration_seconds", "Time to handle a request, by endpoint"
+        )
+        self.validation_seconds = Histogram(
+            "ultron_validation_duration_seconds",
+            "Time spent validating report models, by endpoint",
+        )
+        self.classification_seconds = Histogram(
+            "ultron_classification_duration_seconds",
+            "Time spent classifying processes, by endpoint",
+        )
+        self.upsert_seconds = Histogram(
+            "ultron_store_upsert_duration_seconds",
+            "Time spent storing reports, by endpoint",
+        )
+        self.responses = Counter(
+            "ultron_responses_total",
+            "Responses sent, by endpoint and status code",
+            ("endpoint", "status"),
+        )
+        self.cache_lookups = Counter(
+            "ultron_response_cache_lookups_total",
+            "Response cache lookups, by endpoint and result (hit, stale or miss)",
+            ("endpoint", "result"),
+        )
+        self.gauges: Dict[str, Gauge] = {}
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], float]):
+        """Register a gauge, replacing any previous one of the same name"""
+        self.gauges[name] = Gauge(name, documentation, read)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (
+            self.request_seconds,
+            self.validation_seconds,
+            self.classification_seconds,
+            self.upsert_seconds,
+            self.responses,
+            self.cache_lookups,
+            *self.gauges.values(),
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Time every HTTP request and count responses, labelled by route name.
+
+    The request's scope is made available to code further down through a
+    context variable, so ingest stages can attribute their timings to the
+    endpoint without it being passed along.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Optional[Metrics] = None):
+        self.app = app
+        self.metrics = registry or metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _request_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            endpoint = current_endpoint()
+            _request_scope.reset(token)
+            self.metrics.request_seconds.observe(elapsed, endpoint)
+            self.metrics.responses.inc(endpoint, str(status))
+
+
+metrics = Metrics()
@@ -0,0 +1,42 @@
+from typing import Any, Callable, Coroutine
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """Request whose JSON body is decoded by orjson"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """
+    Route that decodes JSON bodies with orjson before validation.
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so malformed
+    bodies still get FastAPI's usual 422.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded by orjson. Returning one from an endpoint also
+    skips FastAPI's jsonable_encoder pass; orjson handles datetimes and
+    dataclasses itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -0,0 +1,105 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+import orjson
+
+# Largest single JSON document buffered while waiting for it to complete
+MAX_ITEM_SIZE = 16 * 1024 * 1024
+
+_WHITESPACE = " \t\r\n"
+_SEPARATORS = _WHITESPACE + ","
+
+
+class StreamFormatError(ValueError):
+    """The body framing is broken and no further items can be read"""
+
+
+async def iter_json_items(
+    chunks: AsyncIterator[bytes], max_item_size: int = MAX_ITEM_SIZE
+) -> AsyncIterator[Tuple[Optional[Any], Optional[str]]]:
+    """
+    Incrementally decode a JSON array or newline-delimited JSON body.
+
+    Yields (item, None) for every decoded document and (None, error) for a
+    line that is not valid JSON, so one bad NDJSON line does not fail the
+    rest. Only the unread tail of the body is ever buffered. NDJSON lines
+    are decoded by orjson; array elements need the stdlib's raw_decode to
+    find where each one ends.
+    """
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    async def more() -> bool:
+        """Append the next chunk, dropping the consumed prefix of the buffer"""
+        nonlocal buffer, position
+        buffer = buffer[position:]
+        position = 0
+        if len(buffer) > max_item_size:
+            raise StreamFormatError("Item exceeds maximum size")
+        async for chunk in chunks:
+            if chunk:
+                buffer += utf8.decode(chunk)
+                return True
+        buffer += utf8.decode(b"", final=True)
+        return False
+
+    # The first significant character decides the framing
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position < len(buffer):
+            break
+        if eof:
+            return
+        eof = not await more()
+
+    if buffer[position] != "[":
+        while True:
+            newline = buffer.find("\n", position)
+            if newline < 0 and not eof:
+                eof = not await more()
+                continue
+            end = len(buffer) if newline < 0 else newline
+            line = buffer[position:end].strip()
+            position = end + 1
+            if line:
+                try:
+                    yield orjson.loads(line), None
+                except orjson.JSONDecodeError as e:
+                    yield None, f"Invalid JSON: {e}"
+            if newline < 0:
+                return
+
+    position += 1
+    while True:
+        while position < len(buffer) and buffer[position] in _SEPARATORS:
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise StreamFormatError("Unterminated JSON array")
+            eof = not await more()
+            continue
+        if buffer[position] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # Most likely the element is still incomplete
+            if eof:
+                raise StreamFormatError(f"Invalid JSON array element: {e}")
+            eof = not await more()
+            continue
+        if (
+            not eof
+            and not isinstance(item, (dict, list))
+            and (end == len(buffer) or buffer[end] not in _SEPARATORS + "]")
+        ):
+            # A bare scalar may continue in the next chunk, e.g. "6.5" + "e3"
+            eof = not await more()
+            continue
+        position = end
+        yield item, None
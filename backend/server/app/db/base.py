@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, NamedTuple, Optional
+
+from server.app.api.v1.models import SystemReport
+from server.app.db.index import ClientQuery
+from server.app.db.timeseries import TimeSeriesStore
+
+
+class StorageError(Exception):
+    """Reports could not be persisted by the storage backend"""
+
+
+class CategoryTotals(NamedTuple):
+    """Per-category sums over the latest report of every client"""
+
+    category: str
+    processes: int
+    cpu_sum: float
+    memory_sum: float
+    clients: int
+
+
+class ReportStore(ABC):
+    """
+    Storage interface for client reports.
+
+    Keeps the latest report per client, a bounded per-client history and
+    secondary indexes by organization and, through a ClientIndex, by AI
+    tool and editor extension. Upsert and lookup by client_id must be
+    O(1) so that ingest cost does not grow with the fleet. Every stored
+    report is also recorded in the store's resource time series.
+    """
+
+    timeseries: TimeSeriesStore
+    # Bumped by every upsert, so readers can tell whether the store changed
+    generation: int = 0
+
+    @abstractmethod
+    def upsert(self, report: SystemReport) -> Optional[SystemReport]:
+        """
+        Store report as the latest for its client, returning the one it
+        replaced. Assigns report.sequence, one more than the previous report's.
+        """
+
+    def upsert_many(self, reports: List[SystemReport]) -> List[Optional[SystemReport]]:
+        """Store a batch of reports in one pass, in order"""
+        return [self.upsert(report) for report in reports]
+
+    @abstractmethod
+    def get(self, client_id: str) -> Optional[SystemReport]:
+        """Latest report for a client, or None"""
+
+    @abstractmethod
+    def history(self, client_id: str) -> List[SystemReport]:
+        """Recent reports for a client, oldest first"""
+
+    @abstractmethod
+    def by_organization(self, organization_id: Optional[str]) -> List[SystemReport]:
+        """Latest report of every client in an organization"""
+
+    @abstractmethod
+    def latest_reports(self) -> Iterator[SystemReport]:
+        """Iterate over the latest report of every client"""
+
+    @abstractmethod
+    def find_clients(self, query: ClientQuery) -> List[SystemReport]:
+        """Latest reports of the clients matching query, ordered by client_id"""
+
+    def category_totals(self) -> List[CategoryTotals]:
+        """Per-category totals, used to seed the running analytics at startup"""
+        totals = {}
+        for report in self.latest_reports():
+            seen = set()
+            for process in report.process_list:
+                category = process.category or "Unknown"
+                processes, cpu_sum, memory_sum, clients = totals.get(
+                    category, (0, 0.0, 0.0, 0)
+                )
+                totals[category] = (
+                    processes + 1,
+                    cpu_sum + (process.cpu_percent or 0.0),
+                    memory_sum + (process.memory_percent or 0.0),
+                    clients + (category not in seen),
+                )
+                seen.add(category)
+        return [CategoryTotals(category, *values) for category, values in totals.items()]
+
+    def reports_in_memory(self) -> int:
+        """Number of reports held in memory, history included"""
+        return len(self)
+
+    def prune(self, now: Optional[float] = None):
+        """Apply time-series retention"""
+        self.timeseries.prune(now)
+
+    def flush(self):
+        """Block until buffered writes are durable"""
+
+    def close(self):
+        """Flush and release resources"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of tracked clients"""
+
+    def __contains__(self, client_id: str) -> bool:
+        return self.get(client_id) is not None
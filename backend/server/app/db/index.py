@@ -0,0 +1,150 @@
+import heapq
+from typing import Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from server.app.api.v1.models import ExtensionRecord, SystemReport
+from server.app.db.timeseries import to_epoch
+
+
+class ClientQuery(NamedTuple):
+    """
+    Filters for finding clients by their latest report. Values within tools
+    or within extensions match any of them; the filters given all apply.
+    """
+
+    # Categories or process names, case-insensitive
+    tools: Tuple[str, ...] = ()
+    # Extension ids, case-insensitive, as returned by extension_id()
+    extensions: Tuple[str, ...] = ()
+    organization_id: Optional[str] = None
+    # Only clients whose latest report is at least this recent, epoch seconds
+    seen_since: Optional[float] = None
+    # Cursor: only clients whose client_id sorts after this one
+    after: Optional[str] = None
+    limit: int = 100
+
+
+def extension_id(key: str, extension: ExtensionRecord) -> str:
+    """
+    Version-independent id of an editor extension: the plugin id when the
+    editor has one, else publisher.name as on the VS Code marketplace, else
+    its name or report key
+    """
+    if extension.id:
+        identifier = extension.id
+    elif extension.publisher and extension.name:
+        identifier = f"{extension.publisher}.{extension.name}"
+    else:
+        identifier = extension.name or key
+    return identifier.lower()
+
+
+def report_tools(report: SystemReport) -> FrozenSet[str]:
+    """Lower-cased categories and names of a classified report's processes"""
+    tools = set()
+    for process in report.process_list:
+        tools.add(process.name.lower())
+        if process.category:
+            tools.add(process.category.lower())
+    return frozenset(tools)
+
+
+def report_extensions(report: SystemReport) -> FrozenSet[str]:
+    return frozenset(
+        extension_id(key, extension)
+        for key, extension in report.editor_extensions.items()
+    )
+
+
+class ClientIndex:
+    """
+    Inverted indexes from AI tool and from editor extension to the clients
+    whose latest report has them.
+
+    Each client's current keys are kept, so an upsert only touches the keys
+    that appeared or disappeared since its previous report. The owning store
+    calls update() under its lock.
+    """
+
+    def __init__(self):
+        self.by_tool: Dict[str, Set[str]] = {}
+        self.by_extension: Dict[str, Set[str]] = {}
+        self._tools: Dict[str, FrozenSet[str]] = {}
+        self._extensions: Dict[str, FrozenSet[str]] = {}
+
+    def update(self, report: SystemReport):
+        client_id = report.client_id
+        _reindex(self.by_tool, self._tools, client_id, report_tools(report))
+        extensions = report_extensions(report)
+        _reindex(self.by_extension, self._extensions, client_id, extensions)
+
+    def candidates(
+        self,
+        query: ClientQuery,
+        by_organization: Mapping[Optional[str], Set[str]],
+        latest: Mapping[str, SystemReport],
+    ) -> Set[str]:
+        """
+        Clients matching the tool, extension and organization filters, as a
+        new set the store's lock need not cover
+        """
+        matches = None
+        for index, keys in (
+            (self.by_tool, query.tools),
+            (self.by_extension, query.extensions),
+        ):
+            if keys:
+                found = set().union(*(index.get(key.lower(), ()) for key in keys))
+                matches = found if matches is None else matches & found
+        if query.organization_id is not None:
+            members = by_organization.get(query.organization_id, set())
+            matches = set(members) if matches is None else matches & members
+        return set(latest) if matches is None else matches
+
+
+def _reindex(
+    index: Dict[str, Set[str]],
+    current: Dict[str, FrozenSet[str]],
+    client_id: str,
+    keys: FrozenSet[str],
+):
+    previous = current.get(client_id, frozenset())
+    if keys == previous:
+        return
+    for key in previous - keys:
+        members = index[key]
+        members.discard(client_id)
+        if not members:
+            del index[key]
+    for key in keys - previous:
+        index.setdefault(key, set()).add(client_id)
+    current[client_id] = keys
+
+
+def find_clients(
+    query: ClientQuery, candidates: Set[str], latest: Mapping[str, SystemReport]
+) -> List[SystemReport]:
+    """
+    Latest reports of the candidate clients that pass the last-seen and
+    cursor filters: the first query.limit of them by client_id. Only ids are
+    ordered, and reports are read until the page is full.
+    """
+    client_ids = candidates
+    if query.after is not None:
+        client_ids = [client_id for client_id in candidates if client_id > query.after]
+    if query.seen_since is None:
+        ordered = heapq.nsmallest(query.limit, client_ids)
+    else:
+        # Clients seen too long ago are skipped, so the page may need more
+        ordered = sorted(client_ids)
+    reports = []
+    for client_id in ordered:
+        report = latest.get(client_id)
+        if report is None:
+            continue
+        if query.seen_since is not None:
+            if to_epoch(report.timestamp) < query.seen_since:
+                continue
+        reports.append(report)
+        if len(reports) == query.limit:
+            break
+    return reports
@@ -1,2 +1,88 @@
-# Temporary in-memory storage
-client_reports = [] 
\ No newline at end of file
+from collections import deque
+from threading import RLock
+from typing import Deque, Dict, Iterator, List, Optional, Set
+
+from server.app.api.v1.models import SystemReport
+from server.app.core.config import settings
+from server.app.db.base import ReportStore
+from server.app.db.index import ClientIndex, ClientQuery, find_clients
+from server.app.db.timeseries import InMemoryTimeSeriesStore
+
+
+class InMemoryReportStore(ReportStore):
+    """
+    Temporary in-memory storage, indexed by client_id and organization_id
+    """
+
+    def __init__(self, history_size: int = settings.REPORT_HISTORY_SIZE):
+        self.history_size = history_size
+        self._latest: Dict[str, SystemReport] = {}
+        self._history: Dict[str, Deque[SystemReport]] = {}
+        self._by_organization: Dict[Optional[str], Set[str]] = {}
+        self.client_index = ClientIndex()
+        self._lock = RLock()
+        self.timeseries = InMemoryTimeSeriesStore()
+
+    def upsert(self, report: SystemReport) -> Optional[SystemReport]:
+        client_id = report.client_id
+        with self._lock:
+            previous = self._latest.get(client_id)
+            report.sequence = (previous.sequence if previous else 0) + 1
+            self._latest[client_id] = report
+
+            ring = self._history.get(client_id)
+            if ring is None:
+                ring = self._history[client_id] = deque(maxlen=self.history_size)
+            ring.append(report)
+
+            if previous is not None and previous.organization_id != report.organization_id:
+                self._unindex(previous.organization_id, client_id)
+            self._by_organization.setdefault(report.organization_id, set()).add(client_id)
+            self.client_index.update(report)
+
+            self.timeseries.add(report)
+            self.generation += 1
+            return previous
+
+    def upsert_many(self, reports: List[SystemReport]) -> List[Optional[SystemReport]]:
+        with self._lock:
+            return [self.upsert(report) for report in reports]
+
+    def get(self, client_id: str) -> Optional[SystemReport]:
+        return self._latest.get(client_id)
+
+    def history(self, client_id: str) -> List[SystemReport]:
+        with self._lock:
+            return list(self._history.get(client_id, ()))
+
+    def by_organization(self, organization_id: Optional[str]) -> List[SystemReport]:
+        with self._lock:
+            client_ids = self._by_organization.get(organization_id, ())
+            return [self._latest[client_id] for client_id in client_ids]
+
+    def latest_reports(self) -> Iterator[SystemReport]:
+        with self._lock:
+            reports = list(self._latest.values())
+        return iter(reports)
+
+    def find_clients(self, query: ClientQuery) -> List[SystemReport]:
+        with self._lock:
+            candidates = self.client_index.candidates(
+                query, self._by_organization, self._latest
+            )
+        return find_clients(query, candidates, self._latest)
+
+    def reports_in_memory(self) -> int:
+        with self._lock:
+            return sum(len(ring) for ring in self._history.values())
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def _unindex(self, organization_id: Optional[str], client_id: str):
+        members = self._by_organization.get(organization_id)
+        if members is not None:
+            members.discard(client_id)
+            if not members:
+                del self._by_organization[organization_id]
+
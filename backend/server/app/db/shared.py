@@ -0,0 +1,368 @@
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from server.app.api.v1.models import SystemReport
+from server.app.db.base import CategoryTotals, ReportStore, StorageError
+from server.app.db.index import ClientQuery
+from server.app.db.timeseries import TimeSeriesStore
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a new store process to accept connections
+STARTUP_TIMEOUT = 30.0
+# Reports whose unclassified process names a worker sends at once
+UNCLASSIFIED_BATCH = 32
+
+
+class StoreServer:
+    """
+    Serve a report store, its running analytics and the unclassified
+    process names to other processes over a Unix socket.
+
+    Each connection gets a thread that answers (operation, args) requests,
+    pickled by multiprocessing.connection, one at a time. Storing reports
+    and updating the analytics happen under one lock, so a client's old
+    contribution is always subtracted before its next one is added. Peers
+    are trusted: the socket should live in a directory only the server's
+    user can enter.
+    """
+
+    def __init__(self, address: str, store: ReportStore, analytics, unclassified):
+        self.address = address
+        self.store = store
+        self.analytics = analytics
+        self.unclassified = unclassified
+        self._store_lock = threading.Lock()
+        self._operations: Dict[str, Callable] = {
+            "upsert_many": self._upsert_many,
+            "get": store.get,
+            "history": store.history,
+            "by_organization": store.by_organization,
+            "latest_reports": lambda: list(store.latest_reports()),
+            "find_clients": store.find_clients,
+            "category_totals": store.category_totals,
+            "reports_in_memory": store.reports_in_memory,
+            "clients": store.__len__,
+            "contains": store.__contains__,
+            "generation": lambda: store.generation,
+            "flush": store.flush,
+            "prune": store.prune,
+            "timeseries_query": store.timeseries.query,
+            "analytics": analytics.snapshot,
+            "total_processes": lambda: analytics.total_processes,
+            "add_unclassified": self.unclassified.add_counts,
+            "unclassified": self.unclassified.snapshot,
+        }
+        if os.path.exists(address):
+            os.unlink(address)
+        self._listener = Listener(address, family="AF_UNIX")
+        self._closed = False
+
+    def _upsert_many(self, reports: List[SystemReport]) -> List[int]:
+        with self._store_lock:
+            previous_reports = self.store.upsert_many(reports)
+            for previous, report in zip(previous_reports, reports):
+                self.analytics.replace(previous, report)
+        return [report.sequence for report in reports]
+
+    def serve_forever(self):
+        """Accept connections until close() is called"""
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return
+            if self._closed:
+                conn.close()
+                return
+            threading.Thread(
+                target=self._handle, args=(conn,), name="store-connection", daemon=True
+            ).start()
+
+    def _handle(self, conn: Connection):
+        with conn:
+            while True:
+                try:
+                    operation, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = ("ok", self._operations[operation](*args))
+                except Exception as e:
+                    reply = ("error", e)
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    return
+                except Exception as e:
+                    # The result or exception could not be pickled
+                    conn.send(("error", StorageError(f"{operation} failed: {e}")))
+
+    def close(self):
+        # Closing the socket does not wake a blocked accept(); connecting does
+        self._closed = True
+        try:
+            Client(self.address, family="AF_UNIX").close()
+        except OSError:
+            pass
+        self._listener.close()
+
+
+class StoreClient:
+    """
+    Connection to a StoreServer. Calls are serialized over one socket; a
+    broken connection is reopened on the next call.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+
+    def call(self, operation: str, *args) -> Any:
+        with self._lock:
+            try:
+                if self._conn is None:
+                    self._conn = Client(self.address, family="AF_UNIX")
+                self._conn.send((operation, args))
+                status, value = self._conn.recv()
+            except (EOFError, OSError) as e:
+                self.close()
+                raise StorageError(f"Report store at {self.address} unavailable: {e}")
+        if status == "error":
+            raise value
+        return value
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@lru_cache(maxsize=None)
+def store_client(address: str) -> StoreClient:
+    """The process-wide client for the store at address"""
+    return StoreClient(address)
+
+
+class SharedTimeSeriesStore(TimeSeriesStore):
+    """Time series of a SharedReportStore, queried in the store process"""
+
+    def __init__(self, client: StoreClient, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client = client
+
+    def prune(self, now: Optional[float] = None):
+        self._client.call("prune", now)
+
+    def query(
+        self, client_id: Optional[str], start: float, end: float, resolution: str
+    ) -> List[Dict]:
+        return self._client.call("timeseries_query", client_id, start, end, resolution)
+
+
+class SharedReportStore(ReportStore):
+    """
+    Report store held by a separate store process, shared by every server
+    worker that connects to it.
+
+    The store process also keeps the fleet analytics and updates them as it
+    stores each report, so replaced reports never travel back: upserts
+    return None in their place, and workers read analytics through
+    SharedAnalytics.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self._client = store_client(address)
+        self.timeseries = SharedTimeSeriesStore(self._client)
+
+    def upsert(self, report: SystemReport) -> Optional[SystemReport]:
+        return self.upsert_many([report])[0]
+
+    def upsert_many(self, reports: List[SystemReport]) -> List[Optional[SystemReport]]:
+        sequences = self._client.call("upsert_many", reports)
+        for report, sequence in zip(reports, sequences):
+            report.sequence = sequence
+        return [None] * len(reports)
+
+    def get(self, client_id: str) -> Optional[SystemReport]:
+        return self._client.call("get", client_id)
+
+    def history(self, client_id: str) -> List[SystemReport]:
+        return self._client.call("history", client_id)
+
+    def by_organization(self, organization_id: Optional[str]) -> List[SystemReport]:
+        return self._client.call("by_organization", organization_id)
+
+    def latest_reports(self) -> Iterator[SystemReport]:
+        return iter(self._client.call("latest_reports"))
+
+    def find_clients(self, query: ClientQuery) -> List[SystemReport]:
+        return self._client.call("find_clients", query)
+
+    def category_totals(self) -> List[CategoryTotals]:
+        return self._client.call("category_totals")
+
+    def reports_in_memory(self) -> int:
+        return self._client.call("reports_in_memory")
+
+    @property
+    def generation(self) -> int:
+        return self._client.call("generation")
+
+    def flush(self):
+        self._client.call("flush")
+
+    def close(self):
+        self._client.close()
+
+    def __len__(self) -> int:
+        return self._client.call("clients")
+
+    def __contains__(self, client_id: str) -> bool:
+        return self._client.call("contains", client_id)
+
+
+class SharedAnalytics:
+    """
+    Fleet analytics kept by the store process. The store process applies
+    each report's contribution as it stores it and seeds itself at startup,
+    so replace() and the load methods have nothing to do here.
+    """
+
+    def __init__(self, address: str):
+        self._client = store_client(address)
+
+    def replace(self, previous: Optional[SystemReport], report: SystemReport):
+        pass
+
+    def load_totals(self, totals):
+        pass
+
+    def load_distributions(self, reports):
+        pass
+
+    @property
+    def total_processes(self) -> int:
+        return self._client.call("total_processes")
+
+    def snapshot(self) -> Dict:
+        return self._client.call("analytics")
+
+
+class SharedUnclassifiedProcesses:
+    """
+    Unclassified process names counted by the store process. Each worker
+    tallies them for UNCLASSIFIED_BATCH reports, or until a snapshot, then
+    sends the tally, so counting costs it one call per batch.
+    """
+
+    def __init__(self, address: str):
+        self._client = store_client(address)
+        self._pending: Counter = Counter()
+        self._pending_reports = 0
+        self._lock = threading.Lock()
+
+    def add(self, names: Set[str]):
+        with self._lock:
+            self._pending.update(names)
+            self._pending_reports += 1
+            if self._pending_reports < UNCLASSIFIED_BATCH:
+                return
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            reports, self._pending_reports = self._pending_reports, 0
+        if reports:
+            self._client.call("add_unclassified", pending, reports)
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict:
+        self.flush()
+        return self._client.call("unclassified", limit)
+
+
+def serve(address: str):
+    """
+    Entry point of the store process: serve the configured report store
+    until SIGTERM, then flush and close it
+    """
+    from server.app.core.config import settings
+
+    # This process holds the store: build it rather than connect to itself
+    settings.STORE_ADDRESS = None
+    from server.app.core.analytics import analytics_aggregator
+    from server.app.core.heavy_hitters import unclassified_processes
+    from server.app.db.store import report_store
+
+    logging.basicConfig(level=logging.INFO)
+    # The parent decides when to stop, after the workers have flushed
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    analytics_aggregator.load_totals(report_store.category_totals())
+    analytics_aggregator.load_distributions(report_store.latest_reports())
+    server = StoreServer(
+        address, report_store, analytics_aggregator, unclassified_processes
+    )
+    logger.info(f"Serving {type(report_store).__name__} on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        report_store.close()
+
+
+@contextmanager
+def store_process(address: Optional[str] = None):
+    """
+    Run the configured report store in a child process while the context is
+    open, yielding its socket address. Without an address, the socket is
+    created in a new private temporary directory.
+    """
+    directory = None
+    if address is None:
+        directory = tempfile.mkdtemp(prefix="ultron-store-")
+        address = os.path.join(directory, "store.sock")
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(address,), name="ultron-store"
+    )
+    process.start()
+    try:
+        _wait_until_ready(address, process)
+        yield address
+    finally:
+        process.terminate()
+        process.join()
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def _wait_until_ready(address: str, process: multiprocessing.process.BaseProcess):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while True:
+        try:
+            Client(address, family="AF_UNIX").close()
+            return
+        except OSError:
+            if not process.is_alive():
+                raise StorageError(f"Store process exited with code {process.exitcode}")
+            if time.monotonic() > deadline:
+                raise StorageError(f"Store process not ready on {address}")
+            time.sleep(0.05)
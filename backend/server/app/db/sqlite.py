@@ -0,0 +1,551 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import orjson
+
+from server.app.api.v1.models import ProcessRecord, SystemReport, process_records
+from server.app.db.base import ReportStore, StorageError
+from server.app.db.index import ClientIndex, ClientQuery, find_clients
+from server.app.db.timeseries import (
+    RESOLUTIONS,
+    Bucket,
+    TimeSeriesStore,
+    fold,
+    raw_point,
+    report_sample,
+    rollup_point,
+    sample_bucket,
+    to_epoch,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    client_id TEXT PRIMARY KEY,
+    organization_id TEXT,
+    sequence INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clients_organization ON clients (organization_id);
+
+CREATE TABLE IF NOT EXISTS reports (
+    client_id TEXT NOT NULL,
+    sequence INTEGER NOT NULL,
+    report_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (client_id, sequence)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS processes (
+    client_id TEXT NOT NULL,
+    sequence INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT,
+    pid INTEGER,
+    cpu_percent REAL,
+    memory_percent REAL,
+    status TEXT,
+    create_time TEXT,
+    instance_count INTEGER,
+    extra TEXT,
+    PRIMARY KEY (client_id, sequence, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS processes_category ON processes (category);
+
+CREATE TABLE IF NOT EXISTS samples (
+    client_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    tool TEXT NOT NULL,
+    cpu REAL NOT NULL,
+    memory REAL NOT NULL,
+    PRIMARY KEY (client_id, timestamp, tool)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_timestamp ON samples (timestamp);
+"""
+
+# Per-client and fleet-wide rollups share one layout
+ROLLUP_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    resolution TEXT NOT NULL,
+    {key}
+    bucket INTEGER NOT NULL,
+    tool TEXT NOT NULL,
+    samples INTEGER NOT NULL,
+    cpu_min REAL NOT NULL,
+    cpu_sum REAL NOT NULL,
+    cpu_max REAL NOT NULL,
+    memory_min REAL NOT NULL,
+    memory_sum REAL NOT NULL,
+    memory_max REAL NOT NULL,
+    PRIMARY KEY (resolution, {primary_key})
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS {table}_bucket ON {table} (resolution, bucket);
+"""
+ROLLUP_MERGE = (
+    "ON CONFLICT DO UPDATE SET samples = samples + excluded.samples, "
+    "cpu_min = MIN(cpu_min, excluded.cpu_min), cpu_sum = cpu_sum + excluded.cpu_sum, "
+    "cpu_max = MAX(cpu_max, excluded.cpu_max), "
+    "memory_min = MIN(memory_min, excluded.memory_min), "
+    "memory_sum = memory_sum + excluded.memory_sum, "
+    "memory_max = MAX(memory_max, excluded.memory_max)"
+)
+SCHEMA += ROLLUP_TABLE.format(
+    table="rollups", key="client_id TEXT NOT NULL,", primary_key="client_id, bucket, tool"
+)
+SCHEMA += ROLLUP_TABLE.format(table="fleet_rollups", key="", primary_key="bucket, tool")
+
+# ProcessRecord fields, each stored in its own column. The `extra` column
+# held unknown fields of untyped process dicts and is no longer written.
+PROCESS_COLUMNS = (
+    "name",
+    "category",
+    "pid",
+    "cpu_percent",
+    "memory_percent",
+    "status",
+    "create_time",
+    "instance_count",
+)
+
+_STOP = object()
+
+
+class _Prune(NamedTuple):
+    """Writer request to apply time-series retention"""
+
+    now: float
+
+# Backoff between attempts to write a batch that failed, in seconds
+RETRY_DELAY = 0.1
+RETRY_DELAY_MAX = 5.0
+
+
+class SQLiteTimeSeriesStore(TimeSeriesStore):
+    """
+    Time series kept in the report database.
+
+    Samples and rollups are written by the report writer in the same
+    transaction as their reports, so they survive restarts and only become
+    visible once committed. Rollups of a batch are merged in memory first
+    and then upserted. Retention deletes run on the writer thread and go
+    through the time indexes, touching only expired rows.
+    """
+
+    def __init__(self, store: "SQLiteReportStore", *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._store = store
+
+    def write(self, conn: sqlite3.Connection, reports: List[SystemReport]):
+        sample_rows = []
+        rollups: Dict[Tuple[str, str, int], Dict[str, Bucket]] = {}
+        fleet: Dict[Tuple[str, int], Dict[str, Bucket]] = {}
+        for report in reports:
+            timestamp = to_epoch(report.timestamp)
+            for tool, (cpu, memory) in report_sample(report).items():
+                sample_rows.append((report.client_id, timestamp, tool, cpu, memory))
+                bucket = sample_bucket(cpu, memory)
+                for name, width in RESOLUTIONS.items():
+                    start = int(timestamp // width * width)
+                    key = (name, report.client_id, start)
+                    fold(rollups.setdefault(key, {}), tool, bucket)
+                    fold(fleet.setdefault((name, start), {}), tool, bucket)
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?)", sample_rows
+        )
+        conn.executemany(
+            "INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            + ROLLUP_MERGE,
+            [
+                (*key, tool, *bucket)
+                for key, tools in rollups.items()
+                for tool, bucket in tools.items()
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO fleet_rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            + ROLLUP_MERGE,
+            [
+                (*key, tool, *bucket)
+                for key, tools in fleet.items()
+                for tool, bucket in tools.items()
+            ],
+        )
+
+    def delete_expired(self, conn: sqlite3.Connection, now: float):
+        cutoffs = self.cutoffs(now)
+        conn.execute("BEGIN")
+        try:
+            conn.execute("DELETE FROM samples WHERE timestamp < ?", (cutoffs["raw"],))
+            for name in RESOLUTIONS:
+                for table in ("rollups", "fleet_rollups"):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE resolution = ? AND bucket < ?",
+                        (name, cutoffs[name]),
+                    )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self, now: Optional[float] = None):
+        self._store._queue.put(_Prune(now if now is not None else time.time()))
+
+    def query(
+        self, client_id: Optional[str], start: float, end: float, resolution: str
+    ) -> List[Dict]:
+        store = self._store
+        if resolution == "raw":
+            if client_id is None:
+                raise ValueError("Raw samples are only kept per client")
+            with store._lock:
+                rows = store._reader.execute(
+                    "SELECT timestamp, tool, cpu, memory FROM samples "
+                    "WHERE client_id = ? AND timestamp BETWEEN ? AND ? "
+                    "ORDER BY timestamp",
+                    (client_id, start, end),
+                ).fetchall()
+            return [
+                raw_point(timestamp, (row[1:] for row in group))
+                for timestamp, group in groupby(rows, key=itemgetter(0))
+            ]
+
+        columns = (
+            "bucket, tool, samples, cpu_min, cpu_sum, cpu_max, "
+            "memory_min, memory_sum, memory_max"
+        )
+        bounds = (resolution, start - RESOLUTIONS[resolution], end)
+        with store._lock:
+            if client_id is None:
+                rows = store._reader.execute(
+                    f"SELECT {columns} FROM fleet_rollups "
+                    "WHERE resolution = ? AND bucket > ? AND bucket <= ? ORDER BY bucket",
+                    bounds,
+                ).fetchall()
+            else:
+                rows = store._reader.execute(
+                    f"SELECT {columns} FROM rollups WHERE resolution = ? "
+                    "AND client_id = ? AND bucket > ? AND bucket <= ? ORDER BY bucket",
+                    (resolution, client_id, *bounds[1:]),
+                ).fetchall()
+        return [
+            rollup_point(bucket_start, {row[1]: list(row[2:]) for row in group})
+            for bucket_start, group in groupby(rows, key=itemgetter(0))
+        ]
+
+
+class SQLiteReportStore(ReportStore):
+    """
+    Persistent report storage on SQLite in WAL mode.
+
+    Reports and their processes are stored in a normalized schema. Writes
+    are queued and committed by a single writer thread in group
+    transactions, every batch_interval_ms or batch_rows reports, whichever
+    comes first, together with their time-series samples. A batch that
+    fails to commit stays pending and is retried with backoff. The latest
+    report of every client is kept in memory, so ingest and fleet-wide
+    reads never wait on SQLite; history is read from the database plus the
+    reports not yet committed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        history_size: int,
+        batch_interval_ms: int = 50,
+        batch_rows: int = 500,
+    ):
+        self.path = path
+        self.history_size = history_size
+        self.batch_interval = batch_interval_ms / 1000
+        self.batch_rows = batch_rows
+
+        self._lock = threading.RLock()
+        # client_id -> reports queued but not yet committed, oldest first
+        self._unflushed: Dict[str, List[SystemReport]] = {}
+        self._queue: "queue.Queue" = queue.Queue()
+        # Reports enqueued and committed so far, and the last write error
+        self._enqueued = 0
+        self._written = 0
+        self._write_error: Optional[Exception] = None
+
+        self._reader = self._connect(check_same_thread=False)
+        self._reader.executescript(SCHEMA)
+        self.timeseries = SQLiteTimeSeriesStore(self)
+        self._latest: Dict[str, SystemReport] = {}
+        self._by_organization: Dict[Optional[str], Set[str]] = {}
+        self.client_index = ClientIndex()
+        for report in self._load(
+            self._reader.execute(
+                "SELECT r.client_id, r.sequence, r.payload FROM clients c "
+                "JOIN reports r ON r.client_id = c.client_id AND r.sequence = c.sequence"
+            ).fetchall()
+        ):
+            self._index(None, report)
+        logger.info(f"Loaded latest reports of {len(self._latest)} clients from {path}")
+
+        self._writer = threading.Thread(
+            target=self._write_loop, name="sqlite-report-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, check_same_thread=check_same_thread, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _index(self, previous: Optional[SystemReport], report: SystemReport):
+        client_id = report.client_id
+        self._latest[client_id] = report
+        if previous is not None and previous.organization_id != report.organization_id:
+            members = self._by_organization.get(previous.organization_id)
+            if members is not None:
+                members.discard(client_id)
+                if not members:
+                    del self._by_organization[previous.organization_id]
+        self._by_organization.setdefault(report.organization_id, set()).add(client_id)
+        self.client_index.update(report)
+
+    # Writes
+
+    def upsert(self, report: SystemReport) -> Optional[SystemReport]:
+        with self._lock:
+            previous = self._latest.get(report.client_id)
+            report.sequence = (previous.sequence if previous else 0) + 1
+            self._index(previous, report)
+            self.generation += 1
+            self._unflushed.setdefault(report.client_id, []).append(report)
+            self._enqueued += 1
+            self._queue.put(report)
+            return previous
+
+    def upsert_many(self, reports: List[SystemReport]) -> List[Optional[SystemReport]]:
+        with self._lock:
+            return [self.upsert(report) for report in reports]
+
+    def flush(self):
+        """
+        Block until the writer has processed everything queued so far.
+        Raises StorageError if reports are still pending because a write
+        failed; they stay queued for retry.
+        """
+        with self._lock:
+            target = self._enqueued
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        if self._written < target:
+            raise StorageError(
+                f"{target - self._written} reports not yet written: {self._write_error}"
+            )
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._reader.close()
+
+    def _next_batch(self, batch: List[SystemReport], timeout: Optional[float]):
+        """
+        Add queued reports to batch until it is full or the batch interval
+        has passed since the first one. timeout bounds the wait for the
+        first report (None blocks). Returns the control request that ended
+        the batch early (_STOP, a _Prune or a flush Event), if any.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(batch) < self.batch_rows:
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if not isinstance(item, SystemReport):
+                return item
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.batch_interval
+            timeout = max(deadline - time.monotonic(), 0)
+        return None
+
+    def _write_loop(self):
+        conn = self._connect()
+        batch: List[SystemReport] = []
+        failures = 0
+        control = None
+        while control is not _STOP:
+            # A failed batch is retried, together with anything queued since
+            delay = min(RETRY_DELAY * 2**failures, RETRY_DELAY_MAX) if batch else None
+            control = self._next_batch(batch, delay)
+            if batch:
+                try:
+                    self._write_batch(conn, batch)
+                except Exception as e:
+                    failures += 1
+                    logger.error(
+                        f"Failed to write {len(batch)} reports (attempt {failures}), "
+                        f"keeping them pending: {e}"
+                    )
+                    self._write_error = e
+                else:
+                    self._committed(batch)
+                    batch = []
+                    failures = 0
+
+            if isinstance(control, _Prune):
+                try:
+                    self.timeseries.delete_expired(conn, control.now)
+                except Exception as e:
+                    logger.error(f"Time-series pruning failed: {e}")
+            elif isinstance(control, threading.Event):
+                control.set()
+
+        if batch:
+            logger.error(f"Closing with {len(batch)} reports that could not be written")
+        conn.close()
+
+    def _committed(self, batch: List[SystemReport]):
+        with self._lock:
+            for report in batch:
+                pending = self._unflushed.get(report.client_id)
+                if pending and pending[0] is report:
+                    pending.pop(0)
+                    if not pending:
+                        del self._unflushed[report.client_id]
+            self._written += len(batch)
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[SystemReport]):
+        report_rows, process_rows, client_rows, expired = [], [], [], []
+        for report in batch:
+            payload = report.model_dump_json(exclude={"process_list"})
+            report_rows.append(
+                (
+                    report.client_id,
+                    report.sequence,
+                    report.report_id,
+                    report.timestamp.isoformat(),
+                    payload,
+                )
+            )
+            for process in report.process_list:
+                create_time = process.create_time
+                process_rows.append(
+                    (
+                        report.client_id,
+                        report.sequence,
+                        process.name,
+                        process.category,
+                        process.pid,
+                        process.cpu_percent,
+                        process.memory_percent,
+                        process.status,
+                        create_time.isoformat() if create_time else None,
+                        process.instance_count,
+                        None,
+                    )
+                )
+            client_rows.append((report.client_id, report.organization_id, report.sequence))
+            expired.append((report.client_id, report.sequence - self.history_size))
+
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)", report_rows
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO processes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                process_rows,
+            )
+            conn.executemany(
+                "INSERT INTO clients VALUES (?, ?, ?) ON CONFLICT (client_id) DO UPDATE "
+                "SET organization_id = excluded.organization_id, sequence = excluded.sequence",
+                client_rows,
+            )
+            conn.executemany(
+                "DELETE FROM reports WHERE client_id = ? AND sequence <= ?", expired
+            )
+            conn.executemany(
+                "DELETE FROM processes WHERE client_id = ? AND sequence <= ?", expired
+            )
+            self.timeseries.write(conn, batch)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # Reads
+
+    def _load(self, rows: List[Tuple]) -> List[SystemReport]:
+        """Build reports from (client_id, sequence, payload) rows"""
+        if not rows:
+            return []
+        keys = [(client_id, sequence) for client_id, sequence, _ in rows]
+        processes: Dict[Tuple[str, int], List[ProcessRecord]] = {}
+        with self._lock:
+            for key in keys:
+                process_rows = self._reader.execute(
+                    "SELECT * FROM processes WHERE client_id = ? AND sequence = ?", key
+                ).fetchall()
+                processes[key] = process_records.validate_python(
+                    [dict(zip(PROCESS_COLUMNS, row[2:-1])) for row in process_rows]
+                )
+
+        return [
+            SystemReport.model_validate(
+                {**orjson.loads(payload), "process_list": processes[(client_id, sequence)]}
+            )
+            for client_id, sequence, payload in rows
+        ]
+
+    def get(self, client_id: str) -> Optional[SystemReport]:
+        return self._latest.get(client_id)
+
+    def history(self, client_id: str) -> List[SystemReport]:
+        with self._lock:
+            pending = list(self._unflushed.get(client_id, ()))
+            rows = self._reader.execute(
+                "SELECT client_id, sequence, payload FROM reports "
+                "WHERE client_id = ? ORDER BY sequence DESC LIMIT ?",
+                (client_id, self.history_size),
+            ).fetchall()
+        stored = [
+            report
+            for report in reversed(self._load(rows))
+            if not pending or report.sequence < pending[0].sequence
+        ]
+        return (stored + pending)[-self.history_size :]
+
+    def by_organization(self, organization_id: Optional[str]) -> List[SystemReport]:
+        with self._lock:
+            client_ids = self._by_organization.get(organization_id, ())
+            return [self._latest[client_id] for client_id in client_ids]
+
+    def latest_reports(self) -> Iterator[SystemReport]:
+        with self._lock:
+            reports = list(self._latest.values())
+        return iter(reports)
+
+    def find_clients(self, query: ClientQuery) -> List[SystemReport]:
+        with self._lock:
+            candidates = self.client_index.candidates(
+                query, self._by_organization, self._latest
+            )
+        return find_clients(query, candidates, self._latest)
+
+    def reports_in_memory(self) -> int:
+        # The latest report of every client, plus older ones not yet written
+        with self._lock:
+            return len(self._latest) + sum(
+                len(pending) - 1 for pending in self._unflushed.values()
+            )
+
+    def __len__(self) -> int:
+        return len(self._latest)
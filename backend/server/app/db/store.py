@@ -0,0 +1,30 @@
+from server.app.core.config import Settings, settings
+from server.app.db.base import ReportStore
+
+
+def create_report_store(config: Settings = settings) -> ReportStore:
+    """
+    Build the report store selected by STORAGE_BACKEND, or connect to the
+    store process at STORE_ADDRESS when one is set
+    """
+    if config.STORE_ADDRESS:
+        from server.app.db.shared import SharedReportStore
+
+        return SharedReportStore(config.STORE_ADDRESS)
+    if config.STORAGE_BACKEND == "memory":
+        from server.app.db.memory import InMemoryReportStore
+
+        return InMemoryReportStore(history_size=config.REPORT_HISTORY_SIZE)
+    if config.STORAGE_BACKEND == "sqlite":
+        from server.app.db.sqlite import SQLiteReportStore
+
+        return SQLiteReportStore(
+            config.SQLITE_PATH,
+            history_size=config.REPORT_HISTORY_SIZE,
+            batch_interval_ms=config.SQLITE_BATCH_INTERVAL_MS,
+            batch_rows=config.SQLITE_BATCH_ROWS,
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {config.STORAGE_BACKEND}")
+
+
+report_store = create_report_store()
@@ -0,0 +1,262 @@
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from server.app.api.v1.models import SystemReport
+from server.app.core.config import settings
+
+# Rollup resolutions, in seconds, keyed by the name used in queries
+RESOLUTIONS = {"5m": 300, "1h": 3600}
+
+# Per-tool bucket layout:
+# [samples, cpu_min, cpu_sum, cpu_max, memory_min, memory_sum, memory_max]
+Bucket = List[float]
+# Per-report sample: tool -> (cpu, memory)
+Sample = Dict[str, Tuple[float, float]]
+
+
+def to_epoch(value: datetime) -> float:
+    """Epoch seconds; naive datetimes are UTC, as sent by the client"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _isoformat(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+def _now() -> float:
+    return datetime.now(timezone.utc).timestamp()
+
+
+def report_sample(report: SystemReport) -> Sample:
+    """Per-tool CPU and memory totals of a classified report"""
+    sample: Sample = {}
+    for process in report.process_list:
+        category = process.category or "Unknown"
+        cpu, memory = sample.get(category, (0.0, 0.0))
+        sample[category] = (
+            cpu + (process.cpu_percent or 0.0),
+            memory + (process.memory_percent or 0.0),
+        )
+    return sample
+
+
+def fold(tools: Dict[str, Bucket], tool: str, bucket: Bucket):
+    """Merge bucket into the bucket tools[tool]"""
+    current = tools.get(tool)
+    if current is None:
+        tools[tool] = list(bucket)
+        return
+    current[0] += bucket[0]
+    current[1] = min(current[1], bucket[1])
+    current[2] += bucket[2]
+    current[3] = max(current[3], bucket[3])
+    current[4] = min(current[4], bucket[4])
+    current[5] += bucket[5]
+    current[6] = max(current[6], bucket[6])
+
+
+def sample_bucket(cpu: float, memory: float) -> Bucket:
+    return [1, cpu, cpu, cpu, memory, memory, memory]
+
+
+def raw_point(timestamp: float, tools: Iterable[Tuple[str, float, float]]) -> Dict:
+    return {
+        "timestamp": _isoformat(timestamp),
+        "tools": {
+            tool: {"cpu": round(cpu, 2), "memory": round(memory, 2)}
+            for tool, cpu, memory in tools
+        },
+    }
+
+
+def rollup_point(bucket_start: float, tools: Dict[str, Bucket]) -> Dict:
+    return {
+        "timestamp": _isoformat(bucket_start),
+        "tools": {
+            tool: {
+                "samples": int(bucket[0]),
+                "cpu_min": round(bucket[1], 2),
+                "cpu_avg": round(bucket[2] / bucket[0], 2),
+                "cpu_max": round(bucket[3], 2),
+                "memory_min": round(bucket[4], 2),
+                "memory_avg": round(bucket[5] / bucket[0], 2),
+                "memory_max": round(bucket[6], 2),
+            }
+            for tool, bucket in tools.items()
+        },
+    }
+
+
+class TimeSeriesStore(ABC):
+    """
+    Per-client resource history with retention and downsampling.
+
+    Every stored report becomes a raw sample of per-tool CPU and memory,
+    kept for a short window. Samples are also folded into 5-minute and
+    1-hour buckets holding min/avg/max, per client and fleet-wide, each
+    with its own retention. Each report store owns one and records every
+    report it stores, so the history is kept wherever the reports are.
+    """
+
+    def __init__(
+        self,
+        raw_retention: int = settings.TIMESERIES_RAW_RETENTION,
+        retention: Optional[Dict[str, int]] = None,
+    ):
+        self.raw_retention = raw_retention
+        self.retention = retention or {
+            "5m": settings.TIMESERIES_5M_RETENTION,
+            "1h": settings.TIMESERIES_1H_RETENTION,
+        }
+
+    def cutoffs(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Oldest raw timestamp and bucket start still retained, by resolution"""
+        now = now if now is not None else _now()
+        cutoffs = {"raw": now - self.raw_retention}
+        for name, width in RESOLUTIONS.items():
+            cutoffs[name] = now - self.retention[name] - width
+        return cutoffs
+
+    def pick_resolution(self, start: float, now: Optional[float] = None) -> str:
+        """The finest resolution whose retention still covers start"""
+        now = now if now is not None else _now()
+        if start >= now - self.raw_retention:
+            return "raw"
+        for name in RESOLUTIONS:
+            if start >= now - self.retention[name]:
+                return name
+        return list(RESOLUTIONS)[-1]
+
+    @abstractmethod
+    def prune(self, now: Optional[float] = None):
+        """Drop raw samples and buckets that are past their retention"""
+
+    @abstractmethod
+    def query(
+        self, client_id: Optional[str], start: float, end: float, resolution: str
+    ) -> List[Dict]:
+        """
+        Points for one client, or for the whole fleet when client_id is None,
+        between start and end (epoch seconds), oldest first
+        """
+
+
+class InMemoryTimeSeriesStore(TimeSeriesStore):
+    """
+    Time series held in process memory.
+
+    Every raw sample and bucket is also pushed on a heap ordered by time,
+    so prune() pops exactly the expired entries instead of walking every
+    client.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = Lock()
+        self._raw: Dict[str, Deque[Tuple[float, Sample]]] = {}
+        # resolution -> client_id -> bucket start -> tool -> Bucket
+        self._rollups: Dict[str, Dict[str, Dict[int, Dict[str, Bucket]]]] = {
+            name: {} for name in RESOLUTIONS
+        }
+        # resolution -> bucket start -> tool -> Bucket, across all clients
+        self._fleet: Dict[str, Dict[int, Dict[str, Bucket]]] = {
+            name: {} for name in RESOLUTIONS
+        }
+        # Expiry heaps: (timestamp, client_id) and per resolution
+        # (bucket start, client_id) and bucket starts of fleet buckets
+        self._raw_expiry: List[Tuple[float, str]] = []
+        self._bucket_expiry: Dict[str, List[Tuple[int, str]]] = {
+            name: [] for name in RESOLUTIONS
+        }
+        self._fleet_expiry: Dict[str, List[int]] = {name: [] for name in RESOLUTIONS}
+
+    def add(self, report: SystemReport):
+        """Record one sample per tool for a stored report"""
+        sample = report_sample(report)
+        timestamp = to_epoch(report.timestamp)
+        client_id = report.client_id
+
+        with self._lock:
+            raw = self._raw.get(client_id)
+            if raw is None:
+                raw = self._raw[client_id] = deque()
+            raw.append((timestamp, sample))
+            heapq.heappush(self._raw_expiry, (timestamp, client_id))
+
+            for name, width in RESOLUTIONS.items():
+                start = int(timestamp // width * width)
+                buckets = self._rollups[name].setdefault(client_id, {})
+                tools = buckets.get(start)
+                if tools is None:
+                    tools = buckets[start] = {}
+                    heapq.heappush(self._bucket_expiry[name], (start, client_id))
+                fleet_tools = self._fleet[name].get(start)
+                if fleet_tools is None:
+                    fleet_tools = self._fleet[name][start] = {}
+                    heapq.heappush(self._fleet_expiry[name], start)
+                for tool, (cpu, memory) in sample.items():
+                    bucket = sample_bucket(cpu, memory)
+                    fold(tools, tool, bucket)
+                    fold(fleet_tools, tool, bucket)
+
+    def prune(self, now: Optional[float] = None):
+        cutoffs = self.cutoffs(now)
+        with self._lock:
+            expiry = self._raw_expiry
+            while expiry and expiry[0][0] < cutoffs["raw"]:
+                _, client_id = heapq.heappop(expiry)
+                raw = self._raw.get(client_id)
+                while raw and raw[0][0] < cutoffs["raw"]:
+                    raw.popleft()
+                if not raw:
+                    self._raw.pop(client_id, None)
+
+            for name in RESOLUTIONS:
+                cutoff = cutoffs[name]
+                expiry = self._bucket_expiry[name]
+                clients = self._rollups[name]
+                while expiry and expiry[0][0] < cutoff:
+                    start, client_id = heapq.heappop(expiry)
+                    buckets = clients.get(client_id)
+                    if buckets is not None:
+                        buckets.pop(start, None)
+                        if not buckets:
+                            del clients[client_id]
+                expiry = self._fleet_expiry[name]
+                while expiry and expiry[0] < cutoff:
+                    self._fleet[name].pop(heapq.heappop(expiry), None)
+
+    def query(
+        self, client_id: Optional[str], start: float, end: float, resolution: str
+    ) -> List[Dict]:
+        with self._lock:
+            if resolution == "raw":
+                if client_id is None:
+                    raise ValueError("Raw samples are only kept per client")
+                return [
+                    raw_point(
+                        timestamp,
+                        ((tool, cpu, memory) for tool, (cpu, memory) in sample.items()),
+                    )
+                    for timestamp, sample in sorted(
+                        self._raw.get(client_id, ()), key=lambda item: item[0]
+                    )
+                    if start <= timestamp <= end
+                ]
+
+            width = RESOLUTIONS[resolution]
+            if client_id is None:
+                buckets = self._fleet[resolution]
+            else:
+                buckets = self._rollups[resolution].get(client_id, {})
+            return [
+                rollup_point(bucket_start, tools)
+                for bucket_start, tools in sorted(buckets.items())
+                if start - width < bucket_start <= end
+            ]
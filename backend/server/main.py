@@ -1,10 +1,65 @@
+"""
+Run the server.
+
+    python -m server.main                # one process
+    python -m server.main --workers 4    # four workers sharing one store process
+
+With several workers, the report store and the fleet analytics live in a
+separate store process, which every worker reaches on a Unix socket, so
+all of them see the same reports.
+"""
+
+import argparse
+import os
+import socket
+
 import uvicorn
-from server.app import create_app
 from server.app.core.config import settings
 
-app = create_app()
+APP = "server.app:create_app"
 
-if __name__ == "__main__":
-    uvicorn.run(
-        "main:app", host=settings.SERVER_URL, port=settings.PORT, reload=settings.DEBUG
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Ultron Eye server")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    parser.add_argument(
+        "--reload",
+        action=argparse.BooleanOptionalAction,
+        default=settings.DEBUG,
+        help="Restart on code changes (single worker only)",
     )
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        uvicorn.run(
+            APP, factory=True, host=args.host, port=args.port, reload=args.reload
+        )
+        return
+
+    from server.app.db.shared import store_process
+
+    with store_process(settings.STORE_ADDRESS) as address:
+        # Workers read their settings from the environment they inherit
+        os.environ["STORE_ADDRESS"] = address
+        os.environ["WORKERS"] = str(args.workers)
+        run_workers(args.host, args.port, args.workers)
+
+
+def run_workers(host: str, port: int, workers: int):
+    """uvicorn.run(workers=...), with Nagle's algorithm off on every connection"""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # uvicorn binds its worker socket without marking it as TCP, so asyncio
+    # leaves TCP_NODELAY off and every response, written as headers then
+    # body, waits about 40 ms for a delayed ACK. On Linux, connections
+    # accepted from a listening socket inherit the option.
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    uvicorn.run(APP, factory=True, fd=sock.fileno(), workers=workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,4 @@ poetry install
 poetry shell
 
 # Start the FastAPI server using poetry run
-poetry run uvicorn server.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+poetry run python -m server.main --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
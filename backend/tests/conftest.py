@@ -0,0 +1,10 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from server.app import create_app
+
+
+@pytest.fixture
+def api():
+    with TestClient(create_app()) as client:
+        yield client
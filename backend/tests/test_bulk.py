@@ -0,0 +1,47 @@
+import json
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1 import endpoints
+
+
+def ndjson(items):
+    return b"".join(json.dumps(item).encode() + b"\n" for item in items)
+
+
+def test_bulk_ndjson_reports_every_item(api):
+    reports = [make_report(process_count=20, seed=i) for i in range(3)]
+    body = ndjson(reports[:2]) + b"{broken\n" + ndjson(reports[2:]) + b'{"client_id": 1}\n'
+    response = api.post(
+        "/api/v1/reports/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert result["status"] == "partial"
+    assert (result["accepted"], result["rejected"]) == (3, 2)
+    statuses = [item["status"] for item in result["results"]]
+    assert statuses == ["success", "success", "error", "success", "error"]
+    assert all(item["sequence"] == 1 for item in result["results"] if "sequence" in item)
+
+
+def test_bulk_array_with_unterminated_tail(api):
+    reports = [make_report(process_count=5, seed=i) for i in range(2)]
+    body = json.dumps(reports).encode()[:-1]
+    result = api.post("/api/v1/reports/bulk", content=body).json()
+    assert result["accepted"] == 2
+    assert result["results"][-1]["detail"] == "Unterminated JSON array"
+
+
+def test_bulk_storage_errors(api, monkeypatch):
+    def fail(reports):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(endpoints, "store_reports", fail)
+    body = ndjson([make_report(process_count=5, seed=i) for i in range(3)])
+    for batch_size in (500, 1):
+        # Final batch, then a batch filled mid-stream
+        monkeypatch.setattr(endpoints.settings, "BULK_BATCH_SIZE", batch_size)
+        response = api.post("/api/v1/reports/bulk", content=body)
+        assert response.status_code == 500
+        assert response.json()["detail"] == "disk full"
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from benchmarks.fixtures import make_report
+
+
+def report(client_id, processes, extensions=(), age=0):
+    payload = make_report(client_id, process_count=0, organization_id="clients-org")
+    payload["timestamp"] = (datetime.utcnow() - timedelta(seconds=age)).isoformat()
+    payload["process_list"] = [{"name": name, "pid": 1} for name in processes]
+    payload["editor_extensions"] = {}
+    for extension in extensions:
+        publisher, name = extension.split(".")
+        payload["editor_extensions"][f"{extension}-1.0.0"] = {
+            "publisher": publisher,
+            "name": name,
+        }
+    return payload
+
+
+def found(api, **params):
+    params = {"organization_id": "clients-org", **params}
+    response = api.get("/api/v1/clients", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def ids(result):
+    return [client["client_id"] for client in result["clients"]]
+
+
+def test_clients_are_found_by_tool_and_extension(api):
+    api.post("/api/v1/report", json=report("clients-a", ["Cursor", "bash"]))
+    api.post("/api/v1/report", json=report("clients-b", ["ChatGPT"], ["GitHub.copilot"]))
+    api.post("/api/v1/report", json=report("clients-c", ["Code"], ["github.copilot"]))
+
+    assert ids(found(api, tool="cursor editor")) == ["clients-a"]
+    assert ids(found(api, tool=["Cursor", "chatgpt"])) == ["clients-a", "clients-b"]
+    assert ids(found(api, extension="github.copilot")) == ["clients-b", "clients-c"]
+    assert ids(found(api, tool="VS Code", extension="github.copilot")) == ["clients-c"]
+    assert ids(found(api, tool="bash")) == []
+
+    # The index follows each client's latest report
+    api.post("/api/v1/report", json=report("clients-a", ["ChatGPT"]))
+    assert ids(found(api, tool="cursor")) == []
+    assert ids(found(api, tool="ChatGPT Application")) == ["clients-a", "clients-b"]
+
+    assert ids(found(api, tool="cursor editor", organization_id="other-org")) == []
+
+
+def test_pages_follow_the_cursor(api):
+    for i in range(5):
+        payload = report(f"clients-page-{i}", ["Claude"], age=i * 100)
+        api.post("/api/v1/report", json=payload)
+
+    first = found(api, tool="claude", limit=2)
+    second = found(api, tool="claude", limit=2, cursor=first["next_cursor"])
+    third = found(api, tool="claude", limit=2, cursor=second["next_cursor"])
+    pages = ids(first) + ids(second) + ids(third)
+    assert pages == [f"clients-page-{i}" for i in range(5)]
+    assert third["next_cursor"] is None
+
+    assert ids(found(api, tool="claude", seen_within=250)) == [
+        "clients-page-0",
+        "clients-page-1",
+        "clients-page-2",
+    ]
+    assert api.get("/api/v1/clients", params={"cursor": "!"}).status_code == 400
+
+
+def test_fields_are_projected(api):
+    api.post("/api/v1/report", json=report("clients-fields", ["Cursor"], ["a.b"]))
+
+    (client,) = found(api, tool="cursor")["clients"]
+    assert set(client) == {"client_id", "organization_id", "timestamp", "tools"}
+    assert client["tools"] == ["Cursor Editor"]
+
+    result = found(api, tool="cursor", fields="client_id,extensions,uptime")
+    assert result["clients"] == [
+        {"client_id": "clients-fields", "extensions": ["a.b"], "uptime": 86400.0}
+    ]
+
+    response = api.get("/api/v1/clients", params={"fields": "client_id,password"})
+    assert response.status_code == 400
@@ -0,0 +1,78 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from server.app.core.compression import DecompressionMiddleware
+
+zstandard = pytest.importorskip("zstandard")
+
+MAX_SIZE = 4096
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body)
+    if encoding == "deflate":
+        return zlib.compress(body)
+    return zstandard.ZstdCompressor().compress(body)
+
+
+@pytest.fixture
+def echo():
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def read_body(request: Request):
+        body = await request.body()
+        return {"size": len(body), "head": body[:10].decode()}
+
+    app.add_middleware(DecompressionMiddleware, max_size=MAX_SIZE)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "zstd"])
+def test_decompresses_body(echo, encoding):
+    body = b"0123456789" * 100
+    response = echo.post(
+        "/echo", content=compress(body, encoding), headers={"Content-Encoding": encoding}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"size": len(body), "head": "0123456789"}
+
+
+def test_plain_body_and_accept_encoding(echo):
+    response = echo.post("/echo", content=b"plain")
+    assert response.json()["size"] == 5
+    assert set(response.headers["accept-encoding"].split(", ")) == {"gzip", "deflate", "zstd"}
+
+
+def test_unsupported_encoding(echo):
+    response = echo.post("/echo", content=b"x", headers={"Content-Encoding": "br"})
+    assert response.status_code == 415
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_decompressed_size_limit(echo, encoding):
+    # Highly compressible, so the compressed body is far below the limit
+    bomb = compress(b"\0" * (MAX_SIZE * 100), encoding)
+    assert len(bomb) < MAX_SIZE
+    response = echo.post("/echo", content=bomb, headers={"Content-Encoding": encoding})
+    assert response.status_code == 413
+
+    exact = compress(b"\0" * MAX_SIZE, encoding)
+    response = echo.post("/echo", content=exact, headers={"Content-Encoding": encoding})
+    assert response.json()["size"] == MAX_SIZE
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_corrupt_and_truncated_bodies(echo, encoding):
+    response = echo.post("/echo", content=b"not compressed", headers={"Content-Encoding": encoding})
+    assert response.status_code == 400
+
+    truncated = compress(b"0123456789" * 100, encoding)[:-8]
+    response = echo.post("/echo", content=truncated, headers={"Content-Encoding": encoding})
+    assert response.status_code == 400
+    assert "Truncated" in response.json()["detail"]
@@ -0,0 +1,174 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from benchmarks.fixtures import make_report
+from client import FULL_REPORT_EVERY, ReportScheduler, UltronEyeClient
+
+
+def process(name, cpu=1.0, memory=1.0, pid=100, status="running"):
+    return {
+        "pid": pid,
+        "name": name,
+        "cpu_percent": cpu,
+        "memory_percent": memory,
+        "status": status,
+        "create_time": datetime(2025, 1, 1).isoformat(),
+        "instance_count": 1,
+    }
+
+
+def full_report(client_id, processes):
+    report = make_report(client_id=client_id, process_count=0)
+    report["process_list"] = processes
+    return report
+
+
+def delta_for(client_id, base_sequence, **changes):
+    return {
+        "client_id": client_id,
+        "base_sequence": base_sequence,
+        "report_id": f"report-{uuid.uuid4()}",
+        "timestamp": datetime.utcnow().isoformat(),
+        "uptime": 90000.0,
+        **changes,
+    }
+
+
+# Server side
+
+
+def test_delta_rebuilds_report(api):
+    client_id = str(uuid.uuid4())
+    report = full_report(client_id, [process("ChatGPT"), process("Cursor"), process("bash")])
+    result = api.post("/api/v1/report", json=report).json()
+    assert (result["sequence"], result["ai_processes_detected"]) == (1, 2)
+
+    delta = delta_for(
+        client_id,
+        1,
+        processes_changed=[process("ChatGPT", cpu=50.0), process("Claude"), process("sshd")],
+        processes_removed=["Cursor"],
+        extensions_removed=["github.copilot-1.250.0"],
+        environment="staging",
+    )
+    result = api.post("/api/v1/report/delta", json=delta).json()
+    assert (result["sequence"], result["ai_processes_detected"]) == (2, 2)
+
+    latest = api.get(f"/api/v1/reports/{client_id}").json()[-1]
+    assert latest["sequence"] == 2
+    assert latest["report_id"] == delta["report_id"]
+    assert latest["environment"] == "staging"
+    assert latest["editor_extensions"] == {}
+    # Unchanged fields are carried over from the stored report
+    assert latest["user_info"]["username"] == report["user_info"]["username"]
+    processes = {p["name"]: p for p in latest["process_list"]}
+    assert set(processes) == {"ChatGPT", "Claude"}
+    assert processes["ChatGPT"]["cpu_percent"] == 50.0
+    assert processes["Claude"]["category"] == "Claude AI"
+
+
+def test_delta_requires_resync(api):
+    client_id = str(uuid.uuid4())
+    response = api.post("/api/v1/report/delta", json=delta_for(client_id, 1))
+    assert response.status_code == 409
+    assert response.json()["detail"]["resync"] is True
+
+    api.post("/api/v1/report", json=full_report(client_id, [process("ChatGPT")]))
+    api.post("/api/v1/report/delta", json=delta_for(client_id, 1))
+    # The server is at sequence 2, so a delta against 1 no longer applies
+    response = api.post("/api/v1/report/delta", json=delta_for(client_id, 1))
+    assert response.status_code == 409
+    assert "Expected base sequence 2" in response.json()["detail"]["reason"]
+
+
+# Client side
+
+
+@pytest.fixture
+def agent():
+    agent = UltronEyeClient.__new__(UltronEyeClient)
+    agent.client_id = "client-1"
+    agent.acked_sequence = None
+    agent.acked_processes = {}
+    agent.acked_extensions = {}
+    agent.acked_fields = {}
+    agent.deltas_since_full = 0
+    return agent
+
+
+def client_report(processes, extensions=None, **fields):
+    report = full_report("client-1", processes)
+    report["editor_extensions"] = extensions or {}
+    report.update(fields)
+    return report
+
+
+def test_first_report_is_full(agent):
+    assert agent.generate_delta(client_report([process("ChatGPT")])) is None
+
+
+def test_delta_against_acknowledged_state(agent):
+    first = client_report([process("ChatGPT"), process("Cursor")], {"ext": {"v": 1}})
+    agent._acknowledge(first, None, 1)
+
+    second = client_report(
+        [process("ChatGPT", cpu=1.2), process("Claude")],
+        {"ext": {"v": 2}},
+        environment="staging",
+    )
+    delta = agent.generate_delta(second)
+    assert delta["base_sequence"] == 1
+    # 0.2 is below DELTA_TOLERANCE, so ChatGPT is not resent
+    assert [p["name"] for p in delta["processes_changed"]] == ["Claude"]
+    assert delta["processes_removed"] == ["Cursor"]
+    assert delta["extensions_changed"] == {"ext": {"v": 2}}
+    assert delta["environment"] == "staging"
+    assert "user_info" not in delta
+
+    agent._acknowledge(second, delta, 2)
+    assert agent.acked_sequence == 2
+    assert set(agent.acked_processes) == {"ChatGPT", "Claude"}
+    # Unsent drift stays measured against the acknowledged value
+    assert agent.acked_processes["ChatGPT"]["cpu_percent"] == 1.0
+    drifted = agent.generate_delta(client_report([process("ChatGPT", cpu=1.6), process("Claude")]))
+    assert [p["name"] for p in drifted["processes_changed"]] == ["ChatGPT"]
+
+
+def test_full_report_every_n_deltas(agent):
+    report = client_report([process("ChatGPT")])
+    agent._acknowledge(report, None, 1)
+    for sequence in range(2, FULL_REPORT_EVERY + 2):
+        delta = agent.generate_delta(report)
+        assert delta is not None
+        agent._acknowledge(report, delta, sequence)
+    assert agent.generate_delta(report) is None
+    agent._acknowledge(report, None, FULL_REPORT_EVERY + 2)
+    assert agent.deltas_since_full == 0
+
+
+def test_server_without_delta_support(agent):
+    report = client_report([process("ChatGPT")])
+    agent._acknowledge(report, None, None)
+    assert agent.generate_delta(report) is None
+
+
+def test_volatile_metrics_do_not_count_as_changes(agent):
+    report = client_report([process("ChatGPT")])
+    agent._acknowledge(report, None, 1)
+
+    report["system_info"] = {**report["system_info"], "memory_available": 1}
+    delta = agent.generate_delta(report)
+    assert delta["system_info"]["memory_available"] == 1
+    assert not agent._delta_has_changes(delta)
+
+    report["system_info"] = {**report["system_info"], "cpu_cores": 64}
+    assert agent._delta_has_changes(agent.generate_delta(report))
+
+
+def test_unchanged_reports_back_off():
+    scheduler = ReportScheduler(interval=10, jitter=0)
+    delays = [scheduler.next_delay(changed=False) for _ in range(4)]
+    assert delays == [20, 40, 40, 40]
+    assert scheduler.next_delay(changed=True) == 10
@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import SystemReport, process_records
+from server.app.core.distributions import ToolDistributions, percentiles
+
+
+def report(client_id, processes):
+    """A classified report from (category, memory_percent, cpu_percent) triples"""
+    payload = make_report(client_id, process_count=0)
+    payload["process_list"] = process_records.validate_python(
+        [
+            {"name": f"p{i}", "pid": i, "category": category,
+             "memory_percent": memory, "cpu_percent": cpu}
+            for i, (category, memory, cpu) in enumerate(processes)
+        ]
+    )  # fmt: skip
+    return SystemReport.model_validate(payload)
+
+
+def test_rows_follow_each_clients_latest_report():
+    distributions = ToolDistributions()
+    distributions.update(report("a", [("Copilot", 2.0, 1.0), ("Copilot", 3.0, 0.5)]))
+    distributions.update(report("b", [("Copilot", 1.0, 4.0), ("Cursor", 8.0, 2.0)]))
+    distributions.update(report("c", [("Cursor", 6.0, 1.0)]))
+    # "b" stops running Cursor; "c" moves into its row
+    distributions.update(report("b", [("Copilot", 1.5, 3.0)]))
+
+    columns = distributions.columns()
+    assert sorted(columns["Copilot"].T.tolist()) == [[1.5, 3.0, 1.0], [5.0, 1.5, 2.0]]
+    assert columns["Cursor"].T.tolist() == [[6.0, 1.0, 1.0]]
+
+    distributions.update(report("c", []))
+    assert set(distributions.columns()) == {"Copilot"}
+
+
+def test_percentiles_match_a_sort_per_tool():
+    rng = random.Random(0)
+    distributions = ToolDistributions()
+    expected = {}
+    # Enough clients to grow the arrays several times, with rewrites
+    for i in range(2000):
+        client_id = f"client-{rng.randrange(700)}"
+        categories = rng.choices(["Copilot", "Cursor", None], k=rng.randrange(4))
+        processes = [
+            (category, rng.uniform(0, 10), rng.uniform(0, 50)) for category in categories
+        ]
+        distributions.update(report(client_id, processes))
+        expected[client_id] = processes
+
+    result = percentiles(distributions.columns())
+    for tool in ("Copilot", "Cursor", "Unknown"):
+        category = None if tool == "Unknown" else tool
+        rows = []
+        for processes in expected.values():
+            mine = [p for p in processes if p[0] == category]
+            if mine:
+                memory, cpu = sum(p[1] for p in mine), sum(p[2] for p in mine)
+                rows.append([memory, cpu, len(mine)])
+        assert result[tool]["clients"] == len(rows)
+        for column, values in zip(
+            ("memory_percent", "cpu_percent", "instance_count"), zip(*rows)
+        ):
+            for p in (50, 90, 99):
+                expected_value = round(np.percentile(values, p), 2)
+                assert result[tool][column][f"p{p}"] == expected_value
+
+
+def test_analytics_include_percentiles_by_tool(api):
+    payload = make_report("distributions-client", process_count=200)
+    assert api.post("/api/v1/report", json=payload).status_code == 200
+    analytics = api.get("/api/v1/analytics").json()
+    by_tool = analytics["resource_percentiles_by_tool"]
+    assert by_tool.keys() == analytics["usage_by_category"].keys()
+    for stats in by_tool.values():
+        assert stats["clients"] >= 1
+        assert stats["instance_count"]["p50"] <= stats["instance_count"]["p99"]
@@ -0,0 +1,226 @@
+import json
+import logging
+import shutil
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from client import EditorExtensionWatcher, ManifestCache
+
+logger = logging.getLogger("test")
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr("platform.system", lambda: "Linux")
+    return tmp_path
+
+
+def vscode_extension(home, dirname, description="AI pair programmer"):
+    ext_dir = home / ".vscode/extensions" / dirname
+    ext_dir.mkdir(parents=True, exist_ok=True)
+    name = dirname.rsplit("-", 1)[0]
+    (ext_dir / "package.json").write_text(
+        json.dumps({"name": name, "description": description, "version": "1.0.0"})
+    )
+    return ext_dir
+
+
+def jetbrains_plugin(
+    home, product, plugin, name="AI Assistant", description="Chat with an LLM", tail=""
+):
+    meta_inf = (
+        home
+        / ".local/share/JetBrains/Toolbox/apps"
+        / product
+        / "plugins"
+        / plugin
+        / "META-INF"
+    )
+    meta_inf.mkdir(parents=True, exist_ok=True)
+    (meta_inf / "plugin.xml").write_text(
+        f"<idea-plugin><id>com.example.{plugin}</id><name>{name}</name>"
+        f'<vendor url="https://example.com">JetBrains</vendor>'
+        f"<description><![CDATA[<p>{description}</p>]]></description>"
+        f"{tail}</idea-plugin>"
+    )
+    return meta_inf.parent
+
+
+def make_watcher(home, debounce=60):
+    cache = ManifestCache(logger, path=home / ".ultron/extensions.json")
+    watcher = EditorExtensionWatcher(logger, debounce=debounce, manifest_cache=cache)
+    watcher.scan_extensions()
+    return watcher
+
+
+def count_stores(watcher, monkeypatch):
+    stored = []
+    store = watcher._store_extension
+
+    def counting(editor, ext_dir):
+        stored.append(ext_dir)
+        store(editor, ext_dir)
+
+    monkeypatch.setattr(watcher, "_store_extension", counting)
+    return stored
+
+
+def test_burst_rescans_only_the_changed_extension(home, monkeypatch):
+    vscode_extension(home, "github.copilot-1.0.0")
+    vscode_extension(home, "other.theme-1.0.0", description="A colour theme")
+    watcher = make_watcher(home)
+    assert set(watcher.extensions_cache) == {"github.copilot-1.0.0"}
+    stored = count_stores(watcher, monkeypatch)
+
+    ext_dir = vscode_extension(home, "codeium.codeium-2.0.0")
+    for i in range(300):
+        watcher._handle_extension_change(
+            str(ext_dir / f"dist/chunk{i}.js"), "installed"
+        )
+    watcher._handle_extension_change(str(ext_dir / "package.json"), "installed")
+    watcher.flush_pending(force=True)
+
+    assert stored == [ext_dir]
+    assert (
+        watcher.extensions_cache["codeium.codeium-2.0.0"]["name"] == "codeium.codeium"
+    )
+    watcher.stop()
+
+
+def test_debounce_waits_for_the_burst_to_settle(home, monkeypatch):
+    watcher = make_watcher(home, debounce=0.2)
+    stored = count_stores(watcher, monkeypatch)
+    ext_dir = vscode_extension(home, "github.copilot-1.0.0")
+
+    for _ in range(5):
+        watcher._handle_extension_change(str(ext_dir / "package.json"), "updated")
+        time.sleep(0.1)
+    assert stored == []
+
+    deadline = time.monotonic() + 5
+    while not stored and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert stored == [ext_dir]
+    assert "github.copilot-1.0.0" in watcher.extensions_cache
+
+
+def test_removed_and_updated_extensions(home):
+    ext_dir = vscode_extension(home, "github.copilot-1.0.0")
+    plugin_dir = jetbrains_plugin(home, "PyCharm", "ai-assistant")
+    watcher = make_watcher(home)
+    assert watcher.extensions_cache["ai-assistant"]["product"] == "PyCharm"
+
+    shutil.rmtree(ext_dir)
+    watcher.on_deleted(SimpleNamespace(src_path=str(ext_dir), is_directory=True))
+    jetbrains_plugin(
+        home, "PyCharm", "ai-assistant", name="Spell Checker", description="Spelling"
+    )
+    watcher.on_modified(
+        SimpleNamespace(
+            src_path=str(plugin_dir / "META-INF/plugin.xml"), is_directory=False
+        )
+    )
+    watcher.flush_pending(force=True)
+
+    assert watcher.extensions_cache == {}
+
+
+def test_extension_renamed_into_place(home):
+    watcher = make_watcher(home)
+    staged = vscode_extension(home, ".a1b2c3")
+    installed = staged.with_name("github.copilot-1.0.0")
+    staged.rename(installed)
+    watcher.on_moved(
+        SimpleNamespace(
+            src_path=str(staged), dest_path=str(installed), is_directory=True
+        )
+    )
+    watcher.flush_pending(force=True)
+
+    assert list(watcher.extensions_cache) == ["github.copilot-1.0.0"]
+
+
+def test_events_outside_extensions_are_ignored(home):
+    watcher = make_watcher(home)
+    base = home / ".local/share/JetBrains/Toolbox/apps"
+    watcher._handle_extension_change(
+        str(base / "PyCharm/bin/idea.properties"), "updated"
+    )
+    watcher._handle_extension_change(str(home / "notes.txt"), "updated")
+    assert watcher._pending == {}
+
+
+def count_parses(watcher, monkeypatch):
+    parsed = []
+    parse = watcher._parse_vscode_extension
+
+    def counting(ext_dir, manifest):
+        parsed.append(ext_dir.name)
+        return parse(ext_dir, manifest)
+
+    monkeypatch.setattr(watcher, "_parse_vscode_extension", counting)
+    return parsed
+
+
+def test_startup_reuses_parsed_manifests(home, monkeypatch):
+    vscode_extension(home, "github.copilot-1.0.0")
+    vscode_extension(home, "other.theme-1.0.0", description="A colour theme")
+    removed = vscode_extension(home, "codeium.codeium-2.0.0")
+    first = make_watcher(home)
+
+    vscode_extension(home, "other.theme-1.0.0", description="Colour theme with AI")
+    shutil.rmtree(removed)
+    watcher = EditorExtensionWatcher(
+        logger, manifest_cache=ManifestCache(logger, path=first.manifest_cache.path)
+    )
+    parsed = count_parses(watcher, monkeypatch)
+    watcher.scan_extensions()
+
+    assert parsed == ["other.theme-1.0.0"]
+    assert set(watcher.extensions_cache) == {
+        "github.copilot-1.0.0",
+        "other.theme-1.0.0",
+    }
+    records = json.loads(first.manifest_cache.path.read_text())["manifests"]
+    assert len(records) == 2
+
+
+def test_cache_is_discarded_when_keywords_change(home, monkeypatch):
+    vscode_extension(home, "github.copilot-1.0.0")
+    path = make_watcher(home).manifest_cache.path
+
+    monkeypatch.setattr("client.AI_KEYWORDS", ("copilot",))
+    watcher = EditorExtensionWatcher(
+        logger, manifest_cache=ManifestCache(logger, path=path)
+    )
+    parsed = count_parses(watcher, monkeypatch)
+    watcher.scan_extensions()
+    assert parsed == ["github.copilot-1.0.0"]
+
+
+def test_jetbrains_metadata_is_read_up_to_the_required_fields(home):
+    # Reading stops after the chunk holding name, vendor and description,
+    # so the malformed XML past it is never parsed
+    unparsed = f"<!-- {'x' * 8192} -->" + "<broken" * 2000
+    jetbrains_plugin(home, "PyCharm", "assistant", tail=unparsed)
+    watcher = make_watcher(home)
+
+    entry = watcher.extensions_cache["assistant"]
+    assert entry["name"] == "AI Assistant"
+    assert entry["id"] == "com.example.assistant"
+    assert entry["vendor"] == "JetBrains"
+    assert entry["description"] == "<p>Chat with an LLM</p>"
+    assert entry["product"] == "PyCharm"
+
+
+def test_keyword_matching(home):
+    watcher = make_watcher(home)
+    assert watcher._is_ai_related({"description": "Inline GPT completions"})
+    assert watcher._is_ai_related({"name": "tabnine-vscode"})
+    assert watcher._is_ai_related({"keywords": ["Copilot", "snippets"]})
+    # Keywords match whole, not as substrings
+    assert not watcher._is_ai_related({"keywords": ["email", "themes"]})
+    assert not watcher._is_ai_related({"description": None, "keywords": None})
@@ -0,0 +1,60 @@
+import random
+from collections import Counter
+
+from benchmarks.fixtures import make_report
+from server.app.core.classifier import process_classifier
+from server.app.core.heavy_hitters import SpaceSaving
+
+
+def test_frequent_items_are_kept_within_their_error():
+    rng = random.Random(0)
+    # Zipf-like: a few names are common, thousands appear a handful of times
+    names = [f"name-{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    stream = rng.choices(names, weights, k=50_000)
+    summary = SpaceSaving(capacity=100)
+    for name in stream:
+        summary.add(name)
+
+    truth = Counter(stream)
+    assert len(summary) == 100
+    assert sum(len(bucket) for bucket in summary._buckets.values()) == 100
+    assert summary.total == len(stream)
+    for name, count, error in summary.top():
+        assert count - error <= truth[name] <= count
+    # Every name above total / capacity is guaranteed to be found
+    frequent = {name for name, count in truth.items() if count > len(stream) / 100}
+    assert frequent <= {name for name, _, _ in summary.top()}
+    assert [name for name, _, _ in summary.top(3)] == ["name-0", "name-1", "name-2"]
+
+
+def test_new_items_take_over_a_minimum():
+    summary = SpaceSaving(capacity=2)
+    for item in "aaabbc":
+        summary.add(item)
+    assert summary.top() == [("a", 3, 0), ("c", 3, 2)]
+    summary.add("d")
+    assert summary.top() == [("d", 4, 3), ("a", 3, 0)]
+
+
+def test_unclassified_names_become_candidates(api):
+    for i in range(3):
+        payload = make_report(f"candidates-{i}", process_count=50, seed=i)
+        # Twice in one report still counts once for it
+        payload["process_list"] += [{"name": "NewAgent", "pid": 1}] * 2
+        assert api.post("/api/v1/report", json=payload).status_code == 200
+
+    summary = api.get("/api/v1/classifier/candidates", params={"limit": 1000}).json()
+    candidates = {candidate["name"]: candidate for candidate in summary["candidates"]}
+    assert candidates["newagent"]["count"] >= 3
+    assert summary["names_observed"] >= 3
+    assert not any(process_classifier.classify(name) for name in candidates)
+
+    # Once promoted into the classifier, a name is no longer a candidate
+    patterns = process_classifier.patterns
+    process_classifier.set_patterns({**patterns, "newagent": "New Agent"})
+    try:
+        summary = api.get("/api/v1/classifier/candidates", params={"limit": 1000})
+        assert "newagent" not in {c["name"] for c in summary.json()["candidates"]}
+    finally:
+        process_classifier.set_patterns(patterns)
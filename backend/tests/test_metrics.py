@@ -0,0 +1,67 @@
+import re
+
+from benchmarks.fixtures import make_report
+from server.app.core.metrics import Histogram
+
+
+def scrape(api):
+    response = api.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_ingest_stages_are_timed_per_endpoint(api):
+    # Metrics and the store are process-wide, so compare against a baseline
+    before = scrape(api)
+    report = make_report("metrics-client", process_count=300)
+    assert api.post("/api/v1/report", json=report).status_code == 200
+    assert api.get("/api/v1/reports/metrics-client").status_code == 200
+    after = scrape(api)
+
+    def added(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    for histogram in (
+        "ultron_request_duration_seconds",
+        "ultron_validation_duration_seconds",
+        "ultron_classification_duration_seconds",
+        "ultron_store_upsert_duration_seconds",
+    ):
+        assert added(f'{histogram}_count{{endpoint="receive_report"}}') == 1
+        assert added(f'{histogram}_sum{{endpoint="receive_report"}}') > 0
+    assert added('ultron_request_duration_seconds_count{endpoint="get_client_reports"}') == 1
+    assert added('ultron_validation_duration_seconds_count{endpoint="get_client_reports"}') == 0
+    assert added('ultron_responses_total{endpoint="receive_report",status="200"}') == 1
+
+    assert added("ultron_store_clients") == 1
+    assert added("ultron_store_reports_in_memory") == 1
+    assert added("ultron_store_processes") > 0
+
+
+def test_unknown_paths_share_one_series(api):
+    before = scrape(api)
+    for path in ("/nope", "/api/v1/nope", "/wp-login.php"):
+        assert api.get(path).status_code == 404
+    after = scrape(api)
+    unmatched = 'ultron_responses_total{endpoint="unmatched",status="404"}'
+    assert after[unmatched] - before.get(unmatched, 0) == 3
+    assert not any(re.search("nope|wp-login", name) for name in after)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test", buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.005, 0.5):
+        histogram.observe(seconds, "endpoint")
+    histogram.observe(0.002)  # outside a request: dropped
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{endpoint="endpoint",le="0.001"} 2' in lines
+    assert 'test_seconds_bucket{endpoint="endpoint",le="0.01"} 3' in lines
+    assert 'test_seconds_bucket{endpoint="endpoint",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{endpoint="endpoint"} 4' in lines
@@ -0,0 +1,89 @@
+import logging
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from client import ProcessSampler, ProcfsSampler, UltronEyeClient
+
+pytestmark = pytest.mark.skipif(
+    not ProcfsSampler.available(), reason="needs a Linux /proc"
+)
+
+logger = logging.getLogger("test")
+
+
+@pytest.fixture
+def sleepers(tmp_path):
+    """Idle children, some under a name longer than the 15-character comm"""
+    sleep = shutil.which("sleep")
+    long_name = tmp_path / "ultron-test-long-sleeper"
+    long_name.symlink_to(sleep)
+    children = [subprocess.Popen([sleep, "60"]) for _ in range(3)]
+    children += [subprocess.Popen([str(long_name), "60"]) for _ in range(2)]
+    time.sleep(0.2)
+    yield children
+    for child in children:
+        child.kill()
+        child.wait()
+
+
+def aggregated(sampler):
+    agent = UltronEyeClient.__new__(UltronEyeClient)
+    agent.process_sampler = sampler
+    return {process["name"]: process for process in agent.collect_process_info()}
+
+
+def test_samples_match_psutil(sleepers):
+    pids = {child.pid for child in sleepers}
+    expected = {s["pid"]: s for s in ProcessSampler(logger).sample() if s["pid"] in pids}
+    actual = {s["pid"]: s for s in ProcfsSampler(logger).sample() if s["pid"] in pids}
+
+    assert actual.keys() == expected.keys() == pids
+    for pid, sample in actual.items():
+        assert sample["name"] == expected[pid]["name"]
+        assert sample["status"] == expected[pid]["status"] == "sleeping"
+        assert sample["create_time"] == pytest.approx(expected[pid]["create_time"])
+        assert sample["memory_percent"] == pytest.approx(
+            expected[pid]["memory_percent"], abs=0.01
+        )
+
+
+def test_aggregation_matches_psutil(sleepers):
+    expected = aggregated(ProcessSampler(logger))
+    actual = aggregated(ProcfsSampler(logger))
+
+    for name in ("sleep", "ultron-test-long-sleeper"):
+        assert actual[name]["instance_count"] == expected[name]["instance_count"]
+        assert actual[name]["create_time"] == expected[name]["create_time"]
+        assert actual[name]["status"] == expected[name]["status"]
+    assert actual["ultron-test-long-sleeper"]["instance_count"] == 2
+
+
+def test_measures_cpu_between_scans():
+    busy = subprocess.Popen(
+        [sys.executable, "-c", "import time\nwhile True: time.perf_counter()"]
+    )
+    try:
+        sampler = ProcfsSampler(logger)
+        sampler.sample()
+        time.sleep(0.5)
+        cpu = next(s["cpu_percent"] for s in sampler.sample() if s["pid"] == busy.pid)
+        assert cpu > 50
+    finally:
+        busy.kill()
+        busy.wait()
+
+
+def test_reused_pid_is_sampled_as_new(sleepers):
+    sampler = ProcfsSampler(logger)
+    sampler.sample()
+    pid = sleepers[0].pid
+    starttime, comm, name, cpu_seconds, at = sampler._known[pid]
+    # Pretend a different program held this PID before
+    sampler._known[pid] = (starttime - 1, comm, "previous", cpu_seconds + 100, at)
+    sample = next(s for s in sampler.sample() if s["pid"] == pid)
+    assert sample["name"] == "sleep"
+    assert sample["cpu_percent"] >= 0
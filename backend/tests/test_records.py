@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import ExtensionRecord, ProcessRecord
+from server.app.db.store import report_store
+
+
+def process(name, **fields):
+    return {
+        "pid": 100,
+        "name": name,
+        "cpu_percent": 1.5,
+        "memory_percent": 0.5,
+        "status": "running",
+        "create_time": "2025-01-01T08:30:00",
+        "instance_count": 2,
+        **fields,
+    }
+
+
+def report_with(client_id, processes):
+    report = make_report(client_id, process_count=0)
+    report["process_list"] = processes
+    return report
+
+
+def test_classified_processes_are_stored_as_records(api):
+    report = report_with("records-a", [process("ChatGPT", threads=12), process("bash")])
+    response = api.post("/api/v1/report", json=report)
+    assert response.json()["ai_processes_detected"] == 1
+
+    (record,) = report_store.get("records-a").process_list
+    assert isinstance(record, ProcessRecord)
+    assert not hasattr(record, "__dict__")
+    assert record.category == "ChatGPT Application"
+    assert record.create_time == datetime(2025, 1, 1, 8, 30)
+    extension = report_store.get("records-a").editor_extensions["github.copilot-1.250.0"]
+    assert isinstance(extension, ExtensionRecord)
+
+    (stored,) = api.get("/api/v1/reports/records-a").json()
+    assert stored["process_list"] == [
+        {**process("ChatGPT"), "category": "ChatGPT Application"}
+    ]
+    assert stored["editor_extensions"]["github.copilot-1.250.0"]["publisher"] == "GitHub"
+
+
+def test_only_kept_processes_are_validated_field_by_field(api):
+    # Processes that are not AI-related are dropped without being checked
+    report = report_with("records-b", [process("bash", cpu_percent="n/a")])
+    assert api.post("/api/v1/report", json=report).status_code == 200
+
+    report = report_with(
+        "records-b", [process("bash"), process("ChatGPT", cpu_percent="n/a")]
+    )
+    response = api.post("/api/v1/report", json=report)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == [1, "cpu_percent"]
+
+
+def test_malformed_json_is_rejected(api):
+    response = api.post(
+        "/api/v1/report",
+        content=b'{"client_id": "records-c",',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
@@ -0,0 +1,106 @@
+from benchmarks.fixtures import make_report
+from server.app.core.cache import ResponseCache, etag_matches
+from tests.test_metrics import scrape
+
+ANALYTICS = "/api/v1/analytics"
+LOOKUPS = "ultron_response_cache_lookups_total"
+
+
+def test_analytics_are_revalidated_until_ingest(api):
+    before = scrape(api)
+    first = api.get(ANALYTICS)
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and first.headers["cache-control"] == "no-cache"
+
+    again = api.get(ANALYTICS)
+    assert again.content == first.content and again.headers["etag"] == etag
+    not_modified = api.get(ANALYTICS, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    api.post("/api/v1/report", json=make_report("cache-client", process_count=20))
+    changed = api.get(ANALYTICS, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert changed.json()["total_clients"] == first.json()["total_clients"] + 1
+
+    after = scrape(api)
+
+    def added(result):
+        name = f'{LOOKUPS}{{endpoint="get_analytics",result="{result}"}}'
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert added("hit") == 2 and added("miss") >= 1
+    assert after["ultron_response_cache_bytes"] > 0
+
+
+def test_client_reports_and_searches_are_cached(api):
+    api.post("/api/v1/report", json=make_report("cache-reports", process_count=5))
+    reports = api.get("/api/v1/reports/cache-reports")
+    etag = reports.headers["etag"]
+    cached = api.get("/api/v1/reports/cache-reports", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert api.get("/api/v1/reports/cache-missing").status_code == 404
+
+    params = {"organization_id": "nobody", "fields": "client_id"}
+    clients = api.get("/api/v1/clients", params=params)
+    assert clients.json() == {"clients": [], "next_cursor": None}
+    revalidated = api.get(
+        "/api/v1/clients", params=params, headers={"If-None-Match": "*"}
+    )
+    assert revalidated.status_code == 304
+    # Pages that depend on the clock are always built
+    recent = api.get("/api/v1/clients", params={**params, "seen_within": 60})
+    assert recent.status_code == 200 and "etag" not in recent.headers
+
+
+def test_stale_entries_are_served_within_the_budget(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("server.app.core.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache(max_entries=8, max_bytes=1024, max_staleness=2.0)
+    builds = []
+
+    def build():
+        builds.append(now[0])
+        return str(len(builds)).encode()
+
+    first = cache.get_or_build(("endpoint",), 1, build)
+    assert cache.get_or_build(("endpoint",), 1, build) == first
+    now[0] += 1.5
+    # The store has changed, but the entry is still within the budget
+    assert cache.get_or_build(("endpoint",), 2, build) == first
+    now[0] += 0.5
+    rebuilt = cache.get_or_build(("endpoint",), 3, build)
+    assert rebuilt.body == b"2" and rebuilt.etag != first.etag
+    assert builds == [100.0, 102.0]
+
+    # Without a budget, every change rebuilds
+    cache = ResponseCache(max_entries=8, max_bytes=1024, max_staleness=0.0)
+    cache.get_or_build(("endpoint",), 1, build)
+    assert cache.get_or_build(("endpoint",), 2, build).body == b"4"
+
+
+def test_cache_is_bounded_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=3, max_bytes=100, max_staleness=0.0)
+    for key in "abc":
+        cache.get_or_build((key,), 1, lambda: b"x" * 30)
+    assert len(cache) == 3 and cache.size == 90
+
+    # Using "a" makes "b" the least recently used
+    cache.get_or_build(("a",), 1, lambda: b"")
+    cache.get_or_build(("d",), 1, lambda: b"x" * 30)
+    assert len(cache) == 3 and cache.size == 90
+    assert cache.get_or_build(("b",), 1, lambda: b"rebuilt").body == b"rebuilt"
+
+    cache.get_or_build(("e",), 1, lambda: b"x" * 60)
+    assert cache.size <= 100
+    # A body larger than the whole cache is returned but not kept
+    assert cache.get_or_build(("f",), 1, lambda: b"x" * 101).body == b"x" * 101
+    assert cache.size <= 100 and len(cache) <= 3
+
+
+def test_if_none_match():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches(None, '"b"')
+    assert not etag_matches('"ab"', '"b"')
@@ -0,0 +1,95 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import SystemReport
+from server.app.core.analytics import AnalyticsAggregator
+from server.app.core.heavy_hitters import UnclassifiedProcesses
+from server.app.core.ingest import prepare_report
+from server.app.db.base import StorageError
+from server.app.db.index import ClientQuery
+from server.app.db.memory import InMemoryReportStore
+from server.app.db.shared import (
+    SharedAnalytics,
+    SharedReportStore,
+    SharedUnclassifiedProcesses,
+    StoreServer,
+)
+
+
+def prepared(client_id, seed):
+    payload = make_report(client_id, process_count=50, seed=seed)
+    report = SystemReport.model_validate(payload)
+    prepare_report(report)
+    return report
+
+
+def ingest_from_worker(address, seeds):
+    """Store reports from another process, as a server worker would"""
+    store = SharedReportStore(address)
+    store.upsert_many([prepared(f"shared-{seed % 3}", seed) for seed in seeds])
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = StoreServer(
+        str(tmp_path / "store.sock"),
+        InMemoryReportStore(),
+        AnalyticsAggregator(),
+        UnclassifiedProcesses(),
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.close()
+    thread.join()
+
+
+def test_workers_share_reports_and_analytics(server):
+    worker = multiprocessing.get_context("spawn").Process(
+        target=ingest_from_worker, args=(server.address, range(6))
+    )
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    store = SharedReportStore(server.address)
+    report = prepared("shared-0", 6)
+    assert store.upsert(report) is None
+    assert report.sequence == 3
+
+    assert len(store) == 3
+    assert "shared-1" in store and "shared-9" not in store
+    assert [r.sequence for r in store.history("shared-0")] == [1, 2, 3]
+    assert store.get("shared-0") == report
+    assert store.reports_in_memory() == 7
+    found = store.find_clients(ClientQuery(after="shared-0", limit=1))
+    assert [r.client_id for r in found] == ["shared-1"]
+
+    # Analytics follow the latest report of every client
+    expected = AnalyticsAggregator()
+    for latest in server.store.latest_reports():
+        expected.replace(None, latest)
+    assert SharedAnalytics(server.address).snapshot() == expected.snapshot()
+    assert server.analytics.snapshot() == expected.snapshot()
+
+    # Unclassified names are sent in batches, and before reading them
+    unclassified = SharedUnclassifiedProcesses(server.address)
+    unclassified.add({"newagent", "bash"})
+    unclassified.add({"newagent"})
+    assert server.unclassified.snapshot()["names_observed"] == 0
+    candidates = unclassified.snapshot()["candidates"]
+    assert candidates[0] == {"name": "newagent", "count": 2, "min_count": 2}
+
+
+def test_store_errors_reach_the_worker(server):
+    store = SharedReportStore(server.address)
+    with pytest.raises(ValueError, match="Raw samples"):
+        store.timeseries.query(None, 0, 1, "raw")
+
+    server.close()
+    store.close()
+    with pytest.raises(StorageError, match="unavailable"):
+        store.get("shared-0")
@@ -0,0 +1,100 @@
+import threading
+
+import pytest
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import SystemReport, process_records
+from server.app.db.base import StorageError
+from server.app.db.index import ClientQuery
+from server.app.db.sqlite import SQLiteReportStore
+
+
+def report(client_id, organization_id="001", seed=0):
+    payload = make_report(client_id, process_count=3, organization_id=organization_id, seed=seed)
+    for process in payload["process_list"]:
+        process["category"] = "Test"
+    # As classified by prepare_report
+    payload["process_list"] = process_records.validate_python(payload["process_list"])
+    return SystemReport.model_validate(payload)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "reports.db")
+
+
+def open_store(path, **kwargs):
+    return SQLiteReportStore(path, history_size=3, batch_interval_ms=5, **kwargs)
+
+
+def test_reports_survive_restart(path):
+    store = open_store(path)
+    latest = report("a", seed=4)
+    for seed in range(4):
+        store.upsert(report("a", seed=seed))
+    store.upsert(latest)
+    store.upsert(report("b", organization_id="002"))
+    store.close()
+
+    store = open_store(path)
+    assert len(store) == 2
+    assert store.get("a").sequence == 5
+    assert [r.sequence for r in store.history("a")] == [3, 4, 5]
+    assert [r.client_id for r in store.by_organization("002")] == ["b"]
+    by_name = lambda processes: sorted(processes, key=lambda p: p.name)
+    assert by_name(store.get("a").process_list) == by_name(latest.process_list)
+    (totals,) = store.category_totals()
+    assert (totals.category, totals.processes, totals.clients) == ("Test", 6, 2)
+    found = store.find_clients(ClientQuery(tools=("test",), organization_id="002"))
+    assert [r.client_id for r in found] == ["b"]
+
+    # Sequences continue from the stored state
+    assert store.upsert(report("a")).sequence == 5
+    assert store.get("a").sequence == 6
+    store.close()
+
+
+def test_reads_include_uncommitted_reports(path):
+    store = open_store(path)
+    gate = threading.Event()
+    write_batch = store._write_batch
+    store._write_batch = lambda conn, batch: gate.wait() and write_batch(conn, batch)
+
+    store.upsert(report("a"))
+    store.upsert(report("a", seed=1))
+    assert store.get("a").sequence == 2
+    assert [r.sequence for r in store.history("a")] == [1, 2]
+
+    gate.set()
+    store.flush()
+    assert [r.sequence for r in store.history("a")] == [1, 2]
+    store.close()
+
+
+def test_failed_writes_stay_pending_and_are_retried(path, monkeypatch):
+    monkeypatch.setattr("server.app.db.sqlite.RETRY_DELAY", 0.01)
+    store = open_store(path)
+    failing = threading.Event()
+    failing.set()
+    write_batch = store._write_batch
+
+    def flaky(conn, batch):
+        if failing.is_set():
+            raise OSError("disk full")
+        write_batch(conn, batch)
+
+    store._write_batch = flaky
+    store.upsert(report("a"))
+    with pytest.raises(StorageError, match="disk full"):
+        store.flush()
+    assert store.get("a").sequence == 1
+    assert [r.sequence for r in store.history("a")] == [1]
+
+    store.upsert(report("a", seed=1))
+    failing.clear()
+    store.flush()
+    store.close()
+
+    store = open_store(path)
+    assert [r.sequence for r in store.history("a")] == [1, 2]
+    store.close()
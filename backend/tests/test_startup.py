@@ -0,0 +1,84 @@
+import json
+import logging
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import client
+from client import UltronEyeClient
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Loaded only when first used; a LazyLoader module in sys.modules is fine,
+# but none of these submodules may have run
+HEAVY_MODULES = ("psutil._common", "requests.adapters", "urllib3", "watchdog.observers")
+
+STARTUP = """
+import json, sys
+import client
+imported = [name for name in {heavy!r} if name in sys.modules]
+agent = client.UltronEyeClient(server_url="http://127.0.0.1:9")
+print(json.dumps({{
+    "imported": imported,
+    "constructed": [name for name in {heavy!r} if name in sys.modules],
+    "observer": agent.observer is not None,
+    "threads": __import__("threading").active_count(),
+}}))
+"""
+
+
+def test_import_and_construction_stay_light(tmp_path):
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP.format(heavy=HEAVY_MODULES)],
+        cwd=tmp_path,
+        env={"HOME": str(tmp_path), "PYTHONPATH": str(BACKEND), "PATH": ""},
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+
+    assert result["imported"] == []
+    assert result["constructed"] == []
+    assert result["observer"] is False
+    assert result["threads"] == 1
+
+
+def test_extension_monitoring_starts_after_the_first_report(monkeypatch):
+    agent = UltronEyeClient.__new__(UltronEyeClient)
+    agent.logger = logging.getLogger("test")
+    agent.observer = None
+    agent.last_report_changed = True
+    events = []
+
+    def send_report():
+        events.append("report")
+        if len(events) > 2:
+            raise KeyboardInterrupt
+        return {}
+
+    def start_extension_monitoring():
+        events.append("monitoring")
+        agent.observer = SimpleNamespace(is_alive=lambda: False)
+
+    agent.send_report = send_report
+    agent.start_extension_monitoring = start_extension_monitoring
+    monkeypatch.setattr(client.time, "sleep", lambda delay: None)
+    agent.start_monitoring()
+
+    assert events == ["report", "monitoring", "report"]
+
+
+@pytest.mark.skipif(not client.ProcfsSampler.available(), reason="needs a Linux /proc")
+def test_procfs_system_info_matches_psutil():
+    import psutil
+
+    sampler = client.ProcfsSampler(logging.getLogger("test"))
+    total, available = sampler.memory()
+    memory = psutil.virtual_memory()
+    assert total == memory.total
+    assert available == pytest.approx(memory.available, rel=0.05)
+    assert sampler.boot_time() == pytest.approx(psutil.boot_time(), abs=1)
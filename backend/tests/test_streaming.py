@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+
+from server.app.core.streaming import StreamFormatError, iter_json_items
+
+
+def decode(chunks, **kwargs):
+    """Run the parser over byte chunks and collect (item, error) pairs"""
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [pair async for pair in iter_json_items(source(), **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def split(body: bytes, size: int):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+ITEMS = [{"client_id": "a", "n": 1}, {"client_id": "b", "nested": [1, {"x": "é"}]}, {}]
+
+
+def test_ndjson():
+    body = b"".join(json.dumps(item).encode() + b"\n" for item in ITEMS)
+    assert decode([body]) == [(item, None) for item in ITEMS]
+
+
+def test_array():
+    body = json.dumps(ITEMS).encode()
+    assert decode([body]) == [(item, None) for item in ITEMS]
+
+
+def test_empty_bodies():
+    assert decode([]) == []
+    assert decode([b"  \n"]) == []
+    assert decode([b"[]"]) == []
+    assert decode([b" [ \n ] "]) == []
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_elements_split_across_chunks(size):
+    ndjson = b"".join(json.dumps(item).encode() + b"\n" for item in ITEMS)
+    array = json.dumps(ITEMS).encode()
+    expected = [(item, None) for item in ITEMS]
+    assert decode(split(ndjson, size)) == expected
+    assert decode(split(array, size)) == expected
+
+
+def test_multibyte_character_split_across_chunks():
+    body = json.dumps([{"name": "日本"}], ensure_ascii=False).encode()
+    assert decode(split(body, 1)) == [({"name": "日本"}, None)]
+
+
+def test_ndjson_last_line_without_newline():
+    assert decode([b'{"a": 1}\n{"a"', b": 2}"]) == [({"a": 1}, None), ({"a": 2}, None)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 4])
+def test_bare_scalars_at_chunk_edges(size):
+    body = b"[12345, true, null, 6.5e3]"
+    assert decode(split(body, size)) == [
+        (12345, None),
+        (True, None),
+        (None, None),
+        (6500.0, None),
+    ]
+
+
+def test_bad_ndjson_line_does_not_fail_the_rest():
+    pairs = decode([b'{"a": 1}\n{not json}\n\n{"a": 2}\n'])
+    assert pairs[0] == ({"a": 1}, None)
+    assert pairs[1][0] is None and pairs[1][1].startswith("Invalid JSON")
+    assert pairs[2] == ({"a": 2}, None)
+    assert len(pairs) == 3
+
+
+def test_unterminated_array():
+    with pytest.raises(StreamFormatError, match="Unterminated"):
+        decode([b'[{"a": 1}, '])
+
+
+def test_truncated_array_element():
+    with pytest.raises(StreamFormatError, match="Invalid JSON array element"):
+        decode([b'[{"a": 1}, {"a": '])
+
+
+def test_items_before_an_error_are_yielded():
+    async def source():
+        yield b'[{"a": 1}, {"a": 2}, {"a"'
+
+    async def collect():
+        items = []
+        with pytest.raises(StreamFormatError):
+            async for item, _ in iter_json_items(source()):
+                items.append(item)
+        return items
+
+    assert asyncio.run(collect()) == [{"a": 1}, {"a": 2}]
+
+
+def test_oversized_item():
+    body = json.dumps([{"blob": "x" * 1000}]).encode()
+    with pytest.raises(StreamFormatError, match="maximum size"):
+        decode(split(body, 100), max_item_size=500)
+    assert decode(split(body, 100), max_item_size=2000) == [({"blob": "x" * 1000}, None)]
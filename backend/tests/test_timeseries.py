@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from benchmarks.fixtures import make_report
+from server.app.api.v1.models import ProcessRecord, SystemReport
+from server.app.db.memory import InMemoryReportStore
+from server.app.db.sqlite import SQLiteReportStore
+
+HOUR = 3600
+# A 1h bucket boundary, so bucket contents are easy to predict
+T0 = 1_700_002_800.0
+
+
+def report(client_id, timestamp, cpu):
+    payload = make_report(client_id, process_count=0)
+    payload["timestamp"] = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+    payload["process_list"] = [
+        ProcessRecord("claude", category="Claude AI", cpu_percent=cpu, memory_percent=1.0),
+        ProcessRecord("claude-helper", category="Claude AI", cpu_percent=1.0, memory_percent=1.0),
+        ProcessRecord("cursor", category="Cursor Editor", cpu_percent=2.0, memory_percent=3.0),
+    ]
+    return SystemReport.model_validate(payload)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def open_store(request, tmp_path):
+    stores = []
+
+    def open_store():
+        if request.param == "memory":
+            store = stores[0] if stores else InMemoryReportStore(history_size=3)
+        else:
+            store = SQLiteReportStore(str(tmp_path / "ts.db"), history_size=3, batch_interval_ms=1)
+        stores.append(store)
+        return store
+
+    yield open_store
+    for store in stores:
+        store.close()
+
+
+def fill(store):
+    for minute, cpu in ((0, 10.0), (1, 30.0), (6, 20.0)):
+        store.upsert(report("a", T0 + minute * 60, cpu))
+    store.upsert(report("b", T0 + 60, 50.0))
+    store.flush()
+
+
+def test_query_resolutions(open_store):
+    store = open_store()
+    fill(store)
+    series = store.timeseries
+
+    raw = series.query("a", T0, T0 + HOUR, "raw")
+    assert [point["tools"]["Claude AI"]["cpu"] for point in raw] == [11.0, 31.0, 21.0]
+    assert raw[0]["tools"]["Cursor Editor"] == {"cpu": 2.0, "memory": 3.0}
+
+    five = series.query("a", T0, T0 + HOUR, "5m")
+    assert [point["tools"]["Claude AI"]["samples"] for point in five] == [2, 1]
+    first = five[0]["tools"]["Claude AI"]
+    assert (first["cpu_min"], first["cpu_avg"], first["cpu_max"]) == (11.0, 21.0, 31.0)
+
+    (hour,) = series.query("a", T0, T0 + HOUR, "1h")
+    assert hour["tools"]["Claude AI"]["samples"] == 3
+
+    (fleet,) = series.query(None, T0, T0 + HOUR, "1h")
+    claude = fleet["tools"]["Claude AI"]
+    assert (claude["samples"], claude["cpu_max"]) == (4, 51.0)
+
+    with pytest.raises(ValueError):
+        series.query(None, T0, T0 + HOUR, "raw")
+
+
+def test_prune_drops_only_expired_data(open_store):
+    store = open_store()
+    fill(store)
+    series = store.timeseries
+    now = T0 + series.raw_retention + 5 * 60
+
+    store.prune(now)
+    store.flush()
+    # Only the sample taken 6 minutes in is within the raw window
+    assert len(series.query("a", 0, now, "raw")) == 1
+    assert len(series.query("a", 0, now, "5m")) == 2
+
+    store.prune(now + series.retention["5m"] + HOUR)
+    store.flush()
+    assert series.query("a", 0, now, "5m") == []
+    assert series.query(None, 0, now, "5m") == []
+    assert len(series.query("a", 0, now, "1h")) == 1
+
+
+def test_sqlite_time_series_survives_restart(tmp_path):
+    path = str(tmp_path / "ts.db")
+    store = SQLiteReportStore(path, history_size=3, batch_interval_ms=1)
+    fill(store)
+    store.close()
+
+    store = SQLiteReportStore(path, history_size=3, batch_interval_ms=1)
+    (hour,) = store.timeseries.query("a", T0, T0 + HOUR, "1h")
+    assert hour["tools"]["Claude AI"]["samples"] == 3
+    assert len(store.timeseries.query("a", T0, T0 + HOUR, "raw")) == 3
+    store.close()
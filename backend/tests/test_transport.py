@@ -0,0 +1,154 @@
+import json
+import logging
+from datetime import datetime
+
+import pytest
+import requests
+
+from client import ReportSpool, ReportTransport, UltronEyeClient
+
+logger = logging.getLogger("test")
+
+
+def make_response(status, payload=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(payload or {}).encode()
+    return response
+
+
+class FakeSession:
+    """Answers requests by path from a dict of path -> list of statuses"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        path = url.split("://", 1)[1].split("/", 1)[1]
+        self.calls.append("/" + path)
+        status, payload = self.routes["/" + path].pop(0)
+        return make_response(status, payload)
+
+
+@pytest.fixture
+def spool(tmp_path):
+    return ReportSpool(logger, path=tmp_path / "spool", max_reports=5)
+
+
+@pytest.fixture
+def transport(spool):
+    return ReportTransport("http://server", logger, spool=spool)
+
+
+def test_injected_empty_spool_is_used(spool, transport):
+    assert len(spool) == 0
+    assert transport.spool is spool
+
+
+def test_spool_drops_oldest_beyond_limit(spool):
+    for i in range(7):
+        spool.put(json.dumps({"n": i}).encode())
+    assert [json.loads(f.read_bytes())["n"] for f in spool.oldest(10)] == [2, 3, 4, 5, 6]
+
+
+def test_drain_delivers_oldest_first(spool, transport):
+    for i in range(3):
+        spool.put(json.dumps({"n": i}).encode())
+    transport.session = FakeSession({"/api/v1/reports/bulk": [(200, {"rejected": 0})]})
+    assert transport.drain_spool() == 3
+    assert len(spool) == 0
+
+
+def test_drain_quarantines_refused_batches(spool, transport):
+    spool.put(b'{"n": 0}')
+    transport.session = FakeSession({"/api/v1/reports/bulk": [(404, {"detail": "Not Found"})]})
+    assert transport.drain_spool() == 0
+    assert len(spool) == 0
+    assert [f.name for f in (spool.path / "rejected").iterdir()]
+
+
+def test_drain_keeps_batch_on_server_error(spool, transport, monkeypatch):
+    monkeypatch.setattr("client.MAX_RETRIES", 0)
+    spool.put(b'{"n": 0}')
+    transport.session = FakeSession({"/api/v1/reports/bulk": [(503, {})]})
+    with pytest.raises(requests.exceptions.HTTPError):
+        transport.drain_spool()
+    assert len(spool) == 1
+
+
+@pytest.fixture
+def agent(transport):
+    agent = UltronEyeClient.__new__(UltronEyeClient)
+    agent.client_id = "client-1"
+    agent.logger = logger
+    agent.transport = transport
+    agent.acked_sequence = None
+    agent.acked_processes = {}
+    agent.acked_extensions = {}
+    agent.acked_fields = {}
+    agent.deltas_since_full = 0
+    agent.pattern_cache = type("Patterns", (), {"refresh": lambda self, version=None: None})()
+    agent.generate_report = lambda: {
+        "client_id": "client-1",
+        "report_id": "report-1",
+        "timestamp": datetime(2025, 1, 1),
+        "version": "1.0.0",
+        "user_info": {},
+        "organization_id": "001",
+        "system_info": {"memory_available": 1},
+        "process_list": [],
+        "editor_extensions": {},
+        "tags": ["local"],
+        "environment": "local",
+        "uptime": 1.0,
+        "last_boot_time": datetime(2025, 1, 1),
+    }
+    return agent
+
+
+def test_report_is_sent_when_bulk_endpoint_is_missing(agent, spool):
+    spool.put(b'{"n": 0}')
+    agent.transport.session = session = FakeSession(
+        {
+            "/api/v1/reports/bulk": [(404, {"detail": "Not Found"})],
+            "/api/v1/report": [(200, {"sequence": 1})],
+        }
+    )
+    assert agent.send_report()["sequence"] == 1
+    assert session.calls == ["/api/v1/reports/bulk", "/api/v1/report"]
+    assert len(spool) == 0
+
+
+def test_report_is_sent_when_drain_fails(agent, spool, monkeypatch):
+    monkeypatch.setattr("client.MAX_RETRIES", 0)
+    spool.put(b'{"n": 0}')
+    agent.transport.session = FakeSession(
+        {
+            "/api/v1/reports/bulk": [(503, {})],
+            "/api/v1/report": [(200, {"sequence": 1})],
+        }
+    )
+    assert agent.send_report()["sequence"] == 1
+    assert len(spool) == 1
+
+
+def test_undeliverable_report_is_spooled(agent, spool, monkeypatch):
+    monkeypatch.setattr("client.MAX_RETRIES", 0)
+    agent.transport.session = FakeSession({"/api/v1/report": [(503, {})]})
+    with pytest.raises(requests.exceptions.HTTPError):
+        agent.send_report()
+    assert len(spool) == 1
+
+
+def test_resync_falls_back_to_full_report(agent):
+    agent.acked_sequence = 4
+    agent.transport.session = session = FakeSession(
+        {
+            "/api/v1/report/delta": [(409, {"detail": {"resync": True}})],
+            "/api/v1/report": [(200, {"sequence": 1})],
+        }
+    )
+    agent.send_report()
+    assert session.calls == ["/api/v1/report/delta", "/api/v1/report"]
+    assert agent.acked_sequence == 1